@@ -0,0 +1,11 @@
+"""Conversion benchmarks.
+
+Builds a cached synthetic corpus with ffmpeg's lavfi sources, times
+``VideoConverter.convert`` and ``ConversionRunner`` across encode profiles,
+resolutions, BPV values and pool sizes, and reports realtime factor, CPU
+seconds and output bytes as JSON.
+
+Usage:
+    python -m benchmarks --quick --output bench.json
+    python -m benchmarks --baseline benchmarks/baseline.json
+"""
@@ -0,0 +1,81 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from ecb_tool.core.paths import ROOT_ENV_VAR
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('--quick', action='store_true',
+                        help='Use only the 30 s beat (smoke run, not comparable to full runs)')
+    parser.add_argument('--only', choices=['convert', 'runner'],
+                        help='Run a single group of cases')
+    parser.add_argument('--output', type=Path, help='Write the JSON report here')
+    parser.add_argument('--baseline', type=Path, help='Report to compare against')
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='Relative change tolerated per metric (default 0.10)')
+    parser.add_argument('--corpus-dir', type=Path, help='Where the synthetic corpus is cached')
+    parser.add_argument('--workdir', type=Path, help='Scratch project root (temporary if omitted)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='ecb_bench_') as scratch:
+        root = args.workdir or Path(scratch)
+        # Everything below must resolve its paths to the scratch project
+        os.environ[ROOT_ENV_VAR] = str(Path(root).resolve())
+
+        from benchmarks.corpus import CORPUS_DIR, build_corpus
+        from benchmarks.suite import (
+            DEFAULT_TOLERANCE,
+            Workspace,
+            build_report,
+            compare_reports,
+            convert_cases,
+            runner_cases,
+        )
+
+        corpus_dir = args.corpus_dir or CORPUS_DIR
+        print(f"📦 Corpus: {corpus_dir}")
+        if not args.quick:
+            build_corpus(corpus_dir)
+
+        workspace = Workspace(root, corpus_dir, quick=args.quick)
+        groups = {'convert': convert_cases, 'runner': runner_cases}
+        results = []
+        for name, cases in groups.items():
+            if args.only and args.only != name:
+                continue
+            for result in cases(workspace):
+                factor = f"{result.realtime_factor:.1f}x" if result.realtime_factor else "—"
+                status = "✅" if result.ok else "❌"
+                print(f"{status} {result.name}: {result.wall_seconds:.1f} s, {factor}")
+                results.append(result)
+
+    report = build_report(results, quick=args.quick)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=4, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 Informe: {args.output}")
+    else:
+        print(json.dumps(report, indent=4, ensure_ascii=False))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        tolerance = DEFAULT_TOLERANCE if args.tolerance is None else args.tolerance
+        regressions = compare_reports(report, baseline, tolerance)
+        if regressions:
+            print("\n⚠️ Regresiones respecto a la referencia:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✓ Sin regresiones respecto a la referencia")
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Synthetic media corpus for the conversion benchmarks.
+
+Beats and covers are generated with ffmpeg's lavfi sources, so every machine
+benchmarks the same content without shipping media files. Generated files
+are kept in a cache directory and only rebuilt when missing.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+
+# Default location of the generated corpus (ignored by git)
+CORPUS_DIR = Path(__file__).parent / '.corpus'
+
+
+@dataclass(frozen=True)
+class BeatSpec:
+    """A synthetic beat: a tone over pink noise, stereo MP3."""
+
+    name: str
+    seconds: int
+    frequency: int = 220
+
+
+@dataclass(frozen=True)
+class CoverSpec:
+    """A synthetic cover: one frame of a test pattern."""
+
+    name: str
+    size: str  # WIDTHxHEIGHT
+    extension: str = 'jpg'
+
+
+BEATS = [
+    BeatSpec('beat_30s', 30, frequency=220),
+    BeatSpec('beat_180s', 180, frequency=330),
+    BeatSpec('beat_180s_b', 180, frequency=440),
+    BeatSpec('beat_180s_c', 180, frequency=550),
+    BeatSpec('beat_600s', 600, frequency=660),
+]
+
+COVERS = [
+    CoverSpec('cover_720p', '1280x720'),
+    CoverSpec('cover_1080p', '1920x1080'),
+    # Huge phone-photo sized PNG, the case cover preprocessing targets
+    CoverSpec('cover_4000x3000', '4000x3000', extension='png'),
+]
+
+
+def ffmpeg_binary() -> str:
+    """ffmpeg executable used to build the corpus."""
+    return os.environ.get('FFMPEG_BINARY', 'ffmpeg')
+
+
+def _generate(args: List[str], target: Path) -> None:
+    """Run ffmpeg writing to a temporary name, then rename into place."""
+    partial = target.with_name(f"{target.stem}.part{target.suffix}")
+    cmd = [ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-y', *args, str(partial)]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+        os.replace(partial, target)
+    finally:
+        if partial.exists():
+            partial.unlink()
+
+
+def beat_path(spec: BeatSpec, corpus_dir: Path = CORPUS_DIR) -> Path:
+    """Location of a beat in the corpus, generated on first use."""
+    target = Path(corpus_dir) / f"{spec.name}.mp3"
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tone = f"sine=frequency={spec.frequency}:sample_rate=44100:duration={spec.seconds}"
+        noise = f"anoisesrc=color=pink:amplitude=0.1:sample_rate=44100:duration={spec.seconds}"
+        _generate([
+            '-f', 'lavfi', '-i', tone,
+            '-f', 'lavfi', '-i', noise,
+            '-filter_complex', '[0:a][1:a]amix=inputs=2,aformat=channel_layouts=stereo[a]',
+            '-map', '[a]', '-c:a', 'libmp3lame', '-b:a', '192k',
+        ], target)
+    return target
+
+
+def cover_path(spec: CoverSpec, corpus_dir: Path = CORPUS_DIR) -> Path:
+    """Location of a cover in the corpus, generated on first use."""
+    target = Path(corpus_dir) / f"{spec.name}.{spec.extension}"
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _generate([
+            '-f', 'lavfi', '-i', f"testsrc2=size={spec.size}:rate=1",
+            '-frames:v', '1',
+        ], target)
+    return target
+
+
+def build_corpus(corpus_dir: Path = CORPUS_DIR) -> Dict[str, Path]:
+    """
+    Make sure every beat and cover of the corpus exists.
+
+    Returns:
+        Mapping of spec name to file
+    """
+    files = {spec.name: beat_path(spec, corpus_dir) for spec in BEATS}
+    files.update({spec.name: cover_path(spec, corpus_dir) for spec in COVERS})
+    return files
+
+
+__all__ = [
+    'BEATS',
+    'COVERS',
+    'CORPUS_DIR',
+    'BeatSpec',
+    'CoverSpec',
+    'beat_path',
+    'build_corpus',
+    'cover_path',
+]
@@ -0,0 +1,316 @@
+"""Conversion benchmark cases, measurement and baseline comparison.
+
+``VideoConverter.convert`` is timed in-process for each encode profile,
+resolution and BPV value. ``ConversionRunner`` is timed in a subprocess for
+each pool size, so the whole pipeline (probing, scheduling, pool) is measured
+the way the GUI launches it.
+
+The workspace used by both is a scratch project root selected through
+``ECB_TOOL_ROOT``; it must be set before anything calls ``get_paths``.
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmarks.corpus import BEATS, COVERS, CORPUS_DIR, beat_path, cover_path, ffmpeg_binary
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PROFILES = ['standard', 'static_cover']
+RESOLUTIONS = ['1280x720', '1920x1080']
+BPV_VALUES = [1, 3]
+POOL_SIZES = [1, 2, 4]
+
+# Videos converted by each runner case
+RUNNER_ORDERS = 4
+
+# Relative change tolerated before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.10
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one benchmark case."""
+
+    name: str
+    kind: str  # 'convert' or 'runner'
+    params: Dict[str, Any]
+    media_seconds: float  # Length of the audio converted
+    wall_seconds: float = 0.0
+    cpu_seconds: Optional[float] = None  # ffmpeg/ffprobe children; None where unsupported
+    output_bytes: int = 0
+    ok: bool = True
+    error: Optional[str] = None
+
+    @property
+    def realtime_factor(self) -> Optional[float]:
+        """Seconds of video produced per wall-clock second."""
+        if not self.ok or self.wall_seconds <= 0:
+            return None
+        return self.media_seconds / self.wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['realtime_factor'] = self.realtime_factor
+        return data
+
+
+def child_cpu_seconds() -> Optional[float]:
+    """User + system CPU time of all waited-for child processes."""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows: no per-children accounting
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _tree_bytes(directory: Path) -> int:
+    return sum(f.stat().st_size for f in directory.rglob('*') if f.is_file())
+
+
+def _reset_dir(directory: Path) -> None:
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+
+class Workspace:
+    """Scratch project root the benchmarked code reads and writes."""
+
+    def __init__(self, root: Path, corpus_dir: Path = CORPUS_DIR, quick: bool = False):
+        self.root = Path(root).resolve()
+        self.corpus_dir = Path(corpus_dir)
+        self.quick = quick
+        for name in ('config', 'data', 'logs', 'oauth'):
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+        self.workspace = self.root / 'workspace'
+        self.beats = self.workspace / 'beats'
+        self.covers = self.workspace / 'covers'
+        self.videos = self.workspace / 'videos'
+        self.temp = self.workspace / 'temp'
+
+    def beat_files(self, count: int) -> List[Path]:
+        """Corpus beats for a job; quick mode only uses the shortest one."""
+        if self.quick:
+            return [beat_path(BEATS[0], self.corpus_dir)] * count
+        specs = [spec for spec in BEATS if spec.seconds == 180][:count]
+        return [beat_path(spec, self.corpus_dir) for spec in specs]
+
+    def runner_beats(self) -> List[Path]:
+        """One corpus beat per runner order, mixing short and long ones."""
+        if self.quick:
+            return self.beat_files(RUNNER_ORDERS)
+        return [beat_path(spec, self.corpus_dir) for spec in BEATS[:RUNNER_ORDERS]]
+
+    def cover_file(self, name: str = 'cover_1080p') -> Path:
+        spec = next(spec for spec in COVERS if spec.name == name)
+        return cover_path(spec, self.corpus_dir)
+
+    def reset(self) -> None:
+        """Start a case with empty outputs and cold caches."""
+        for directory in (self.beats, self.covers, self.videos, self.temp):
+            _reset_dir(directory)
+        (self.root / 'data' / 'conversion_journal.json').unlink(missing_ok=True)
+
+
+def _media_seconds(beats: List[Path]) -> float:
+    """Total length of corpus beats."""
+    lengths = {f"{spec.name}.mp3": spec.seconds for spec in BEATS}
+    return float(sum(lengths[beat.name] for beat in beats))
+
+
+def convert_cases(workspace: Workspace) -> Iterator[BenchmarkResult]:
+    """Time ``VideoConverter.convert`` across profiles, resolutions and BPV."""
+    from ecb_tool.features.conversion.converter import VideoConverter
+    from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+
+    for profile in PROFILES:
+        for resolution in RESOLUTIONS:
+            for bpv in BPV_VALUES:
+                params = {'profile': profile, 'resolution': resolution, 'bpv': bpv}
+                beats = workspace.beat_files(bpv)
+                result = BenchmarkResult(
+                    name=f"convert/{profile}/{resolution}/bpv{bpv}",
+                    kind='convert',
+                    params=params,
+                    media_seconds=_media_seconds(beats),
+                )
+
+                workspace.reset()
+                config = ConversionConfig(
+                    beats_dir=workspace.beats,
+                    covers_dir=workspace.covers,
+                    videos_dir=workspace.videos,
+                    resolution=resolution,
+                    encode_profile=profile,
+                    beats_per_video=bpv,
+                    reuse_cover_segments=True,
+                    preprocess_covers=True,
+                )
+                job = ConversionJob(
+                    id='bench',
+                    beat_files=beats,
+                    cover_file=workspace.cover_file(),
+                    output_file=workspace.videos / f"bench.{config.video_format}",
+                )
+
+                cpu_before = child_cpu_seconds()
+                start = time.perf_counter()
+                result.ok = VideoConverter(config).convert(job)
+                result.wall_seconds = time.perf_counter() - start
+                cpu_after = child_cpu_seconds()
+
+                if cpu_before is not None:
+                    result.cpu_seconds = cpu_after - cpu_before
+                if result.ok:
+                    result.output_bytes = job.output_file.stat().st_size
+                else:
+                    result.error = (job.error_message or '')[-500:]
+                yield result
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def runner_cases(workspace: Workspace) -> Iterator[BenchmarkResult]:
+    """Time a full ``ConversionRunner`` run for each pool size."""
+    for pool_size in POOL_SIZES:
+        workspace.reset()
+        beats = workspace.runner_beats()
+        for index, source in enumerate(beats):
+            # Unique names: each beat gives its name to one video
+            shutil.copyfile(source, workspace.beats / f"{index:02d}_{source.name}")
+        cover = workspace.cover_file()
+        shutil.copyfile(cover, workspace.covers / cover.name)
+
+        _write_json(workspace.root / 'config' / 'ajustes_conversion.json', {
+            'conversion': {
+                'lotes': pool_size,
+                'bpv': 1,
+                'omitir_actualizados': False,
+                'autoborrado_beats': False,
+                'autoborrado_portadas': False,
+            }
+        })
+        _write_json(workspace.root / 'config' / 'orden.json', {
+            'ordenes': RUNNER_ORDERS,
+            'cover_mode': 'Sequential',
+        })
+
+        result = BenchmarkResult(
+            name=f"runner/pool{pool_size}",
+            kind='runner',
+            params={'pool_size': pool_size, 'orders': RUNNER_ORDERS},
+            media_seconds=_media_seconds(beats),
+        )
+
+        env = dict(os.environ, ECB_TOOL_ROOT=str(workspace.root), PYTHONIOENCODING='utf-8')
+        cpu_before = child_cpu_seconds()
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-m', 'ecb_tool.features.conversion.runner'],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, encoding='utf-8',
+        )
+        result.wall_seconds = time.perf_counter() - start
+        cpu_after = child_cpu_seconds()
+
+        if cpu_before is not None:
+            result.cpu_seconds = cpu_after - cpu_before
+        result.output_bytes = _tree_bytes(workspace.videos)
+        produced = len(list(workspace.videos.glob('*_video.*')))
+        result.ok = process.returncode == 0 and produced == RUNNER_ORDERS
+        if not result.ok:
+            result.error = (process.stdout + process.stderr)[-500:]
+        yield result
+
+
+def machine_info() -> Dict[str, Any]:
+    """Description of the machine the benchmark ran on."""
+    try:
+        version = subprocess.run(
+            [ffmpeg_binary(), '-version'], capture_output=True, text=True
+        ).stdout.splitlines()[0]
+    except (OSError, IndexError):
+        version = None
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'ffmpeg': version,
+    }
+
+
+def build_report(results: List[BenchmarkResult], quick: bool = False) -> Dict[str, Any]:
+    """JSON-serializable report of a benchmark run."""
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'quick': quick,
+        'machine': machine_info(),
+        'results': [result.to_dict() for result in results],
+    }
+
+
+def compare_reports(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """
+    Find metrics that got worse than the baseline by more than ``tolerance``.
+
+    Realtime factor regresses when it drops; CPU seconds and output bytes
+    regress when they grow. Cases missing from either report are ignored.
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    previous = {result['name']: result for result in baseline.get('results', [])}
+    regressions = []
+
+    for result in current.get('results', []):
+        name = result['name']
+        old = previous.get(name)
+        if old is None:
+            continue
+        if old.get('ok') and not result.get('ok'):
+            regressions.append(f"{name}: failed ({result.get('error')})")
+            continue
+
+        for metric, higher_is_better in (
+            ('realtime_factor', True),
+            ('cpu_seconds', False),
+            ('output_bytes', False),
+        ):
+            new_value, old_value = result.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}: {metric} {old_value:.4g} → {new_value:.4g} ({change:+.1%})")
+
+    return regressions
+
+
+__all__ = [
+    'BenchmarkResult',
+    'DEFAULT_TOLERANCE',
+    'Workspace',
+    'build_report',
+    'compare_reports',
+    'convert_cases',
+    'runner_cases',
+]
@@ -0,0 +1,7 @@
+"""``python -m ecb_tool``: same as the ``ecb-tool`` command."""
+
+import sys
+
+from ecb_tool.cli import main
+
+sys.exit(main())
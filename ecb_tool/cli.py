@@ -0,0 +1,306 @@
+"""Headless command line for the conversion and upload pipelines.
+
+    ecb-tool                  desktop app
+    ecb-tool convert -n 5     convert 5 orders
+    ecb-tool upload           upload every finished video
+    ecb-tool plan -n 5        predict a run without starting it
+    ecb-tool status           what is queued, running and free
+
+Nothing here imports PyQt6, and each command only imports the pipeline it
+runs, so the tool starts quickly from cron or systemd on a server without a
+display. With --json every step is written to stdout as one JSON object per
+line and the human-readable log goes to stderr. With --every, convert and
+upload keep running as a daemon and repeat the run until SIGTERM.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import sys
+import threading
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not locked against each other
+    fcntl = None
+
+from ecb_tool.core.paths import ROOT_ENV_VAR, get_paths
+
+
+# Exit codes besides 0 (success) and 2 (bad arguments, from argparse)
+EXIT_FAILED = 1  # Some job failed
+EXIT_BUSY = 3  # The same pipeline is already running
+
+Emit = Callable[[Dict[str, Any]], None]
+
+
+class JsonLines:
+    """Writes events as JSON lines; safe to call from the encoder threads."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        event = {"time": datetime.now().isoformat(timespec='seconds'), **event}
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class AlreadyRunning(Exception):
+    """Raised when another process holds a pipeline's lock."""
+
+
+@contextmanager
+def pipeline_lock(name: str) -> Iterator[None]:
+    """
+    Hold the lock of a pipeline for the duration of a run.
+
+    A cron job that fires while the previous run is still going exits
+    instead of converting the same beats twice. The lock is released by
+    the OS if the process dies.
+
+    Raises:
+        AlreadyRunning: If another process holds the lock
+    """
+    if fcntl is None:
+        yield
+        return
+    path = get_paths().data / f'.{name}.lock'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Opened without truncating: the holder's PID stays readable
+    with open(path, 'a+', encoding='utf-8') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise AlreadyRunning(name) from None
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        yield
+
+
+def is_locked(name: str) -> bool:
+    """True if a process is running the pipeline right now."""
+    try:
+        with pipeline_lock(name):
+            return False
+    except AlreadyRunning:
+        return True
+
+
+def _run_pipeline(name: str, make_runner: Callable[[Emit], Any], run: Callable[[Any], None],
+                  args, emit: Optional[Emit]) -> int:
+    """
+    Run a pipeline once, or every ``args.every`` seconds until stopped.
+
+    SIGTERM and Ctrl+C cancel the run in progress and end the loop.
+    """
+    stop = threading.Event()
+    current = {}
+
+    def on_signal(signum, frame):
+        stop.set()
+        if current.get('runner') is not None:
+            current['runner'].cancel()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    try:
+        with pipeline_lock(name):
+            while True:
+                result = {}
+
+                def on_event(event: Dict[str, Any]):
+                    if event['event'] in ('summary', 'error'):
+                        result.update(event)
+                    if emit:
+                        emit(event)
+
+                current['runner'] = make_runner(on_event)
+                if stop.is_set():
+                    return 0
+                run(current['runner'])
+                current['runner'] = None
+
+                code = EXIT_FAILED if result.get('failed') or result.get('event') == 'error' else 0
+                if not args.every or stop.wait(args.every):
+                    return code
+    except AlreadyRunning:
+        print(f"⚠️ Ya hay una {'conversión' if name == 'convert' else 'subida'} en curso",
+              file=sys.stderr)
+        if emit:
+            emit({"event": "busy", "pipeline": name})
+        return EXIT_BUSY
+
+
+def _orders(args) -> int:
+    """Orders to convert: from the command line, or the app's order settings."""
+    if args.orders:
+        return args.orders
+    from ecb_tool.core.config import ConfigManager
+    return ConfigManager(get_paths().order_config, {"ordenes": 1}).get("ordenes", 1)
+
+
+def cmd_convert(args, emit: Optional[Emit]) -> int:
+    """Convert beats to videos."""
+    from ecb_tool.features.conversion.runner import ConversionRunner
+
+    orders = _orders(args)
+    return _run_pipeline('convert', lambda on_event: ConversionRunner(on_event=on_event),
+                         lambda runner: runner.run(orders), args, emit)
+
+
+def cmd_upload(args, emit: Optional[Emit]) -> int:
+    """Upload finished videos to YouTube."""
+    from ecb_tool.features.upload.runner import UploadRunner
+
+    return _run_pipeline('upload', lambda on_event: UploadRunner(on_event=on_event),
+                         lambda runner: runner.run(args.limit), args, emit)
+
+
+def cmd_plan(args, emit: Optional[Emit]) -> int:
+    """Predict the cost of a conversion run without starting it."""
+    from ecb_tool.features.conversion.planner import format_bytes, format_duration
+    from ecb_tool.features.conversion.runner import ConversionRunner
+
+    plan = ConversionRunner().plan(_orders(args), args.bpv)
+    if emit:
+        emit({"event": "plan", **asdict(plan)})
+        return 0
+    print(f"🔮 {plan.jobs} videos, {format_duration(plan.media_seconds)} de contenido")
+    print(f"  - Conversión: {format_duration(plan.wall_seconds)}"
+          + ("" if plan.calibrated else " (sin calibrar)"))
+    print(f"  - Tamaño: {format_bytes(plan.output_bytes)}")
+    print(f"  - Subida: {format_duration(plan.upload_seconds)}")
+    if plan.unknown_durations:
+        print(f"  - ⚠️ {plan.unknown_durations} órdenes con beats ilegibles (no incluidas)")
+    return 0
+
+
+def collect_status() -> Dict[str, Any]:
+    """Snapshot of the queues, the running pipelines and the free disk space."""
+    from ecb_tool.core.config import ConfigManager
+    from ecb_tool.core.state_manager import get_state_manager
+    from ecb_tool.features.conversion.journal import ConversionJournal
+    from ecb_tool.features.conversion.models import AUDIO_EXTENSIONS, IMAGE_EXTENSIONS
+    from ecb_tool.features.conversion.planner import plan_upload
+
+    paths = get_paths()
+
+    def files(directory: Path, suffixes) -> list:
+        if not directory.exists():
+            return []
+        return [f for f in directory.iterdir()
+                if f.is_file() and not f.name.startswith('.') and f.name.lower().endswith(suffixes)]
+
+    videos = files(paths.videos, ('.mp4',))
+    upload = plan_upload(videos, get_state_manager())
+    order = ConfigManager(paths.order_config, {"proceso": False})
+    disk = paths.videos if paths.videos.exists() else paths.root
+    return {
+        "root": str(paths.root),
+        "converting": is_locked('convert') or bool(order.get("proceso", False)),
+        "uploading": is_locked('upload'),
+        "paused": paths.pause_flag.exists(),
+        "stop_requested": paths.stop_flag.exists(),
+        "beats": len(files(paths.beats, tuple(AUDIO_EXTENSIONS))),
+        "covers": len(files(paths.covers, tuple(IMAGE_EXTENSIONS))),
+        "pending_jobs": len(ConversionJournal(paths.conversion_journal).unfinished_jobs()),
+        "videos_to_upload": upload.videos,
+        "bytes_to_upload": upload.total_bytes,
+        "upload_seconds": round(upload.seconds),
+        "free_bytes": shutil.disk_usage(disk).free,
+    }
+
+
+def cmd_status(args, emit: Optional[Emit]) -> int:
+    """Show what is queued, running and free."""
+    from ecb_tool.features.conversion.planner import format_bytes, format_duration
+
+    status = collect_status()
+    if emit:
+        emit({"event": "status", **status})
+        return 0
+    running = [name for name, busy in (("convirtiendo", status["converting"]),
+                                       ("subiendo", status["uploading"])) if busy]
+    print(f"📂 {status['root']}")
+    print(f"  - Estado: {', '.join(running) if running else 'inactivo'}"
+          + (" (en pausa)" if status["paused"] else ""))
+    print(f"  - Beats: {status['beats']}, portadas: {status['covers']}, "
+          f"órdenes pendientes: {status['pending_jobs']}")
+    print(f"  - Videos por subir: {status['videos_to_upload']} "
+          f"({format_bytes(status['bytes_to_upload'])}, {format_duration(status['upload_seconds'])})")
+    print(f"  - Espacio libre: {format_bytes(status['free_bytes'])}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='ecb-tool',
+        description="ECB Tool: convierte beats en videos y los sube a YouTube. "
+                    "Sin comando se abre la aplicación de escritorio.",
+    )
+    parser.add_argument('--root', type=Path,
+                        help=f"Carpeta del proyecto (por defecto ${ROOT_ENV_VAR} o la instalación)")
+    parser.add_argument('--json', action='store_true',
+                        help="Eventos como líneas JSON en stdout; el registro va a stderr")
+    # --json is also accepted after the command; SUPPRESS keeps the value set before it
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                        help="Eventos como líneas JSON en stdout; el registro va a stderr")
+    commands = parser.add_subparsers(dest='command', metavar='COMANDO')
+
+    convert = commands.add_parser('convert', parents=[common], help="Convertir beats en videos")
+    convert.add_argument('-n', '--orders', type=int, help="Videos a crear (por defecto, los de orden.json)")
+    convert.add_argument('--every', type=float, metavar='SEGUNDOS',
+                         help="Repetir cada SEGUNDOS hasta recibir SIGTERM (modo servicio)")
+    convert.set_defaults(handler=cmd_convert)
+
+    upload = commands.add_parser('upload', parents=[common], help="Subir los videos terminados")
+    upload.add_argument('-n', '--limit', type=int, help="Subir como máximo N videos")
+    upload.add_argument('--every', type=float, metavar='SEGUNDOS',
+                        help="Repetir cada SEGUNDOS hasta recibir SIGTERM (modo servicio)")
+    upload.set_defaults(handler=cmd_upload)
+
+    plan = commands.add_parser('plan', parents=[common], help="Prever una conversión sin iniciarla")
+    plan.add_argument('-n', '--orders', type=int, help="Videos a prever (por defecto, los de orden.json)")
+    plan.add_argument('--bpv', type=int, help="Beats por video (por defecto, los configurados)")
+    plan.set_defaults(handler=cmd_plan)
+
+    status = commands.add_parser('status', parents=[common], help="Estado de las colas y los procesos")
+    status.set_defaults(handler=cmd_status)
+
+    commands.add_parser('gui', help="Abrir la aplicación de escritorio")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Entry point of the ``ecb-tool`` command."""
+    args = build_parser().parse_args(argv)
+    if args.root is not None:
+        os.environ[ROOT_ENV_VAR] = str(args.root.resolve())
+
+    if args.command in (None, 'gui'):
+        from ecb_tool.main import main as gui_main
+        return gui_main()
+
+    emit = JsonLines(sys.stdout) if args.json else None
+    # Keep stdout for the JSON lines; the runners' log goes to stderr
+    with redirect_stdout(sys.stderr) if emit else nullcontext():
+        return args.handler(args, emit)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
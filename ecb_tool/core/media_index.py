@@ -0,0 +1,300 @@
+"""
+Persistent media metadata index.
+
+Caches ffprobe results in a local SQLite file keyed by path, size and
+modification time, so durations, codecs and image sizes are only probed
+again when a file changes.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import ffmpeg
+
+from ecb_tool.core.paths import get_paths
+
+
+# Upper bound for concurrent ffprobe processes
+MAX_PROBE_WORKERS = 8
+
+# Seconds an ffprobe may take before it is considered hung (stalled mounts)
+PROBE_TIMEOUT = 120.0
+
+# Niceness of ffprobe children, matching the encodes they run next to
+PROBE_NICE = 10
+
+
+@dataclass
+class MediaInfo:
+    """ffprobe metadata of a single file."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    duration: Optional[float] = None
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    channel_layout: Optional[str] = None
+    bit_rate: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the file could be probed."""
+        return self.error is None
+
+
+_COLUMNS = [f.name for f in fields(MediaInfo)]
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def run_ffprobe(path: str, cmd: str = 'ffprobe', timeout: Optional[float] = PROBE_TIMEOUT,
+                nice: int = PROBE_NICE) -> dict:
+    """
+    Run ffprobe on a file with a time limit and a lowered CPU priority.
+
+    Args:
+        path: Media file
+        cmd: ffprobe binary
+        timeout: Seconds before the child is killed (None waits forever)
+        nice: Niceness applied to the child (0 keeps the current one)
+
+    Returns:
+        Parsed JSON with ``format`` and ``streams``
+
+    Raises:
+        ffmpeg.Error: If ffprobe rejects the file
+        TimeoutError: If ffprobe does not answer within ``timeout``
+        OSError: If ffprobe cannot be started
+    """
+    process = subprocess.Popen(
+        [cmd, '-show_format', '-show_streams', '-of', 'json', path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # Set from the parent: preexec_fn is unsafe in the probe threads
+    if nice > 0 and hasattr(os, 'setpriority'):
+        try:
+            os.setpriority(os.PRIO_PROCESS, process.pid, min(19, nice))
+        except OSError:
+            pass
+
+    try:
+        out, err = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise TimeoutError(f'ffprobe did not answer in {timeout:g} s: {path}')
+
+    if process.returncode != 0:
+        raise ffmpeg.Error('ffprobe', out, err)
+    return json.loads(out.decode('utf-8'))
+
+
+def parse_probe(path: str, size: int, mtime_ns: int, probe: dict) -> MediaInfo:
+    """
+    Build a MediaInfo from ffprobe JSON output.
+
+    Audio fields come from the first audio stream; width/height from the
+    first video stream (covers, or artwork embedded in audio files).
+    """
+    streams = probe.get('streams', [])
+    audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+    video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    main = audio or video or {}
+
+    return MediaInfo(
+        path=path,
+        size=size,
+        mtime_ns=mtime_ns,
+        duration=_to_float(probe.get('format', {}).get('duration')),
+        codec=main.get('codec_name'),
+        sample_rate=_to_int(audio.get('sample_rate')) if audio else None,
+        channels=_to_int(audio.get('channels')) if audio else None,
+        channel_layout=audio.get('channel_layout') if audio else None,
+        bit_rate=_to_int(main.get('bit_rate') or probe.get('format', {}).get('bit_rate')),
+        width=_to_int(video.get('width')) if video else None,
+        height=_to_int(video.get('height')) if video else None,
+    )
+
+
+class MediaIndex:
+    """SQLite-backed cache of ffprobe results."""
+
+    def __init__(self, db_path: Path, timeout: Optional[float] = PROBE_TIMEOUT,
+                 nice: int = PROBE_NICE):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self.nice = nice
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "duration REAL, codec TEXT, sample_rate INTEGER, channels INTEGER, "
+            "channel_layout TEXT, bit_rate INTEGER, width INTEGER, height INTEGER, "
+            "error TEXT)"
+        )
+        self._conn.commit()
+
+    def _lookup(self, key: str) -> Optional[MediaInfo]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM media WHERE path = ?", (key,)
+            ).fetchone()
+        return MediaInfo(*row) if row else None
+
+    def _store(self, info: MediaInfo) -> None:
+        values = [getattr(info, name) for name in _COLUMNS]
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO media ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                values,
+            )
+            self._conn.commit()
+
+    def _probe(self, key: str, size: int, mtime_ns: int) -> MediaInfo:
+        """Run ffprobe on a file (no caching)."""
+        cmd = os.environ.get('FFPROBE_BINARY', 'ffprobe')
+        try:
+            probe = run_ffprobe(key, cmd=cmd, timeout=self.timeout, nice=self.nice)
+        except ffmpeg.Error as e:
+            error = e.stderr.decode(errors='replace').strip() if e.stderr else str(e)
+            return MediaInfo(path=key, size=size, mtime_ns=mtime_ns, error=error or 'ffprobe failed')
+        return parse_probe(key, size, mtime_ns, probe)
+
+    def get(self, path: Path) -> Optional[MediaInfo]:
+        """
+        Metadata of a file, probing it only if it is new or changed.
+
+        Args:
+            path: Media file
+
+        Returns:
+            MediaInfo (with ``error`` set if ffprobe rejected the file), or
+            None if the file does not exist or ffprobe is not available
+        """
+        try:
+            key = str(Path(path).resolve())
+            stat = os.stat(key)
+        except OSError:
+            return None
+
+        cached = self._lookup(key)
+        if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+            return cached
+
+        try:
+            info = self._probe(key, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            # ffprobe missing or hung: nothing worth remembering
+            return None
+
+        self._store(info)
+        return info
+
+    def probe_many(self, paths: Iterable[Path], workers: Optional[int] = None) -> Dict[Path, Optional[MediaInfo]]:
+        """
+        Index many files in parallel.
+
+        Args:
+            paths: Files to index
+            workers: Concurrent ffprobe processes (defaults to CPU count, capped)
+
+        Returns:
+            Mapping of each path to its MediaInfo (or None)
+        """
+        paths = list(paths)
+        if not paths:
+            return {}
+
+        workers = workers or min(MAX_PROBE_WORKERS, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ffprobe') as executor:
+            return dict(zip(paths, executor.map(self.get, paths)))
+
+    def duration(self, path: Path) -> Optional[float]:
+        """Duration of a file in seconds, or None if unknown."""
+        info = self.get(path)
+        return info.duration if info and info.ok else None
+
+    def total_duration(self, paths: List[Path]) -> Optional[float]:
+        """
+        Summed duration of several files.
+
+        Returns:
+            Total seconds, or None if any duration is unknown
+        """
+        infos = self.probe_many(paths)
+        total = 0.0
+        for info in (infos[path] for path in paths):
+            if not info or not info.ok or info.duration is None:
+                return None
+            total += info.duration
+        return total
+
+    def configure(self, timeout: Optional[float] = PROBE_TIMEOUT, nice: int = PROBE_NICE) -> None:
+        """
+        Set the limits of future ffprobe runs.
+
+        Args:
+            timeout: Seconds before a probe is considered hung (None or 0 waits forever)
+            nice: Niceness of ffprobe children
+        """
+        self.timeout = timeout or None
+        self.nice = nice
+
+    def forget(self, path: Path) -> None:
+        """Drop a file from the index."""
+        with self._lock:
+            self._conn.execute("DELETE FROM media WHERE path = ?", (str(Path(path).resolve()),))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global instance - lazy loaded
+_media_index: Optional[MediaIndex] = None
+
+
+def get_media_index() -> MediaIndex:
+    """Get global MediaIndex instance (singleton pattern)."""
+    global _media_index
+    if _media_index is None:
+        _media_index = MediaIndex(get_paths().media_index)
+    return _media_index
+
+
+__all__ = [
+    'MediaInfo',
+    'MediaIndex',
+    'get_media_index',
+    'parse_probe',
+    'run_ffprobe',
+]
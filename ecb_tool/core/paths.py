@@ -46,9 +46,14 @@ class ProjectPaths:
     conversion_state: Path
     upload_state: Path
     app_log: Path
+    media_index: Path
+    loudness_index: Path
+    conversion_journal: Path
+    concurrency_log: Path
     
     # Special files
     stop_flag: Path
+    pause_flag: Path
     
     # FFmpeg
     ffmpeg_dir: Path
@@ -57,10 +62,17 @@ class ProjectPaths:
     ffplay_bin: Path
 
 
+# Environment variable pointing at a project root to use instead of this one
+ROOT_ENV_VAR = 'ECB_TOOL_ROOT'
+
+
 def find_project_root(start_path: Optional[Path] = None) -> Path:
     """
     Find project root by looking for main.py or config/orden.json.
     
+    The ECB_TOOL_ROOT environment variable overrides the search when no
+    start path is given (benchmarks and headless runs on another workspace).
+    
     Args:
         start_path: Path to start search from (defaults to this file's directory)
     
@@ -68,6 +80,9 @@ def find_project_root(start_path: Optional[Path] = None) -> Path:
         Path to project root
     """
     if start_path is None:
+        override = os.environ.get(ROOT_ENV_VAR)
+        if override:
+            return Path(override).resolve()
         start_path = Path(__file__).parent
     
     current = Path(start_path).resolve()
@@ -139,9 +154,14 @@ def get_project_paths(root_dir: Optional[Path] = None) -> ProjectPaths:
     conversion_state = data / 'conversion_state.csv'
     upload_state = data / 'upload_state.csv'
     app_log = data / 'app.log'
+    media_index = data / 'media_index.sqlite'
+    loudness_index = data / 'loudness.sqlite'
+    conversion_journal = data / 'conversion_journal.json'
+    concurrency_log = data / 'concurrency_log.csv'
     
     # Special files
     stop_flag = root / '.parar'
+    pause_flag = root / '.pausar'
     
     # FFmpeg paths
     ffmpeg_dir = root / 'ffmpeg'
@@ -177,7 +197,12 @@ def get_project_paths(root_dir: Optional[Path] = None) -> ProjectPaths:
         conversion_state=conversion_state,
         upload_state=upload_state,
         app_log=app_log,
+        media_index=media_index,
+        loudness_index=loudness_index,
+        conversion_journal=conversion_journal,
+        concurrency_log=concurrency_log,
         stop_flag=stop_flag,
+        pause_flag=pause_flag,
         ffmpeg_dir=ffmpeg_dir,
         ffmpeg_bin=ffmpeg_bin,
         ffprobe_bin=ffprobe_bin,
@@ -231,6 +256,7 @@ def reset_paths() -> None:
 
 
 __all__ = [
+    'ROOT_ENV_VAR',
     'ProjectPaths',
     'find_project_root',
     'get_project_paths',
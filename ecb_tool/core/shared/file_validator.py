@@ -1,7 +1,11 @@
 """Sistema de validación de archivos necesarios."""
 import os
-from typing import Dict, List
+import shutil
+from typing import Dict, List, Optional
+from ecb_tool.core.config import ConfigManager
+from ecb_tool.core.paths import get_paths
 from ecb_tool.core.shared.paths import ROOT_DIR
+from ecb_tool.features.conversion.diskspace import DEFAULT_RESERVE_BYTES, GB
 
 
 class FileValidator:
@@ -14,6 +18,8 @@ class FileValidator:
         self.videos_dir = os.path.join(self.workspace, 'videos')
         self.titles_file = os.path.join(ROOT_DIR, 'data', 'titles.txt')
         self.description_file = os.path.join(ROOT_DIR, 'data', 'description.txt')
+        self._reserve = float(DEFAULT_RESERVE_BYTES)
+        self._config_stamp: Optional[tuple] = None
     
     def _count_files(self, directory: str, extensions: List[str]) -> int:
         """Cuenta archivos con extensiones específicas."""
@@ -25,16 +31,53 @@ class FileValidator:
                 count += 1
         return count
     
+    def free_space(self) -> int:
+        """Bytes libres en el disco donde se escriben los videos."""
+        directory = self.videos_dir
+        while not os.path.exists(directory) and os.path.dirname(directory) != directory:
+            directory = os.path.dirname(directory)
+        try:
+            return shutil.disk_usage(directory).free
+        except OSError:
+            return 0
+    
+    def reserve_bytes(self) -> float:
+        """Espacio que debe quedar libre: la reserva configurada (reserva_disco_gb)."""
+        path = get_paths().conversion_config
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        # Misma reserva que el DiskGovernor; solo se relee si cambia el archivo
+        if stamp != self._config_stamp:
+            default_gb = DEFAULT_RESERVE_BYTES / GB
+            config = ConfigManager(path, {"conversion": {"reserva_disco_gb": default_gb}})
+            reserve_gb = config.get("conversion", {}).get("reserva_disco_gb", default_gb)
+            self._reserve = float(reserve_gb) * GB
+            self._config_stamp = stamp
+        return self._reserve
+    
     def check_conversion_files(self) -> Dict:
         """Verifica archivos necesarios para conversión."""
         beats = self._count_files(self.beats_dir, ['.mp3', '.wav', '.flac', '.ogg'])
         covers = self._count_files(self.covers_dir, ['.jpg', '.jpeg', '.png', '.gif'])
+        free = self.free_space()
+        
+        missing = []
+        if beats == 0:
+            missing.append('beats')
+        if covers == 0:
+            missing.append('covers')
+        if free < self.reserve_bytes():
+            missing.append('espacio en disco')
         
         return {
             'beats': beats,
             'covers': covers,
-            'ready': beats > 0 and covers > 0,
-            'missing': []
+            'free_bytes': free,
+            'ready': len(missing) == 0,
+            'missing': missing
         }
     
     def check_upload_files(self) -> Dict:
@@ -10,3 +10,4 @@ CONVERSION_STATE_CSV = str(_p.conversion_state)
 UPLOAD_STATE_CSV = str(_p.upload_state)
 ROUTES_CONFIG_PATH = str(_p.routes_config)
 PARAR_PATH = str(_p.stop_flag)
+PAUSAR_PATH = str(_p.pause_flag)
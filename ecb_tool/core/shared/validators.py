@@ -178,7 +178,9 @@ CONVERSION_CONFIG_SCHEMA = {
         "type": "dict",
         "properties": {
             "bpv": {"type": "int", "min": 1, "max": 10},
-            "lotes": {"type": "int", "min": 1, "max": 10},
+            "lotes": {"type": "int", "min": 0, "max": 32},
+            "duracion_min_minutos": {"type": "int", "min": 0, "max": 600},
+            "duracion_max_minutos": {"type": "int", "min": 0, "max": 600},
             "fps": {"type": "int", "min": 1, "max": 120},
             "resolucion": {"type": "string"},
             "bitrate_video": {"type": "string"},
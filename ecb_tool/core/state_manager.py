@@ -38,6 +38,13 @@ class StateManager:
                 'timestamp', 'job_id', 'video_file', 'video_id', 
                 'title', 'status', 'error_message'
             ])
+
+        # Concurrency decisions CSV
+        if not self.paths.concurrency_log.exists():
+            self._init_csv(self.paths.concurrency_log, [
+                'timestamp', 'workers', 'previous', 'throughput',
+                'cpu_busy', 'iowait', 'memory_available', 'reason'
+            ])
             
         # General State JSON (for counters, indices, etc)
         # Using a general state file in config dir
@@ -82,6 +89,20 @@ class StateManager:
                 datetime.now().isoformat(),
                 job_id, beat, cover, output, status, error
             ])
+
+    def log_concurrency(self, workers: int, previous: int, throughput: Optional[float],
+                        cpu_busy: Optional[float], iowait: Optional[float],
+                        memory_available: Optional[float], reason: str):
+        """Log a decision of the adaptive concurrency controller to CSV."""
+        def fmt(value):
+            return '' if value is None else f'{value:.3f}'
+
+        with open(self.paths.concurrency_log, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                datetime.now().isoformat(), workers, previous, fmt(throughput),
+                fmt(cpu_busy), fmt(iowait), fmt(memory_available), reason
+            ])
             
     # --- Upload State ---
     
@@ -127,6 +148,69 @@ class StateManager:
         state['used_covers_no_repeat'] = []
         self._save_json(self.state_json_path, state)
 
+    # --- Encode Speed Calibration ---
+
+    def get_encode_speed(self, key: str) -> Optional[float]:
+        """Get the calibrated encode speed (encoded s per wall s) for a settings key."""
+        state = self._load_json(self.state_json_path)
+        return state.get('encode_speeds', {}).get(key)
+
+    def set_encode_speed(self, key: str, speed: float):
+        """Store the calibrated encode speed for a settings key."""
+        state = self._load_json(self.state_json_path)
+        state.setdefault('encode_speeds', {})[key] = speed
+        self._save_json(self.state_json_path, state)
+
+    # --- Run Planning ---
+
+    def get_output_rate(self, key: str) -> Optional[float]:
+        """Get the measured output bytes per second of video for a settings key."""
+        state = self._load_json(self.state_json_path)
+        return state.get('output_rates', {}).get(key)
+
+    def set_output_rate(self, key: str, rate: float):
+        """Store the measured output bytes per second of video for a settings key."""
+        state = self._load_json(self.state_json_path)
+        state.setdefault('output_rates', {})[key] = rate
+        self._save_json(self.state_json_path, state)
+
+    def get_upload_rate(self) -> Optional[float]:
+        """Get the measured upload throughput in bytes per second."""
+        state = self._load_json(self.state_json_path)
+        return state.get('upload_rate')
+
+    def set_upload_rate(self, rate: float):
+        """Store the measured upload throughput in bytes per second."""
+        state = self._load_json(self.state_json_path)
+        state['upload_rate'] = rate
+        self._save_json(self.state_json_path, state)
+
+    # --- Output Fingerprints ---
+
+    def get_output_fingerprint(self, output: str) -> Optional[Dict[str, Any]]:
+        """Get the build record of a converted video."""
+        state = self._load_json(self.state_json_path)
+        return state.get('output_fingerprints', {}).get(output)
+
+    def set_output_fingerprint(self, output: str, record: Dict[str, Any]):
+        """Store the build record of a converted video."""
+        state = self._load_json(self.state_json_path)
+        state.setdefault('output_fingerprints', {})[output] = record
+        self._save_json(self.state_json_path, state)
+
+    # --- Preset Calibration ---
+
+    def get_calibration(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the preset calibration stored for a machine and settings key."""
+        state = self._load_json(self.state_json_path)
+        return state.get('preset_calibrations', {}).get(key)
+
+    def set_calibration(self, key: str, calibration: Dict[str, Any]):
+        """Store the preset calibration for a machine and settings key."""
+        state = self._load_json(self.state_json_path)
+        state.setdefault('preset_calibrations', {})[key] = calibration
+        self._save_json(self.state_json_path, state)
+
 # Global Instance
 _state_manager = None
 
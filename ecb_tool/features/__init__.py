@@ -1,8 +1,25 @@
 """Features package - organized by business features."""
 
-from ecb_tool.features.conversion import VideoConverter, ConversionConfig
-from ecb_tool.features.upload import VideoUploader, UploadConfig
-from ecb_tool.features.settings import SettingsManager
+from importlib import import_module
+
+# Re-exports are imported on first use: the headless CLI must not pay for
+# the YouTube client or ffmpeg-python when it only needs one feature
+_EXPORTS = {
+    'VideoConverter': 'ecb_tool.features.conversion',
+    'ConversionConfig': 'ecb_tool.features.conversion',
+    'VideoUploader': 'ecb_tool.features.upload',
+    'UploadConfig': 'ecb_tool.features.upload',
+    'SettingsManager': 'ecb_tool.features.settings',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'VideoConverter',
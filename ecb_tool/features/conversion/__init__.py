@@ -1,8 +1,24 @@
 """Video conversion feature."""
 
-from ecb_tool.features.conversion.converter import VideoConverter
-from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
-from ecb_tool.features.conversion.runner import ConversionRunner
+from importlib import import_module
+
+# Imported on first use, so planning and status queries do not load
+# ffmpeg-python, Pillow and NumPy
+_EXPORTS = {
+    'VideoConverter': 'ecb_tool.features.conversion.converter',
+    'ConversionConfig': 'ecb_tool.features.conversion.models',
+    'ConversionJob': 'ecb_tool.features.conversion.models',
+    'ConversionRunner': 'ecb_tool.features.conversion.runner',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'VideoConverter',
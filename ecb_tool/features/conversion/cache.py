@@ -0,0 +1,153 @@
+"""Content-addressed file cache shared by the conversion stages."""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+
+def file_digest(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileCache:
+    """Stores generated files in a directory, one file per key.
+
+    Entries are produced on demand by a render callable. When ``max_bytes``
+    is set, the least recently used entries are evicted once the directory
+    grows past it; a hit refreshes the entry's modification time. Entries
+    pinned by an owner (a running job) are never evicted until the owner
+    releases them, so parallel jobs cannot delete files another job's
+    ffmpeg is about to open.
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+    _pins: Dict[str, Set[str]] = {}  # Entry path -> owners using it
+
+    def __init__(self, cache_dir: Path, extension: str, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        self.extension = extension
+        self.max_bytes = max_bytes
+
+    def path_for(self, key: str) -> Path:
+        """Location of the entry for a key."""
+        return self.cache_dir / f"{key}.{self.extension}"
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(f"{self.cache_dir}/{key}", threading.Lock())
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @classmethod
+    def pin(cls, path: Path, owner: str) -> None:
+        """Keep an entry from being evicted until ``owner`` releases it."""
+        with cls._locks_guard:
+            cls._pins.setdefault(str(path), set()).add(owner)
+
+    @classmethod
+    def release(cls, owner: str) -> None:
+        """Drop every pin held by ``owner``."""
+        with cls._locks_guard:
+            for path, owners in list(cls._pins.items()):
+                owners.discard(owner)
+                if not owners:
+                    del cls._pins[path]
+
+    def get_or_create(self, key: str, render: Callable[[Path], None],
+                      owner: Optional[str] = None) -> Path:
+        """
+        Return the cached entry for ``key``, rendering it if missing.
+
+        Parallel callers asking for the same key wait for a single render.
+        Entries are written to a temporary name and renamed when complete,
+        so an interrupted render never leaves a truncated file behind.
+
+        Args:
+            key: Cache key
+            render: Writes the entry to the path it is given
+            owner: Pins the entry for this owner (see ``release``)
+        """
+        target = self.path_for(key)
+        if owner is not None:
+            # Before the existence check, so no eviction can slip in between
+            self.pin(target, owner)
+        if target.exists():
+            self._touch(target)
+            return target
+
+        with self._lock_for(key):
+            if target.exists():
+                self._touch(target)
+                return target
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(f"{key}.part.{self.extension}")
+            try:
+                render(partial)
+                os.replace(partial, target)
+            finally:
+                if partial.exists():
+                    partial.unlink()
+
+        self.evict(keep=target)
+        return target
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Delete least recently used entries until the cache fits ``max_bytes``.
+
+        Pinned entries are skipped, so the cache may stay over budget while
+        the jobs using them run.
+
+        Args:
+            keep: Entry that must survive (the one just created)
+
+        Returns:
+            Bytes freed
+        """
+        if not self.max_bytes or not self.cache_dir.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*.{self.extension}"):
+            if '.part.' in path.name:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            with self._locks_guard:
+                if self._pins.get(str(path)):
+                    continue
+                try:
+                    path.unlink()
+                except OSError:
+                    continue  # Still open by a running ffmpeg (Windows)
+            freed += size
+
+        return freed
+
+
+__all__ = ['FileCache', 'file_digest']
@@ -0,0 +1,202 @@
+"""Encoder preset calibration.
+
+Slower libx264 presets compress better but encode slower, and where the line
+falls depends on the machine. Calibration runs short trial encodes of a real
+beat and cover with each preset, fastest first, and keeps the slowest one
+that still encodes at the target realtime factor. Results are stored per
+machine and settings, and a ``preset`` of ``auto`` picks them up.
+
+Usage:
+    python -m ecb_tool.features.conversion.calibration [--target 8] [--crf 20,23,26]
+"""
+
+import argparse
+import platform
+import sys
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.models import X264_PRESETS, ConversionConfig
+from ecb_tool.features.conversion.pool import available_cpus
+
+
+# Preset used when ``auto`` is configured but the machine is not calibrated
+DEFAULT_PRESET = "medium"
+
+# Realtime factor each job must reach when none is configured
+DEFAULT_TARGET_SPEED = 8.0
+
+# Length of each trial encode
+SAMPLE_SECONDS = 10.0
+
+
+@dataclass
+class Calibration:
+    """Outcome of calibrating the preset for one machine and settings."""
+
+    preset: str
+    crf: Optional[int]
+    target_speed: float
+    meets_target: bool  # False: even the fastest preset is too slow
+    trials: List[Dict[str, Any]] = field(default_factory=list)
+    measured: str = ""
+
+
+def machine_key() -> str:
+    """Identifies the machine a calibration was measured on."""
+    return f"{platform.node()}|{platform.machine()}|{platform.processor()}|{available_cpus()}cpu"
+
+
+def calibration_key(config: ConversionConfig) -> str:
+    """Machine and settings a calibration applies to (everything but the preset)."""
+    mode = "loop" if config.reuse_cover_segments else "encode"
+    return "|".join(str(value) for value in (
+        machine_key(),
+        config.encode_profile,
+        config.resolution,
+        config.effective_fps,
+        config.effective_video_bitrate,
+        config.crf,
+        mode,
+        f"t{config.threads}",
+    ))
+
+
+def calibrate_preset(
+    config: ConversionConfig,
+    beat: Path,
+    cover: Path,
+    target_speed: float = DEFAULT_TARGET_SPEED,
+    presets: Optional[List[str]] = None,
+    seconds: float = SAMPLE_SECONDS,
+    on_trial: Optional[Callable[[str, Dict[str, float]], None]] = None,
+) -> Calibration:
+    """
+    Find the slowest preset that still encodes at ``target_speed``.
+
+    Presets are tried fastest first; the search stops at the first one that
+    misses the target, since slower presets only get slower.
+
+    Args:
+        config: Settings to calibrate (its preset is ignored)
+        beat: Beat to use as audio
+        cover: Cover image
+        target_speed: Required encoded seconds per wall second
+        presets: Presets to try, fastest first (default X264_PRESETS)
+        seconds: Length of each trial encode
+        on_trial: Called with (preset, trial_encode() result) after each trial
+
+    Raises:
+        ffmpeg.Error: If a trial encode fails
+    """
+    presets = presets or X264_PRESETS
+    trials = []
+    chosen = None
+
+    for preset in presets:
+        result = VideoConverter(replace(config, preset=preset)).trial_encode(beat, cover, seconds)
+        trials.append({'preset': preset, **result})
+        if on_trial:
+            on_trial(preset, result)
+        if result['speed'] < target_speed:
+            break
+        chosen = preset
+
+    return Calibration(
+        preset=chosen or presets[0],
+        crf=config.crf,
+        target_speed=target_speed,
+        meets_target=chosen is not None,
+        trials=trials,
+        measured=datetime.now().isoformat(timespec='seconds'),
+    )
+
+
+def resolve_preset(config: ConversionConfig, state_manager) -> Optional[Calibration]:
+    """
+    Replace an ``auto`` preset with the one calibrated for this machine.
+
+    Returns:
+        The calibration used, or None if the machine is not calibrated (the
+        default preset is used then)
+    """
+    stored = state_manager.get_calibration(calibration_key(config))
+    calibration = Calibration(**stored) if stored else None
+    config.preset = calibration.preset if calibration else DEFAULT_PRESET
+    return calibration
+
+
+def _parse_crfs(value: str) -> List[Optional[int]]:
+    return [None if item.strip().lower() == 'none' else int(item) for item in value.split(',')]
+
+
+def main(argv=None) -> int:
+    """Calibrate the preset for the current settings and store the result."""
+    from ecb_tool.core.state_manager import get_state_manager
+    from ecb_tool.features.conversion.runner import ConversionRunner
+
+    parser = argparse.ArgumentParser(description="Calibra el preset de libx264 para esta máquina")
+    parser.add_argument('--target', type=float, help='Factor de tiempo real mínimo por trabajo')
+    parser.add_argument('--crf', type=_parse_crfs,
+                        help='Valores de CRF a calibrar, separados por comas (none = bitrate)')
+    parser.add_argument('--beat', type=Path, help='Beat de muestra (por defecto, el primero)')
+    parser.add_argument('--cover', type=Path, help='Portada de muestra (por defecto, la primera)')
+    parser.add_argument('--seconds', type=float, default=SAMPLE_SECONDS,
+                        help='Duración de cada muestra')
+    parser.add_argument('--no-store', action='store_true', help='Solo recomendar, sin guardar')
+    args = parser.parse_args(argv)
+
+    runner = ConversionRunner()
+    config = runner.converter_config
+    target = args.target or runner.config.get("conversion", {}).get(
+        "objetivo_tiempo_real", DEFAULT_TARGET_SPEED)
+
+    beat = args.beat or next(iter(runner.converter.list_beats()), None)
+    cover = args.cover or next(iter(runner.converter.list_covers()), None)
+    if beat is None or cover is None:
+        print("❌ Hace falta al menos un beat y una portada para calibrar")
+        return 1
+
+    state_manager = get_state_manager()
+    print(f"🎯 Objetivo: {target:g}x tiempo real por trabajo ({config.threads} hilos)")
+    print(f"🎵 {beat.name} + 🖼️ {cover.name}")
+
+    for crf in args.crf or [config.crf]:
+        crf_config = replace(config, crf=crf)
+        print(f"\n— CRF {crf if crf is not None else 'desactivado (bitrate)'}")
+
+        def report(preset: str, result: Dict[str, float]):
+            print(f"  {preset:>10}: {result['speed']:.1f}x, {result['bytes'] / 1024:.0f} KB")
+
+        calibration = calibrate_preset(crf_config, beat, cover, target, seconds=args.seconds,
+                                       on_trial=report)
+        if calibration.meets_target:
+            print(f"✅ Recomendado: {calibration.preset}")
+        else:
+            print(f"⚠️ Ningún preset alcanza {target:g}x; "
+                  f"el más rápido es {calibration.preset}")
+
+        if not args.no_store:
+            state_manager.set_calibration(calibration_key(crf_config), asdict(calibration))
+
+    if not args.no_store:
+        print("\n💾 Calibración guardada; usa preset \"auto\" para aplicarla")
+    return 0
+
+
+__all__ = [
+    'Calibration',
+    'DEFAULT_PRESET',
+    'DEFAULT_TARGET_SPEED',
+    'calibrate_preset',
+    'calibration_key',
+    'machine_key',
+    'resolve_preset',
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
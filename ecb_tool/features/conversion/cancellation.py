@@ -0,0 +1,211 @@
+"""Cancellation and pause shared by the runner, the pool workers and the converter.
+
+The stop flag used to be read only between jobs, so STOP during a long
+encode waited for it to finish. A CancellationToken knows every ffmpeg
+child that is running; cancelling it kills them at once, and the converter
+then deletes their partial outputs and reports the jobs as cancelled.
+
+Pausing suspends the same children in place (SIGSTOP) and resuming
+continues them (SIGCONT), so the CPU is freed without losing any encode
+progress. Where processes cannot be suspended (Windows), a pause only keeps
+new jobs from starting.
+
+The token is controlled in-process (ConversionRunner.cancel/pause/resume,
+called by the UI) or by a StopFlagWatcher that follows the '.parar' and
+'.pausar' flag files, for runs started from another process.
+"""
+
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+
+# Seconds between checks for the flag files
+WATCH_INTERVAL = 0.05
+
+# Running children can be suspended in place (POSIX only)
+SUSPEND_SUPPORTED = hasattr(signal, 'SIGSTOP')
+
+
+class Cancelled(Exception):
+    """Raised when an encode was stopped by a cancellation request."""
+
+
+class CancellationToken:
+    """Thread-safe cancel and pause requests, applied to the ffmpeg children it tracks."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: Set[subprocess.Popen] = set()
+        self._paused_at: Optional[float] = None
+        self._paused_total = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() was called."""
+        return self._event.is_set()
+
+    @property
+    def paused(self) -> bool:
+        """True between pause() and resume()."""
+        return self._paused_at is not None
+
+    @property
+    def paused_seconds(self) -> float:
+        """Wall time spent paused so far, including a pause in progress."""
+        with self._lock:
+            current = time.monotonic() - self._paused_at if self._paused_at is not None else 0.0
+            return self._paused_total + current
+
+    def cancel(self) -> None:
+        """Request cancellation and kill every tracked process."""
+        with self._lock:
+            self._event.set()
+            self._end_pause()
+            processes = list(self._processes)
+        for process in processes:
+            _kill(process)
+
+    def pause(self) -> None:
+        """Suspend every tracked process, and any started until resume()."""
+        with self._lock:
+            if self.paused or self.cancelled:
+                return
+            self._paused_at = time.monotonic()
+            processes = list(self._processes)
+        for process in processes:
+            _suspend(process)
+
+    def resume(self) -> None:
+        """Continue the processes suspended by pause()."""
+        with self._lock:
+            if not self.paused:
+                return
+            self._end_pause()
+            processes = list(self._processes)
+        for process in processes:
+            _continue(process)
+
+    def _end_pause(self) -> None:
+        """Add the pause in progress to the total (lock held)."""
+        if self._paused_at is not None:
+            self._paused_total += time.monotonic() - self._paused_at
+            self._paused_at = None
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises:
+            Cancelled: If cancellation was requested
+        """
+        if self.cancelled:
+            raise Cancelled()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or ``timeout`` elapses; True if cancelled."""
+        return self._event.wait(timeout)
+
+    @contextmanager
+    def track(self, process: subprocess.Popen) -> Iterator[subprocess.Popen]:
+        """Kill or suspend ``process`` when the run is cancelled or paused."""
+        with self._lock:
+            self._processes.add(process)
+            cancelled, paused = self.cancelled, self.paused
+        if cancelled:
+            _kill(process)  # Cancelled while it was being spawned
+        elif paused:
+            _suspend(process)  # Started by a job that was already running
+        try:
+            yield process
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """Kill a child at once; its output is deleted anyway, so no clean shutdown."""
+    try:
+        process.kill()
+    except OSError:
+        pass  # Already exited
+
+
+def _suspend(process: subprocess.Popen) -> None:
+    """Stop a child where it is (no-op where unsupported)."""
+    if SUSPEND_SUPPORTED:
+        try:
+            process.send_signal(signal.SIGSTOP)
+        except OSError:
+            pass
+
+
+def _continue(process: subprocess.Popen) -> None:
+    """Continue a child stopped by _suspend."""
+    if SUSPEND_SUPPORTED:
+        try:
+            process.send_signal(signal.SIGCONT)
+        except OSError:
+            pass
+
+
+class StopFlagWatcher:
+    """Cancels a token as soon as the stop flag file appears.
+
+    With a pause flag, the token is also paused while that file exists.
+    """
+
+    def __init__(
+        self,
+        flag: Path,
+        token: CancellationToken,
+        interval: float = WATCH_INTERVAL,
+        pause_flag: Optional[Path] = None,
+    ):
+        self.flag = Path(flag)
+        self.pause_flag = Path(pause_flag) if pause_flag is not None else None
+        self.token = token
+        self.interval = interval
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name='stop-flag', daemon=True)
+
+    def _watch(self) -> None:
+        paused = False
+        while not self._done.wait(self.interval):
+            if self.flag.exists():
+                self.token.cancel()
+                return
+            if self.pause_flag is not None and self.pause_flag.exists() != paused:
+                paused = not paused
+                if paused:
+                    self.token.pause()
+                else:
+                    self.token.resume()
+
+    def start(self) -> 'StopFlagWatcher':
+        """Start watching in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._done.set()
+        self._thread.join()
+
+    def __enter__(self) -> 'StopFlagWatcher':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+__all__ = [
+    'CancellationToken',
+    'Cancelled',
+    'SUSPEND_SUPPORTED',
+    'StopFlagWatcher',
+    'WATCH_INTERVAL',
+]
@@ -0,0 +1,132 @@
+"""Segment-parallel encoding of long videos.
+
+A single libx264 process stops scaling after a few cores, so one long BPV
+mix keeps most of a big machine idle. When a job's video has to be encoded
+(the cover is not stream-copied from cached loop segments), long jobs are
+split instead:
+
+- the timeline is cut into chunks of a whole number of GOPs, so every
+  chunk starts on a keyframe of the regular cadence, and no cut falls
+  inside a fade;
+- the video chunks are encoded in parallel, each by its own ffmpeg with a
+  share of the job's threads;
+- the chunks are joined with the concat demuxer (stream copy) while the
+  audio is encoded once, as a single track, so the joins have no gaps.
+"""
+
+from dataclasses import dataclass, replace
+from typing import List, Sequence, Tuple
+
+from ecb_tool.features.conversion.models import ConversionConfig
+from ecb_tool.features.conversion.transitions import Fade
+
+
+# GOP length used when the profile sets no keyframe interval (libx264's default)
+DEFAULT_KEYINT = 250
+
+# ffmpeg threads per chunk encode; libx264 scales well up to about this many
+THREADS_PER_CHUNK = 4
+
+# Share of a chunked job's progress taken by the video chunks; the rest is
+# the final mux, which encodes the audio
+CHUNKS_SHARE = 90.0
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One stretch of a job's video, encoded on its own."""
+
+    index: int
+    start: float  # Seconds from the start of the video
+    duration: float
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+def gop_frames(config: ConversionConfig) -> int:
+    """Frames between two keyframes of the job's video."""
+    keyframe_seconds = config.profile.keyframe_seconds
+    if not keyframe_seconds:
+        return DEFAULT_KEYINT
+    return max(1, int(config.effective_fps * keyframe_seconds))
+
+
+def plan_chunks(
+    duration: float,
+    chunk_seconds: float,
+    fps: int,
+    gop: int,
+    fades: Sequence[Fade] = (),
+) -> List[Chunk]:
+    """
+    Cut a video into chunks for parallel encoding.
+
+    Args:
+        duration: Length of the video
+        chunk_seconds: Wanted length of each chunk
+        fps: Frame rate
+        gop: Frames per GOP; chunks are a whole number of GOPs long
+        fades: Video fades; a cut inside one moves to the next GOP after it
+
+    Returns:
+        Chunks in order, covering the whole video. The last one takes the
+        remainder, so it is not always a whole number of GOPs.
+    """
+    total = round(duration * fps)
+    step = max(1, round(chunk_seconds * fps / gop)) * gop
+    windows = [(round(fade.start * fps), round(fade.end * fps)) for fade in fades]
+
+    cuts = [0]
+    cut = step
+    # A tail shorter than one GOP is not worth its own encode
+    while cut <= total - gop:
+        while any(start < cut < end for start, end in windows):
+            cut += gop
+        if cut > total - gop:
+            break
+        cuts.append(cut)
+        cut += step
+    cuts.append(total)
+
+    return [
+        Chunk(index, first / fps, (last - first) / fps)
+        for index, (first, last) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+def chunk_fades(fades: Sequence[Fade], chunk: Chunk) -> List[Fade]:
+    """Fades inside ``chunk``, on the chunk's own timeline."""
+    return [
+        replace(fade, start=fade.start - chunk.start)
+        for fade in fades
+        if fade.start >= chunk.start and fade.end <= chunk.end
+    ]
+
+
+def chunk_workers(threads: int, chunks: int) -> Tuple[int, int]:
+    """
+    How to spread a job's threads over its chunks.
+
+    Args:
+        threads: Threads the job may use
+        chunks: Number of chunks
+
+    Returns:
+        (parallel encodes, ffmpeg threads of each)
+    """
+    workers = max(1, min(chunks, threads // THREADS_PER_CHUNK))
+    return workers, max(1, threads // workers)
+
+
+__all__ = [
+    'CHUNKS_SHARE',
+    'Chunk',
+    'DEFAULT_KEYINT',
+    'THREADS_PER_CHUNK',
+    'chunk_fades',
+    'chunk_workers',
+    'gop_frames',
+    'plan_chunks',
+]
@@ -0,0 +1,213 @@
+"""Adaptive concurrency for the conversion pool.
+
+No fixed number of parallel jobs suits every machine: 8-core laptops
+thrash with too many encoders, and a 32-core box idles with too few. The
+ConcurrencyController adjusts the limit while the pool runs, by hill
+climbing on measured throughput (encoded media seconds per wall second,
+across all jobs) with AIMD safety:
+
+- memory pressure or heavy I/O wait halves the limit (multiplicative
+  decrease);
+- with idle CPU, the limit grows by one job per interval (additive
+  increase) as long as throughput keeps up;
+- an increase that did not pay off is undone, and the controller waits a
+  few intervals before probing again.
+
+Lowering the limit never kills a running job; the pool simply starts fewer
+new ones. System load is read from /proc; elsewhere only throughput is used.
+"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+
+# Seconds between two decisions. Encodes take minutes, so each step needs
+# time to show its effect on throughput.
+ADJUST_INTERVAL = 30.0
+
+# Below this fraction of memory available, jobs are shed
+MIN_AVAILABLE_MEMORY = 0.10
+
+# Above this fraction of CPU time waiting on I/O, the disk is the bottleneck
+MAX_IOWAIT = 0.25
+
+# Below this CPU use there is room for another job
+MAX_BUSY_FOR_INCREASE = 0.85
+
+# An increase must not cost more than this fraction of throughput
+THROUGHPUT_TOLERANCE = 0.05
+
+# Intervals to wait after an increase had to be undone
+BACKOFF_INTERVALS = 4
+
+_PROC = Path('/proc')
+
+
+@dataclass
+class SystemLoad:
+    """Machine-wide load over the last interval (fractions of 1)."""
+
+    cpu_busy: float
+    iowait: float
+    memory_available: float
+
+
+@dataclass
+class ConcurrencyDecision:
+    """One step of the controller, for logging and tuning."""
+
+    workers: int  # Limit after the decision
+    previous: int
+    throughput: Optional[float]  # Encoded seconds per wall second
+    load: Optional[SystemLoad]
+    reason: str
+
+
+class SystemMonitor:
+    """Samples CPU, I/O wait and memory from /proc/stat and /proc/meminfo."""
+
+    def __init__(self, proc: Path = _PROC):
+        self.proc = Path(proc)
+        self._last = self._cpu_times()
+
+    def _cpu_times(self) -> Optional[list]:
+        try:
+            with open(self.proc / 'stat', encoding='utf-8') as f:
+                fields = f.readline().split()
+        except OSError:
+            return None
+        # user nice system idle iowait irq softirq steal
+        return [int(value) for value in fields[1:9]]
+
+    def _memory_available(self) -> Optional[float]:
+        info = {}
+        try:
+            with open(self.proc / 'meminfo', encoding='utf-8') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    info[key] = int(value.split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+        if not info.get('MemTotal') or 'MemAvailable' not in info:
+            return None
+        return info['MemAvailable'] / info['MemTotal']
+
+    def sample(self) -> Optional[SystemLoad]:
+        """
+        Load since the previous sample.
+
+        Returns:
+            The load, or None where /proc is unavailable
+        """
+        current = self._cpu_times()
+        memory = self._memory_available()
+        previous, self._last = self._last, current
+        if current is None or previous is None or memory is None:
+            return None
+        delta = [now - before for now, before in zip(current, previous)]
+        total = sum(delta)
+        if total <= 0:
+            return None
+        idle, iowait = delta[3], delta[4]
+        return SystemLoad(
+            cpu_busy=(total - idle - iowait) / total,
+            iowait=iowait / total,
+            memory_available=memory,
+        )
+
+
+class ConcurrencyController:
+    """Chooses how many jobs the pool runs at once."""
+
+    def __init__(
+        self,
+        minimum: int,
+        maximum: int,
+        initial: int,
+        encoded_seconds: Callable[[], float],
+        monitor: Optional[SystemMonitor] = None,
+        interval: float = ADJUST_INTERVAL,
+        on_decision: Optional[Callable[[ConcurrencyDecision], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            minimum: Fewest jobs to run at once (hard limit)
+            maximum: Most jobs to run at once (hard limit)
+            initial: Limit to start with
+            encoded_seconds: Media seconds encoded so far by the whole run
+            monitor: Source of system load (None = throughput only)
+            interval: Seconds between decisions
+            on_decision: Called with every decision
+            clock: Time source (injectable for tests)
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.workers = min(self.maximum, max(self.minimum, int(initial)))
+        self.encoded_seconds = encoded_seconds
+        self.monitor = monitor
+        self.interval = interval
+        self.on_decision = on_decision
+        self.clock = clock
+
+        self._last_time = clock()
+        self._last_encoded = encoded_seconds()
+        self._baseline: Optional[float] = None  # Throughput before the last increase
+        self._backoff = 0
+
+    def limit(self) -> int:
+        """Current limit, re-evaluated once per interval."""
+        now = self.clock()
+        if now - self._last_time >= self.interval:
+            self._adjust(now)
+        return self.workers
+
+    def _adjust(self, now: float) -> None:
+        encoded = self.encoded_seconds()
+        throughput = (encoded - self._last_encoded) / (now - self._last_time)
+        self._last_time, self._last_encoded = now, encoded
+        load = self.monitor.sample() if self.monitor else None
+
+        previous = self.workers
+        workers, reason = self._decide(throughput, load)
+        self.workers = min(self.maximum, max(self.minimum, workers))
+        if self.on_decision:
+            self.on_decision(ConcurrencyDecision(self.workers, previous, throughput, load, reason))
+
+    def _decide(self, throughput: float, load: Optional[SystemLoad]):
+        """New limit and the reason for it."""
+        current = self.workers
+        baseline, self._baseline = self._baseline, None
+
+        if load is not None and load.memory_available < MIN_AVAILABLE_MEMORY:
+            self._backoff = BACKOFF_INTERVALS
+            return current // 2, "memoria"
+        if load is not None and load.iowait > MAX_IOWAIT:
+            self._backoff = BACKOFF_INTERVALS
+            return current // 2, "espera de disco"
+
+        if baseline is not None and throughput < baseline * (1 - THROUGHPUT_TOLERANCE):
+            # The last job added made the run slower
+            self._backoff = BACKOFF_INTERVALS
+            return current - 1, "sin mejora"
+        if self._backoff:
+            self._backoff -= 1
+            return current, "espera"
+
+        if load is not None and load.cpu_busy >= MAX_BUSY_FOR_INCREASE:
+            return current, "CPU ocupada"
+        if current < self.maximum:
+            self._baseline = throughput
+            return current + 1, "CPU libre" if load is not None else "sondeo"
+        return current, "máximo"
+
+
+__all__ = [
+    'ADJUST_INTERVAL',
+    'ConcurrencyController',
+    'ConcurrencyDecision',
+    'SystemLoad',
+    'SystemMonitor',
+]
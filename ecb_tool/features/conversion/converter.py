@@ -1,82 +1,731 @@
 """Video converter using FFmpeg."""
 
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 import ffmpeg
 
+from ecb_tool.core.media_index import get_media_index
 from ecb_tool.core.paths import get_paths
-from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+from ecb_tool.features.conversion.models import (
+    AUDIO_EXTENSIONS,
+    IMAGE_EXTENSIONS,
+    X264_PRESETS,
+    ConversionConfig,
+    ConversionJob,
+    Rendition,
+)
+from ecb_tool.features.conversion.cache import FileCache
+from ecb_tool.features.conversion import visualizer
+from ecb_tool.features.conversion.covers import CoverPreprocessor, parse_resolution
+from ecb_tool.features.conversion.loudness import get_loudness_index, loudnorm_args
+from ecb_tool.features.conversion.cancellation import CancellationToken, Cancelled
+from ecb_tool.features.conversion.chunks import (
+    CHUNKS_SHARE,
+    Chunk,
+    chunk_fades,
+    chunk_workers,
+    gop_frames,
+    plan_chunks,
+)
+from ecb_tool.features.conversion.progress import run_with_progress
+from ecb_tool.features.conversion.supervisor import ProcessHung, SupervisorPolicy
+from ecb_tool.features.conversion.transitions import (
+    TransitionPlan,
+    apply_fades,
+    crossfade_streams,
+    plan_transitions,
+    video_timeline,
+)
+from ecb_tool.features.conversion.segments import (
+    SEGMENT_CACHE_MAX_BYTES,
+    SEGMENT_SECONDS,
+    fade_clip_key,
+    loop_entries,
+    segment_key,
+    write_concat_entries,
+    write_concat_files,
+    write_concat_list,
+)
+
+
+# Videos are written under this extra suffix and renamed when complete, so
+# nothing that looks for '.mp4' files ever sees a half-written video
+PARTIAL_SUFFIX = '.part'
+
+# ffmpeg muxer names that differ from the file extension
+MUXERS = {'mkv': 'matroska'}
+
+
+def partial_path(output_file: Path) -> Path:
+    """Temporary name a video is written to until it is complete."""
+    return output_file.with_name(output_file.name + PARTIAL_SUFFIX)
+
+
+def _tee_escape(path: Path) -> str:
+    """Escape a file name for the tee muxer's output list."""
+    name = Path(path).as_posix()
+    for char in ('\\', "'", '|', '[', ']'):
+        name = name.replace(char, '\\' + char)
+    return name
 
 
 class VideoConverter:
     """Handles video conversion from beats and covers."""
     
-    def __init__(self, config: ConversionConfig, on_progress=None):
+    def __init__(self, config: ConversionConfig, on_progress=None,
+                 cancel_token: Optional[CancellationToken] = None):
         self.config = config
         self.paths = get_paths()
         self.on_progress = on_progress
+        # Cancelling it kills every encode in progress
+        self.cancel_token = cancel_token or CancellationToken()
+        # Every ffmpeg child runs niced and watched for hangs
+        self.policy = SupervisorPolicy(
+            nice=config.process_nice,
+            io_class=config.io_class,
+            io_level=config.io_level,
+            stall_seconds=config.stall_seconds,
+            retries=max(0, config.hang_retries),
+        )
     
-    def convert(self, job: ConversionJob) -> bool:
+    def _threads(self, job: Optional[ConversionJob] = None) -> int:
+        """ffmpeg -threads of a job (0 = let ffmpeg decide)."""
+        return (job.threads if job else 0) or self.config.threads
+    
+    def _list_files(self, directory: Path, extensions: set) -> List[Path]:
+        """List visible files with the given extensions, sorted by name."""
+        if not directory.exists():
+            return []
+        
+        return sorted(
+            f for f in directory.iterdir()
+            if f.is_file() and not f.name.startswith('.') and f.suffix.lower() in extensions
+        )
+    
+    def list_beats(self) -> List[Path]:
+        """List all available beat files."""
+        return self._list_files(self.config.beats_dir, AUDIO_EXTENSIONS)
+    
+    def list_covers(self) -> List[Path]:
+        """List all available cover images."""
+        return self._list_files(self.config.covers_dir, IMAGE_EXTENSIONS)
+    
+    def probe_duration(self, files: List[Path]) -> Optional[float]:
         """
-        Convert beats + cover to video.
-        Supports BPV (Beats Per Video) via concatenation.
+        Total duration of the given media files in seconds.
+        
+        Results come from the media index, so files are only probed again
+        when they change.
+        
+        Returns:
+            Summed duration, or None if any file cannot be probed
         """
-        try:
-            job.output_file.parent.mkdir(parents=True, exist_ok=True)
-            width, height = map(int, self.config.resolution.split('x'))
-            
-            # Prepare Logic for Multiple Beats
-            audio_inputs = []
-            total_duration_est = 0
+        return get_media_index().total_duration(files)
+    
+    def probe_durations(self, files: List[Path]) -> Optional[List[float]]:
+        """
+        Duration of each of the given media files in seconds.
+        
+        Returns:
+            Durations in order, or None if any file cannot be probed
+        """
+        infos = get_media_index().probe_many(files)
+        durations = []
+        for info in (infos[path] for path in files):
+            if not info or not info.ok or info.duration is None:
+                return None
+            durations.append(info.duration)
+        return durations
+    
+    def _encoder_args(self, fps: int) -> Dict[str, object]:
+        """libx264 options shared by every video stream of an output."""
+        profile = self.config.profile
+        
+        args = {
+            'vcodec': 'libx264',
+            'pix_fmt': 'yuv420p',
+        }
+        if self.config.preset in X264_PRESETS:
+            args['preset'] = self.config.preset
+        if profile.tune:
+            args['tune'] = profile.tune
+        if profile.keyframe_seconds:
+            args['g'] = max(1, int(fps * profile.keyframe_seconds))
+        return args
+    
+    def _rate_args(self, bitrate: str, stream: Optional[str] = None) -> Dict[str, object]:
+        """
+        Rate control options for a video stream.
+        
+        Args:
+            bitrate: Target bitrate, or the ceiling in CRF mode
+            stream: Stream specifier the options apply to (e.g. 'v:1');
+                None for an output with a single video stream
+        """
+        if self.config.crf is not None:
+            # Constant quality, with the bitrate as a ceiling so sizes stay bounded
+            args = {'crf': self.config.crf, 'maxrate': bitrate, 'bufsize': bitrate}
+        else:
+            args = {'video_bitrate': bitrate}
+        if stream is None:
+            return args
+        if 'video_bitrate' in args:
+            args = {'b': args.pop('video_bitrate')}
+        return {f'{key}:{stream}': value for key, value in args.items()}
+    
+    def _video_args(self, fps: int) -> Dict[str, object]:
+        """Encoder options for the looped cover video."""
+        width, height = map(int, self.config.resolution.split('x'))
+        
+        args = self._encoder_args(fps)
+        args['s'] = f'{width}x{height}'
+        args.update(self._rate_args(self.config.effective_video_bitrate))
+        return args
+    
+    def _audio_args(self, copy_audio: bool = False) -> Dict[str, object]:
+        """Audio options: encode once, or stream-copy matching beats."""
+        if copy_audio:
+            return {'acodec': 'copy'}
+        return {'acodec': self.config.audio_format, 'audio_bitrate': self.config.audio_bitrate}
+    
+    def _audio_concat_codec(self, files: List[Path]) -> Optional[str]:
+        """
+        Codec shared by all files when they can be joined with the concat demuxer.
+        
+        The demuxer splices packets without decoding, which is only valid when
+        every file has the same codec, sample rate and channel layout.
+        
+        Returns:
+            The common codec name, or None if the files differ or cannot be probed
+        """
+        signatures = set()
+        for info in get_media_index().probe_many(files).values():
+            if not info or not info.ok or not info.codec:
+                return None
+            # Embedded artwork shifts stream order, so it must match too
+            signatures.add((info.codec, info.sample_rate, info.channels,
+                            info.channel_layout, info.width is not None))
+        if len(signatures) != 1:
+            return None
+        return signatures.pop()[0]
+    
+    def _beat_audio(self, beat: Path):
+        """
+        Audio of one beat, normalized to the loudness target if enabled.
+        
+        The beat's loudness is measured once and cached, so this only adds
+        the corrective loudnorm pass to the job's graph.
+        """
+        # Only take the audio: MP3s often carry the artwork as a video stream
+        audio = ffmpeg.input(str(beat))['a']
+        if self.config.loudness_target is None:
+            return audio
+        
+        # Measured under the job's token and supervision: STOP kills the
+        # pass (the job ends cancelled) and the configured nice and hang
+        # limits apply to it as to the encodes
+        measurement = get_loudness_index().get(beat, cancel=self.cancel_token, policy=self.policy)
+        if measurement is not None and measurement.silent:
+            return audio
+        # loudnorm works (and outputs) at 192 kHz; go back to the beat's rate
+        info = get_media_index().get(beat)
+        sample_rate = info.sample_rate if info and info.ok and info.sample_rate else 48000
+        return (audio
+                .filter('loudnorm', **loudnorm_args(measurement, self.config.loudness_target))
+                .filter('aresample', sample_rate))
+    
+    def _audio_stream(
+        self,
+        job: ConversionJob,
+        audio_list: Optional[Path] = None,
+        plan: Optional[TransitionPlan] = None,
+    ):
+        """Audio of the job's beats, concatenated when BPV > 1, with gain and the plan's fades."""
+        if audio_list is not None:
+            # Beats share their format: splice them without a filter graph
+            audio = ffmpeg.input(str(audio_list), f='concat', safe=0)['a']
+        else:
+            audio_inputs = [self._beat_audio(beat) for beat in job.beat_files]
             
-            for beat in job.beat_files:
-                inp = ffmpeg.input(str(beat))
-                audio_inputs.append(inp)
-                # Note: Getting duration requires probing, might slow down start. 
-                # For concat, we usually just concat streams.
-                
             # Concatenate Audio if > 1
-            if len(audio_inputs) > 1:
+            if len(audio_inputs) > 1 and plan is not None and plan.crossfade:
+                # [0:a][1:a]acrossfade[a01];[a01][2:a]acrossfade...
+                audio = crossfade_streams(audio_inputs, plan.crossfade)
+            elif len(audio_inputs) > 1:
                 # [0:a][1:a]...concat=n=N:v=0:a=1[outa]
-                audio_stream = ffmpeg.concat(*audio_inputs, v=0, a=1).node[0]
+                audio = ffmpeg.concat(*audio_inputs, v=0, a=1).node[0]
             elif len(audio_inputs) == 1:
-                audio_stream = audio_inputs[0]
+                audio = audio_inputs[0]
             else:
                 raise ValueError("No beat files provided for job.")
-
+        
+        if self.config.volume_db:
+            audio = audio.filter('volume', f'{self.config.volume_db:g}dB')
+        if plan is not None:
+            audio = apply_fades(audio, plan.audio_fades, 'afade')
+        return audio
+    
+    def _build_output(
+        self,
+        job: ConversionJob,
+        output_file: Path,
+        limit_seconds: Optional[float] = None,
+        loop_list: Optional[Path] = None,
+        audio_list: Optional[Path] = None,
+        copy_audio: bool = False,
+        raw_video: bool = False,
+        plan: Optional[TransitionPlan] = None,
+    ):
+        """
+        Build the ffmpeg-python output stream for a job.
+        
+        Args:
+            job: Conversion job (beats + cover)
+            output_file: Where to write the video
+            limit_seconds: Stop encoding after this many seconds (trial encodes)
+            loop_list: Concat list of a pre-encoded cover segment; the video is
+                stream-copied from it instead of encoding the cover
+            audio_list: Concat list of the job's beats, used instead of the
+                concat filter when they share codec parameters
+            copy_audio: Stream-copy the audio (beats already in the output codec)
+            raw_video: Read RGB24 frames of the output size from stdin (visualizer)
+            plan: Fades and crossfades to apply; with a loop_list the video
+                fades are already part of the list
+        """
+        fps = self.config.effective_fps
+        
+        if raw_video:
+            width, height = parse_resolution(self.config.resolution)
+            video_stream = ffmpeg.input('pipe:', f='rawvideo', pix_fmt='rgb24',
+                                        s=f'{width}x{height}', framerate=fps)
+            video_args = self._video_args(fps)
+        elif loop_list is not None:
+            video_stream = ffmpeg.input(str(loop_list), f='concat', safe=0)['v']
+            video_args = {'vcodec': 'copy'}
+        else:
             # Input Cover (Loop)
             # We rely on 'shortest=False' (default) but since image is infinite loop, 
             # we must set it to match audio duration.
             # However, ffmpeg 'shortest=1' makes output as short as shortest stream.
             # If we loop image, image stream is infinite. Audio is finite.
             # So shortest=1 should work to cut video when audio ends.
-            video_stream = ffmpeg.input(str(job.cover_file), loop=1, framerate=self.config.fps)
+            cover = self._source_cover(job.cover_file)
+            video_stream = ffmpeg.input(str(cover), loop=1, framerate=fps)
+            video_args = self._video_args(fps)
+        
+        if plan is not None and loop_list is None:
+            video_stream = apply_fades(video_stream, plan.video_fades)
+        audio_stream = self._audio_stream(job, audio_list, plan)
+        
+        # Output (format given explicitly: the name may end in PARTIAL_SUFFIX)
+        output_args = dict(video_args)
+        output_args['f'] = MUXERS.get(self.config.video_format, self.config.video_format)
+        output_args.update(self._audio_args(copy_audio))
+        if self._threads(job) > 0:
+            # Share of the cores when several jobs run in parallel
+            output_args['threads'] = self._threads(job)
+        if limit_seconds:
+            output_args['t'] = limit_seconds
+        
+        out = ffmpeg.output(
+            video_stream,
+            audio_stream,
+            str(output_file),
+            shortest=None, # We use -shortest argument in .global_args usually vs kwargs
+            **output_args
+        )
+        
+        # Add global args
+        out = out.global_args('-shortest') # Cut when shorter stream (audio) ends
+        return out.overwrite_output()
+    
+    def _rendition_stream(self, source, rendition: Rendition):
+        """Fit one split of the cover to a rendition's frame."""
+        width, height = parse_resolution(rendition.resolution)
+        if rendition.fit == 'crop':
+            stream = (source
+                      .filter('scale', width, height, force_original_aspect_ratio='increase')
+                      .filter('crop', width, height))
+        else:
+            stream = (source
+                      .filter('scale', width, height, force_original_aspect_ratio='decrease')
+                      .filter('pad', width, height, '(ow-iw)/2', '(oh-ih)/2'))
+        return stream.filter('setsar', 1)
+    
+    def _build_renditions_output(
+        self,
+        job: ConversionJob,
+        output_files: List[Path],
+        limit_seconds: Optional[float] = None,
+        audio_list: Optional[Path] = None,
+        copy_audio: bool = False,
+        plan: Optional[TransitionPlan] = None,
+    ):
+        """
+        Build one ffmpeg run writing every rendition of a job.
+        
+        The cover is decoded once and split into one scaled branch per
+        rendition. All streams go to the tee muxer, so the audio is encoded
+        once and each file takes its own video stream plus the shared audio.
+        
+        Args:
+            job: Conversion job with renditions
+            output_files: Where to write each rendition, in order
+            limit_seconds: Stop encoding after this many seconds
+            audio_list: Concat list of the job's beats (see _build_output)
+            copy_audio: Stream-copy the audio
+            plan: Fades and crossfades to apply
+        """
+        fps = self.config.effective_fps
+        
+        # Each rendition has its own frame, so the original cover is used
+        # instead of one preprocessed to config.resolution
+        source = ffmpeg.input(str(job.cover_file), loop=1, framerate=fps)
+        if plan is not None:
+            # Fade once, before the split
+            source = apply_fades(source, plan.video_fades)
+        source = source.split()
+        video_streams = [
+            self._rendition_stream(source[index], rendition)
+            for index, rendition in enumerate(job.renditions)
+        ]
+        audio_stream = self._audio_stream(job, audio_list, plan)
+        
+        output_args = self._encoder_args(fps)
+        for index, rendition in enumerate(job.renditions):
+            bitrate = rendition.video_bitrate or self.config.effective_video_bitrate
+            output_args.update(self._rate_args(bitrate, f'v:{index}'))
+        output_args.update(self._audio_args(copy_audio))
+        # The tee muxer needs codec headers out of band (MP4 avcC/esds)
+        output_args['flags'] = '+global_header'
+        if self._threads(job) > 0:
+            output_args['threads'] = self._threads(job)
+        if limit_seconds:
+            output_args['t'] = limit_seconds
+        
+        muxer = MUXERS.get(self.config.video_format, self.config.video_format)
+        targets = "|".join(
+            f"[f={muxer}:select=\\'v:{index},a\\']{_tee_escape(output_file)}"
+            for index, output_file in enumerate(output_files)
+        )
+        
+        out = ffmpeg.output(*video_streams, audio_stream, targets, f='tee', **output_args)
+        return out.global_args('-shortest').overwrite_output()
+    
+    def _visualizer_feed(
+        self,
+        job: ConversionJob,
+        audio_list: Optional[Path] = None,
+        plan: Optional[TransitionPlan] = None,
+    ):
+        """
+        Stdin feed for run_with_progress rendering spectrum bars over the cover.
+        
+        The beats are decoded to PCM by a second ffmpeg process; the encoder
+        reads the audio it muxes on its own.
+        """
+        preprocessor = CoverPreprocessor(self.paths.temp / 'covers')
+        background = visualizer.load_background(
+            preprocessor.prepare(job.cover_file, self.config.resolution)
+        )
+        fps = self.config.effective_fps
+        decoder = ffmpeg.output(
+            self._audio_stream(job, audio_list, plan),
+            'pipe:',
+            f='f32le',
+            ac=1,
+            ar=visualizer.SAMPLE_RATE,
+        ).global_args('-hide_banner', '-loglevel', 'error')
+        
+        def feed(stdin):
+            process = decoder.run_async(pipe_stdout=True)
+            try:
+                with self.cancel_token.track(process):
+                    visualizer.render_stream(process.stdout, background, fps, stdin)
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+            if process.wait() != 0:
+                raise RuntimeError("No se pudo decodificar el audio para el visualizador")
+        
+        return feed
+    
+    def _uses_visualizer(self, job: ConversionJob) -> bool:
+        """True if the job's video is rendered by the visualizer."""
+        return (self.config.video_source == 'visualizer'
+                and not job.renditions
+                and visualizer.is_available())
+    
+    def _source_cover(self, cover: Path) -> Path:
+        """Cover to feed ffmpeg: preprocessed to the target size if enabled."""
+        if not self.config.preprocess_covers:
+            return cover
+        preprocessor = CoverPreprocessor(self.paths.temp / 'covers')
+        return preprocessor.prepare(cover, self.config.resolution)
+    
+    def _render_loop_segment(self, cover: Path, target: Path, seconds: float = SEGMENT_SECONDS,
+                             fade: Optional[str] = None, threads: int = 0) -> None:
+        """
+        Encode a looped cover, video only.
+        
+        Args:
+            cover: Cover image
+            target: Where to write the clip
+            seconds: Clip length
+            fade: 'in' or 'out' to fade from or to black over the whole clip
+            threads: ffmpeg -threads (0 = the config's share)
+        """
+        cover = self._source_cover(cover)
+        fps = self.config.effective_fps
+        output_args = self._video_args(fps)
+        threads = threads or self.config.threads
+        if threads > 0:
+            output_args['threads'] = threads
+        
+        video = ffmpeg.input(str(cover), loop=1, framerate=fps)
+        if fade:
+            video = video.filter('fade', t=fade, st=0, d=seconds)
+        out = ffmpeg.output(
+            video,
+            str(target),
+            t=seconds,
+            f=MUXERS.get(self.config.video_format, self.config.video_format),
+            **output_args
+        ).overwrite_output()
+        run_with_progress(out, seconds, cancel=self.cancel_token, policy=self.policy)
+    
+    def _cover_segment(self, cover: Path, job: ConversionJob) -> Path:
+        """Pre-encoded loop segment for a cover, rendered on first use and pinned for ``job``."""
+        cache = FileCache(
+            self.paths.temp / 'cover_loops',
+            self.config.video_format,
+            max_bytes=SEGMENT_CACHE_MAX_BYTES,
+        )
+        key = segment_key(cover, self.config)
+        return cache.get_or_create(
+            key,
+            lambda target: self._render_loop_segment(cover, target, threads=self._threads(job)),
+            owner=job.id,
+        )
+    
+    def _fade_clip(self, cover: Path, kind: str, frames: int, job: ConversionJob) -> Path:
+        """Pre-encoded fade in or out of a cover, rendered on first use and pinned for ``job``."""
+        cache = FileCache(
+            self.paths.temp / 'cover_loops',
+            self.config.video_format,
+            max_bytes=SEGMENT_CACHE_MAX_BYTES,
+        )
+        key = fade_clip_key(cover, self.config, kind, frames)
+        seconds = frames / self.config.effective_fps
+        return cache.get_or_create(
+            key,
+            lambda target: self._render_loop_segment(cover, target, seconds, fade=kind,
+                                                     threads=self._threads(job)),
+            owner=job.id,
+        )
+    
+    def _write_faded_loop(self, cover: Path, segment: Path, plan: TransitionPlan,
+                          list_file: Path, job: ConversionJob) -> None:
+        """
+        Concat list of the looped cover with the plan's video fades.
+        
+        Only the fade windows are encoded (as cached clips); the rest of the
+        video is stream-copied from the loop segment.
+        """
+        fps = self.config.effective_fps
+        entries = []
+        for kind, seconds in video_timeline(plan):
+            if kind == 'loop':
+                entries.extend(loop_entries(segment, seconds, fps))
+            else:
+                entries.append((self._fade_clip(cover, kind, round(seconds * fps), job), None))
+        write_concat_entries(entries, list_file)
+    
+    def _chunked(self, job: ConversionJob, plan: TransitionPlan) -> bool:
+        """True if the job's video is long enough to encode in parallel chunks."""
+        return (self.config.chunk_min_minutes > 0
+                and plan.duration is not None
+                and plan.duration >= self.config.chunk_min_minutes * 60
+                and not job.renditions)
+    
+    def _render_chunk(self, job: ConversionJob, chunk: Chunk, plan: TransitionPlan,
+                      target: Path, threads: int, on_progress=None) -> None:
+        """Encode one chunk of a job's looped cover, video only, with its fades."""
+        cover = self._source_cover(job.cover_file)
+        fps = self.config.effective_fps
+        output_args = self._video_args(fps)
+        # Keep the keyframe cadence of an unchunked encode across the joins
+        output_args['g'] = gop_frames(self.config)
+        output_args['threads'] = threads
+        
+        video = ffmpeg.input(str(cover), loop=1, framerate=fps)
+        video = apply_fades(video, chunk_fades(plan.video_fades, chunk))
+        out = ffmpeg.output(
+            video,
+            str(target),
+            t=chunk.duration,
+            f=MUXERS.get(self.config.video_format, self.config.video_format),
+            **output_args
+        ).overwrite_output()
+        self._run_supervised(out, chunk.duration, job, on_progress)
+    
+    def _encode_chunks(self, job: ConversionJob, plan: TransitionPlan, directory: Path,
+                       list_file: Path, report) -> None:
+        """
+        Encode a job's video in parallel chunks and list them for the concat demuxer.
+        
+        The job's share of the threads is split between the chunk encodes.
+        After a chunk fails, chunks that have not started yet are skipped.
+        """
+        fps = self.config.effective_fps
+        chunks = plan_chunks(plan.duration, self.config.chunk_minutes * 60, fps,
+                             gop_frames(self.config), plan.video_fades)
+        workers, threads = chunk_workers(self._threads(job) or os.cpu_count() or 1, len(chunks))
+        print(f"🧩 {job.output_file.name}: {len(chunks)} tramos, {workers} en paralelo")
+        
+        encoded = [0.0] * len(chunks)
+        lock = threading.Lock()
+        failed = threading.Event()
+        
+        def progress(chunk: Chunk, percent: float):
+            with lock:
+                encoded[chunk.index] = chunk.duration * percent / 100
+                done = sum(encoded)
+            report(done / plan.duration * CHUNKS_SHARE)
+        
+        def encode(chunk: Chunk) -> Optional[Path]:
+            if failed.is_set():
+                return None
+            target = directory / f"{chunk.index:04d}.{self.config.video_format}"
+            try:
+                self._render_chunk(job, chunk, plan, target, threads,
+                                   lambda percent: progress(chunk, percent))
+            except BaseException:
+                failed.set()
+                raise
+            progress(chunk, 100.0)
+            return target
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ffmpeg-chunk') as executor:
+            futures = [executor.submit(encode, chunk) for chunk in chunks]
+        # Raises the error of the first chunk that failed
+        write_concat_files([future.result() for future in futures], list_file)
+    
+    def _run_supervised(self, out, duration: Optional[float], job: ConversionJob,
+                        on_progress=None, feed=None) -> None:
+        """Run an encode of ``job``, restarting it when it hangs (policy.retries times)."""
+        for attempt in range(self.policy.retries + 1):
+            try:
+                run_with_progress(out, duration, on_progress, feed=feed,
+                                  cancel=self.cancel_token, policy=self.policy)
+                return
+            except ProcessHung as e:
+                if attempt == self.policy.retries:
+                    raise
+                print(f"⚠️ FFmpeg bloqueado en {job.output_file.name} ({e}); reintentando")
+    
+    def convert(self, job: ConversionJob) -> bool:
+        """
+        Convert beats + cover to video.
+        Supports BPV (Beats Per Video) via concatenation.
+        """
+        loop_list = None
+        audio_list = None
+        chunk_dir = None
+        partials = [partial_path(output_file) for output_file in job.output_files]
+        try:
+            job.output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Output
-            out = ffmpeg.output(
-                video_stream,
-                audio_stream,
-                str(job.output_file),
-                vcodec='libx264',
-                acodec=self.config.audio_format,
-                video_bitrate=self.config.video_bitrate,
-                audio_bitrate=self.config.audio_bitrate,
-                s=f'{width}x{height}',
-                pix_fmt='yuv420p',
-                shortest=None # We use -shortest argument in .global_args usually vs kwargs
-            )
+            # Fades and crossfades of the whole job, compiled once; the
+            # output length drives the progress percentage
+            plan = plan_transitions(self.config, self.probe_durations(job.beat_files),
+                                    len(job.beat_files))
+            total_duration = plan.duration
             
-            # Add global args
-            out = out.global_args('-shortest') # Cut when shorter stream (audio) ends
-            out = out.overwrite_output()
+            # Reuse the cover's pre-encoded segment when we know how many
+            # copies are needed; otherwise encode the cover directly.
+            # Renditions all come from a single decode of the cover instead.
+            visualize = self._uses_visualizer(job)
+            if (self.config.reuse_cover_segments and total_duration
+                    and not job.renditions and not visualize):
+                segment = self._cover_segment(job.cover_file, job)
+                loop_list = self._temp_list(segment.parent)
+                if plan.video_fades:
+                    self._write_faded_loop(job.cover_file, segment, plan, loop_list, job)
+                else:
+                    write_concat_list(segment, total_duration, loop_list)
             
-            # Run
-            process = ffmpeg.run_async(out, pipe_stdout=True, pipe_stderr=True)
-            stdout, stderr = process.communicate()
+            # Join matching beats with the concat demuxer instead of decoding
+            # each one through the concat filter (crossfades and loudness
+            # normalization need each beat on its own)
+            copy_audio = False
+            if (len(job.beat_files) > 1 and not plan.crossfade
+                    and self.config.loudness_target is None):
+                codec = self._audio_concat_codec(job.beat_files)
+                if codec:
+                    audio_list = self._temp_list(self.paths.temp)
+                    write_concat_files(job.beat_files, audio_list)
+                    copy_audio = (codec == self.config.audio_format
+                                  and not plan.filters_audio and not self.config.volume_db)
             
-            if process.returncode != 0:
-                raise ffmpeg.Error('ffmpeg', stdout, stderr)
+            # Run, streaming progress instead of buffering ffmpeg's output
+            def report(percent: float):
+                job.progress = percent
+                if self.on_progress:
+                    self.on_progress(job.id, percent)
+            
+            # A long video that must be encoded is split into chunks encoded
+            # in parallel; the final run stream-copies them like a loop list
+            # and encodes the audio once
+            chunked = loop_list is None and not visualize and self._chunked(job, plan)
+            if chunked:
+                loop_list = self._temp_list(self.paths.temp)
+                chunk_dir = Path(tempfile.mkdtemp(prefix='chunks-', dir=self.paths.temp))
+                self._encode_chunks(job, plan, chunk_dir, loop_list, report)
+            
+            def final_report(percent: float):
+                if chunked:
+                    percent = CHUNKS_SHARE + percent * (100 - CHUNKS_SHARE) / 100
+                report(percent)
+            
+            # -shortest cannot trim stream-copied video and overshoots at low
+            # frame rates (encoder lookahead), so cap the length explicitly
+            feed = None
+            if job.renditions:
+                out = self._build_renditions_output(
+                    job,
+                    partials,
+                    limit_seconds=total_duration,
+                    audio_list=audio_list,
+                    copy_audio=copy_audio,
+                    plan=plan,
+                )
+            else:
+                out = self._build_output(
+                    job,
+                    partials[0],
+                    limit_seconds=total_duration,
+                    loop_list=loop_list,
+                    audio_list=audio_list,
+                    copy_audio=copy_audio,
+                    raw_video=visualize,
+                    plan=plan,
+                )
+                if visualize:
+                    feed = self._visualizer_feed(job, audio_list, plan)
+            
+            self._run_supervised(out, total_duration, job, final_report, feed=feed)
+            for partial, output_file in zip(partials, job.output_files):
+                os.replace(partial, output_file)
             
             if self.on_progress:
                 self.on_progress(job.id, 100.0)
@@ -85,6 +734,14 @@ class VideoConverter:
             job.progress = 100.0
             return True
             
+        except Cancelled:
+            job.status = "cancelled"
+            job.error_message = "Cancelado por el usuario"
+            return False
+        except ProcessHung as e:
+            job.status = "failed"
+            job.error_message = f"FFmpeg bloqueado: {e}"
+            return False
         except ffmpeg.Error as e:
             job.status = "failed"
             error_msg = e.stderr.decode() if e.stderr else str(e)
@@ -94,5 +751,114 @@ class VideoConverter:
             job.status = "failed"
             job.error_message = str(e)
             return False
+        finally:
+            # The job's cached clips may be evicted again
+            FileCache.release(job.id)
+            for leftover in (loop_list, audio_list, *partials):
+                if leftover is not None and leftover.exists():
+                    leftover.unlink()
+            if chunk_dir is not None:
+                shutil.rmtree(chunk_dir, ignore_errors=True)
+    
+    def _temp_list(self, directory: Path) -> Path:
+        """Create an empty temporary concat list file in ``directory``."""
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(suffix='.txt', dir=directory)
+        os.close(fd)
+        return Path(name)
+    
+    def trial_encode(
+        self,
+        beat: Path,
+        cover: Path,
+        seconds: float = 15.0,
+        cancel: Optional[CancellationToken] = None,
+    ) -> Dict[str, float]:
+        """
+        Encode a short sample with the current settings and measure it.
+        
+        Args:
+            beat: Beat to use as audio
+            cover: Cover image
+            seconds: Length of the sample
+            cancel: Token that kills the sample encode when cancelled
+        
+        Returns:
+            Dict with 'elapsed' (wall seconds), 'bytes' (output size) and
+            'speed' (encoded seconds per wall second; a beat shorter than
+            ``seconds`` only yields its own length)
+        
+        Raises:
+            ffmpeg.Error: If the sample cannot be encoded
+            Cancelled: If ``cancel`` was cancelled
+        """
+        job = ConversionJob(id="trial", beat_files=[beat], cover_file=cover, output_file=Path())
+        beat_duration = self.probe_duration([beat])
+        encoded = min(seconds, beat_duration) if beat_duration else seconds
+        
+        with tempfile.TemporaryDirectory(dir=self.paths.temp) as tmp:
+            output_file = Path(tmp) / f"trial.{self.config.video_format}"
+            out = self._build_output(job, output_file, limit_seconds=seconds)
+            
+            start = time.perf_counter()
+            run_with_progress(out, encoded, cancel=cancel, policy=self.policy)
+            elapsed = time.perf_counter() - start
+            
+            return {
+                'elapsed': elapsed,
+                'bytes': output_file.stat().st_size,
+                'speed': encoded / elapsed if elapsed > 0 else 0.0,
+            }
+    
+    def cleanup(self, job: ConversionJob, delete_cover: bool = True) -> None:
+        """
+        Delete source files of a completed job if configured.
+        
+        Args:
+            job: Conversion job
+            delete_cover: False while other jobs still use the same cover
+        """
+        if job.status != "completed":
+            return
+        
+        if self.config.auto_delete_beats:
+            for beat in job.beat_files:
+                if beat.exists():
+                    beat.unlink()
+        
+        if self.config.auto_delete_covers and delete_cover and job.cover_file.exists():
+            job.cover_file.unlink()
+
+def compare_profiles(
+    config: ConversionConfig,
+    beat: Path,
+    cover: Path,
+    profiles: List[str],
+    seconds: float = 15.0,
+    cancel: Optional[CancellationToken] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run the same trial encode with several encode profiles.
+    
+    Args:
+        config: Base conversion configuration
+        beat: Beat to use as audio
+        cover: Cover image
+        profiles: Keys of ENCODE_PROFILES to compare
+        seconds: Length of each sample
+        cancel: Token that stops the comparison, killing the sample in progress
+    
+    Returns:
+        Mapping of profile key to trial_encode() measurements
+    
+    Raises:
+        Cancelled: If ``cancel`` was cancelled
+    """
+    results = {}
+    for name in profiles:
+        converter = VideoConverter(replace(config, encode_profile=name))
+        results[name] = converter.trial_encode(beat, cover, seconds, cancel=cancel)
+    return results
+
 
-__all__ = ['VideoConverter']
+__all__ = ['PARTIAL_SUFFIX', 'VideoConverter', 'compare_profiles', 'partial_path']
@@ -0,0 +1,92 @@
+"""Cover preprocessing: normalize each cover once with Pillow.
+
+Covers are often huge phone photos or PNGs with transparency. Letting ffmpeg
+decode and scale them for every frame is wasted work, so each cover is
+oriented, flattened and letterboxed to the target resolution once, and the
+result is cached by content hash and size.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+from ecb_tool.features.conversion.cache import FileCache, file_digest
+
+
+# Disk budget for preprocessed covers; least recently used ones are evicted
+COVER_CACHE_MAX_BYTES = 256 * 1024 ** 2
+
+# Background used for letterbox bars and transparent areas
+BACKGROUND_COLOR = (0, 0, 0)
+
+JPEG_QUALITY = 95
+
+
+def parse_resolution(resolution: str) -> Tuple[int, int]:
+    """Parse ``WIDTHxHEIGHT`` into even dimensions (required by yuv420p)."""
+    width, height = map(int, resolution.lower().split('x'))
+    return width - width % 2, height - height % 2
+
+
+def cover_key(cover: Path, size: Tuple[int, int]) -> str:
+    """Cache key for a cover prepared at a given size."""
+    params = f"{file_digest(cover)}|{size[0]}x{size[1]}|{BACKGROUND_COLOR}|{JPEG_QUALITY}"
+    return hashlib.sha256(params.encode('utf-8')).hexdigest()[:32]
+
+
+def prepare_image(source: Path, target: Path, size: Tuple[int, int]) -> None:
+    """
+    Write ``source`` letterboxed to ``size`` as an RGB JPEG.
+
+    Args:
+        source: Original cover
+        target: Output file
+        size: (width, height) of the video
+    """
+    with Image.open(source) as img:
+        # Phone photos are often stored sideways with an EXIF rotation
+        img = ImageOps.exif_transpose(img)
+
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, BACKGROUND_COLOR)
+            background.paste(img, mask=img.getchannel('A'))
+            img = background
+        else:
+            img = img.convert('RGB')
+
+        img = ImageOps.pad(img, size, method=Image.Resampling.LANCZOS, color=BACKGROUND_COLOR)
+        img.save(target, format='JPEG', quality=JPEG_QUALITY)
+
+
+class CoverPreprocessor:
+    """Caches covers normalized to the video resolution."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = COVER_CACHE_MAX_BYTES):
+        self.cache = FileCache(cache_dir, 'jpg', max_bytes=max_bytes)
+
+    def prepare(self, cover: Path, resolution: str) -> Path:
+        """
+        Return a cover ready to be looped at ``resolution``.
+
+        Args:
+            cover: Original cover image
+            resolution: Target resolution as ``WIDTHxHEIGHT``
+
+        Returns:
+            Path of the cached, preprocessed image
+        """
+        size = parse_resolution(resolution)
+        key = cover_key(cover, size)
+        return self.cache.get_or_create(key, lambda target: prepare_image(cover, target, size))
+
+
+__all__ = [
+    'COVER_CACHE_MAX_BYTES',
+    'CoverPreprocessor',
+    'cover_key',
+    'parse_resolution',
+    'prepare_image',
+]
@@ -0,0 +1,113 @@
+"""Disk-space admission control for the conversion pool.
+
+ffmpeg that runs out of disk fails halfway through a video, after most of
+the encode time has been spent. Instead, every job's output size is
+estimated up front (duration times the measured or nominal bytes per
+second, see planner) and a job only starts while the free space, minus what
+the jobs already running still have to write, stays above a reserve. When
+it does not, the pool waits for running jobs to finish or for space to be
+freed (an upload deleting its video, the user emptying the trash) and
+carries on from there.
+
+Jobs write to '.part' files that already take their space, so only the part
+of each estimate that has not been written yet is still owed.
+"""
+
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from ecb_tool.features.conversion.converter import partial_path
+from ecb_tool.features.conversion.models import ConversionJob
+
+
+GB = 1024 ** 3
+
+# Space always left free on the videos' disk (the README's minimum)
+DEFAULT_RESERVE_BYTES = 2 * GB
+
+# Seconds between free-space checks while the pool waits
+POLL_SECONDS = 5.0
+
+
+def free_bytes(directory: Path) -> int:
+    """Free space on the disk holding ``directory`` (which may not exist yet)."""
+    directory = Path(directory).absolute()
+    while not directory.exists() and directory.parent != directory:
+        directory = directory.parent
+    return shutil.disk_usage(directory).free
+
+
+def written_bytes(job: ConversionJob) -> int:
+    """Bytes a running job has already written to its '.part' files."""
+    total = 0
+    for output_file in job.output_files:
+        try:
+            total += partial_path(output_file).stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+class DiskGovernor:
+    """Admits conversion jobs only while their output fits on the disk.
+
+    Thread-safe: the pool admits and releases jobs from its own thread while
+    the workers write the files.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        estimate: Callable[[ConversionJob], float],
+        reserve_bytes: float = DEFAULT_RESERVE_BYTES,
+        free_space: Callable[[Path], int] = free_bytes,
+    ):
+        """
+        Args:
+            directory: Where the videos are written
+            estimate: Expected output bytes of a job
+            reserve_bytes: Space that must stay free
+            free_space: Free-space probe (injectable for tests)
+        """
+        self.directory = Path(directory)
+        self.estimate = estimate
+        self.reserve_bytes = max(0.0, float(reserve_bytes))
+        self.free_space = free_space
+        self._lock = threading.Lock()
+        self._running: Dict[str, Tuple[ConversionJob, float]] = {}
+
+    def owed_bytes(self) -> float:
+        """Space running jobs will still take before they finish."""
+        with self._lock:
+            running = list(self._running.values())
+        return sum(max(0.0, expected - written_bytes(job)) for job, expected in running)
+
+    def shortfall(self, job: ConversionJob) -> float:
+        """Bytes missing for ``job`` to start (0 if it fits)."""
+        available = self.free_space(self.directory) - self.owed_bytes() - self.reserve_bytes
+        return max(0.0, self.estimate(job) - available)
+
+    def admit(self, job: ConversionJob) -> bool:
+        """Claim the space of ``job`` if it fits; False means wait."""
+        if self.shortfall(job) > 0:
+            return False
+        with self._lock:
+            self._running[job.id] = (job, self.estimate(job))
+        return True
+
+    def release(self, job: ConversionJob) -> None:
+        """Drop the claim of a finished (or failed) job."""
+        with self._lock:
+            self._running.pop(job.id, None)
+
+
+__all__ = [
+    'DEFAULT_RESERVE_BYTES',
+    'DiskGovernor',
+    'GB',
+    'POLL_SECONDS',
+    'free_bytes',
+    'written_bytes',
+]
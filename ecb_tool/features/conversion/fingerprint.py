@@ -0,0 +1,109 @@
+"""Build fingerprints: skip conversions whose output is already up to date.
+
+A video's fingerprint hashes the content of its beats (in order), its cover
+and every encoding parameter. It is recorded together with the size and
+modification time of the finished file, so a later run can tell that the
+same video would be produced again and keep the existing one.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ecb_tool.features.conversion.cache import file_digest
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+
+
+# Bump when the way videos are built changes without any config change
+FINGERPRINT_VERSION = 1
+
+# Config fields that do not change the encoded video
+NON_OUTPUT_FIELDS = {
+    'beats_dir',
+    'covers_dir',
+    'videos_dir',
+    'batch_size',
+    'adaptive_batch',
+    'min_batch_size',
+    'max_batch_size',
+    'threads',
+    'chunk_min_minutes',
+    'chunk_minutes',
+    'disk_reserve_gb',
+    'process_nice',
+    'io_class',
+    'io_level',
+    'stall_seconds',
+    'hang_retries',
+    'skip_up_to_date',
+    'auto_delete_beats',
+    'auto_delete_covers',
+}
+
+
+def encoding_params(config: ConversionConfig) -> Dict[str, Any]:
+    """Parameters of ``config`` that affect the output video."""
+    params = {
+        key: value for key, value in asdict(config).items()
+        if key not in NON_OUTPUT_FIELDS
+    }
+    # The profile's settings, not just its name, shape the video
+    params['profile'] = asdict(config.profile)
+    return params
+
+
+def job_fingerprint(job: ConversionJob, config: ConversionConfig) -> str:
+    """
+    Fingerprint of the video a job would produce.
+
+    Raises:
+        OSError: If a beat or the cover cannot be read
+    """
+    payload = {
+        'version': FINGERPRINT_VERSION,
+        'beats': [file_digest(beat) for beat in job.beat_files],
+        'cover': file_digest(job.cover_file),
+        'params': encoding_params(config),
+        'renditions': [asdict(rendition) for rendition in job.renditions],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def output_record(output_file: Path, fingerprint: str) -> Dict[str, Any]:
+    """Record stored for a finished video."""
+    stat = output_file.stat()
+    return {
+        'fingerprint': fingerprint,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def is_up_to_date(output_file: Path, fingerprint: str, record: Optional[Dict[str, Any]]) -> bool:
+    """
+    True if ``output_file`` was built with ``fingerprint`` and left untouched.
+
+    Args:
+        output_file: Video the job would write
+        fingerprint: Fingerprint of the job
+        record: Record stored when the video was built, if any
+    """
+    if not record or record.get('fingerprint') != fingerprint:
+        return False
+    try:
+        stat = output_file.stat()
+    except OSError:
+        return False
+    return stat.st_size == record.get('size') and stat.st_mtime_ns == record.get('mtime_ns')
+
+
+__all__ = [
+    'FINGERPRINT_VERSION',
+    'encoding_params',
+    'is_up_to_date',
+    'job_fingerprint',
+    'output_record',
+]
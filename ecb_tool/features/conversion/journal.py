@@ -0,0 +1,146 @@
+"""On-disk journal of a conversion run.
+
+Every job of a run is written to a JSON file together with its inputs and
+the encoding parameters, and its status is updated as the run goes on. The
+file is replaced atomically on each write, so a crash leaves either the old
+or the new journal, never a truncated one. After a crash the runner picks up
+the jobs that did not finish instead of planning a new run, as long as the
+encoding settings are still the ones recorded. A run stopped by the user is
+not resumed: its journal is discarded.
+"""
+
+import json
+import os
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ecb_tool.features.conversion.models import ConversionJob, Rendition
+
+
+# Jobs in these states do not need to run again
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _job_to_dict(job: ConversionJob) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "beat_files": [str(beat) for beat in job.beat_files],
+        "cover_file": str(job.cover_file),
+        "output_file": str(job.output_file),
+        "status": job.status,
+        "error_message": job.error_message,
+        "renditions": [asdict(rendition) for rendition in job.renditions],
+    }
+
+
+def _job_from_dict(data: Dict[str, Any]) -> ConversionJob:
+    return ConversionJob(
+        id=data["id"],
+        beat_files=[Path(beat) for beat in data["beat_files"]],
+        cover_file=Path(data["cover_file"]),
+        output_file=Path(data["output_file"]),
+        status=data.get("status", "pending"),
+        error_message=data.get("error_message"),
+        renditions=[Rendition(**rendition) for rendition in data.get("renditions", [])],
+    )
+
+
+class ConversionJournal:
+    """Persists the jobs of the current conversion run."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {}
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".tmp")
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, self.path)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the journal left by a previous run, if any."""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data.get("jobs"), list) else None
+
+    def unfinished_jobs(self) -> List[ConversionJob]:
+        """
+        Jobs of the previous run that never finished.
+
+        Jobs that were running when the process died are returned as pending.
+        """
+        data = self.load()
+        if not data:
+            return []
+
+        jobs = []
+        for entry in data["jobs"]:
+            if entry.get("status") in FINISHED_STATUSES:
+                continue
+            job = _job_from_dict(entry)
+            job.status = "pending"
+            jobs.append(job)
+        return jobs
+
+    def params(self) -> Optional[Dict[str, Any]]:
+        """Encoding parameters recorded by the previous run, if any."""
+        data = self.load()
+        return data.get("params") if data else None
+
+    def start(self, jobs: List[ConversionJob], params: Dict[str, Any], resumed: bool = False) -> None:
+        """
+        Record the jobs of a new (or resumed) run.
+
+        Args:
+            jobs: Jobs about to run
+            params: Encoding parameters of the run
+            resumed: True if the jobs come from ``unfinished_jobs``
+        """
+        with self._lock:
+            self._data = {
+                "started": datetime.now().isoformat(timespec='seconds'),
+                "resumed": resumed,
+                "params": params,
+                "jobs": [_job_to_dict(job) for job in jobs],
+            }
+            self._write()
+
+    def update(self, job: ConversionJob) -> None:
+        """Store the current status of a job."""
+        with self._lock:
+            for entry in self._data.get("jobs", []):
+                if entry["id"] == job.id:
+                    entry["status"] = job.status
+                    entry["error_message"] = job.error_message
+                    break
+            self._write()
+
+    def finish(self) -> None:
+        """Remove the journal once every job has finished."""
+        with self._lock:
+            jobs = self._data.get("jobs", [])
+            if all(entry["status"] in FINISHED_STATUSES for entry in jobs):
+                self.path.unlink(missing_ok=True)
+                self._data = {}
+
+    def discard(self) -> None:
+        """Remove the journal, whatever the state of its jobs."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._data = {}
+
+
+__all__ = ['ConversionJournal', 'FINISHED_STATUSES']
@@ -0,0 +1,238 @@
+"""Two-pass loudness normalization with cached measurements.
+
+Beats from different producers differ by several LU. ffmpeg's loudnorm
+filter normalizes them to a target loudness (EBU R128), and it is only
+accurate in two passes. The first pass decodes the whole beat to measure
+its integrated loudness, true peak and loudness range. The second applies a
+linear gain computed from those values.
+
+The measurement only depends on the beat's content, so it is stored in a
+SQLite table keyed by the file's SHA-256 and never repeated. A beat reused
+across BPV mixes and renditions is measured once. Every encode after that
+runs only the corrective pass, inside the job's normal filter graph.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import Dict, Optional
+
+import ffmpeg
+
+from ecb_tool.core.paths import get_paths
+from ecb_tool.features.conversion.cache import file_digest
+from ecb_tool.features.conversion.cancellation import CancellationToken
+from ecb_tool.features.conversion.progress import run_with_progress
+from ecb_tool.features.conversion.supervisor import ProcessHung, SupervisorPolicy
+
+
+# Defaults for YouTube, which plays everything back at about -14 LUFS
+TARGET_LUFS = -14.0
+TARGET_TRUE_PEAK = -1.0
+TARGET_LRA = 11.0
+
+
+@dataclass
+class LoudnessMeasurement:
+    """First-pass loudnorm values of one beat."""
+
+    input_i: float  # Integrated loudness (LUFS)
+    input_tp: float  # True peak (dBTP)
+    input_lra: float  # Loudness range (LU)
+    input_thresh: float  # Gating threshold (LUFS)
+
+    @property
+    def silent(self) -> bool:
+        """True if the beat has no measurable loudness (nothing to normalize)."""
+        return not all(math.isfinite(value) for value in astuple(self))
+
+
+_COLUMNS = [f.name for f in fields(LoudnessMeasurement)]
+
+
+def parse_loudnorm_output(stderr: str) -> LoudnessMeasurement:
+    """
+    Read the JSON block loudnorm prints at the end of a measuring run.
+
+    Raises:
+        ValueError: If the output has no loudnorm report
+    """
+    start = stderr.rfind('{')
+    end = stderr.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("loudnorm did not report any measurement")
+    report = json.loads(stderr[start:end + 1])
+    return LoudnessMeasurement(**{name: float(report[name]) for name in _COLUMNS})
+
+
+def loudnorm_args(
+    measurement: Optional[LoudnessMeasurement],
+    target: float = TARGET_LUFS,
+    true_peak: float = TARGET_TRUE_PEAK,
+    lra: float = TARGET_LRA,
+) -> Dict[str, object]:
+    """
+    Options of the loudnorm filter for one beat.
+
+    With a measurement this is the corrective second pass (linear gain where
+    the true peak allows it). Without one, loudnorm falls back to its
+    single-pass dynamic mode.
+    """
+    args = {'I': target, 'TP': true_peak, 'LRA': lra}
+    if measurement is not None:
+        args.update(
+            measured_I=measurement.input_i,
+            measured_TP=measurement.input_tp,
+            measured_LRA=measurement.input_lra,
+            measured_thresh=measurement.input_thresh,
+            linear='true',
+        )
+    return args
+
+
+def measure_loudness(
+    path: Path,
+    cancel: Optional[CancellationToken] = None,
+    policy: Optional[SupervisorPolicy] = None,
+) -> LoudnessMeasurement:
+    """
+    Run the measuring pass of loudnorm over a whole file.
+
+    The input values it reports do not depend on the target, so one
+    measurement serves every target.
+
+    Args:
+        path: Audio file to measure
+        cancel: Token of the job; STOP kills the pass and PAUSE suspends it
+        policy: Priority and hang limits of the pass (None = the defaults)
+
+    Raises:
+        ffmpeg.Error: If the file cannot be decoded
+        ProcessHung: If ffmpeg stopped making progress
+        Cancelled: If ``cancel`` was cancelled
+        ValueError: If loudnorm reported nothing
+    """
+    out = (
+        ffmpeg.input(str(path))['a']
+        .filter('loudnorm', I=TARGET_LUFS, TP=TARGET_TRUE_PEAK, LRA=TARGET_LRA, print_format='json')
+        .output('-', f='null')
+    )
+    # Niced and watched like the encodes; the report is at the end of stderr
+    stderr = run_with_progress(out, cancel=cancel, policy=policy or SupervisorPolicy())
+    return parse_loudnorm_output(stderr.decode('utf-8', errors='replace'))
+
+
+class LoudnessIndex:
+    """SQLite-backed cache of loudness measurements, keyed by content hash."""
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS loudness ("
+            "digest TEXT PRIMARY KEY, input_i REAL, input_tp REAL, "
+            "input_lra REAL, input_thresh REAL)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def _lock_for(cls, digest: str) -> threading.Lock:
+        with cls._locks_guard:
+            return cls._locks.setdefault(digest, threading.Lock())
+
+    def lookup(self, digest: str) -> Optional[LoudnessMeasurement]:
+        """Stored measurement for a content hash, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM loudness WHERE digest = ?", (digest,)
+            ).fetchone()
+        return LoudnessMeasurement(*row) if row else None
+
+    def store(self, digest: str, measurement: LoudnessMeasurement) -> None:
+        """Remember the measurement of a content hash."""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO loudness (digest, {', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(_COLUMNS) + 1))})",
+                (digest, *astuple(measurement)),
+            )
+            self._conn.commit()
+
+    def get(
+        self,
+        path: Path,
+        cancel: Optional[CancellationToken] = None,
+        policy: Optional[SupervisorPolicy] = None,
+    ) -> Optional[LoudnessMeasurement]:
+        """
+        Measurement of a beat, running the measuring pass only on first use.
+
+        Parallel callers asking for the same beat wait for a single pass.
+
+        Args:
+            path: Beat to measure
+            cancel: Token of the job the measuring pass runs for
+            policy: Supervision of the measuring pass, as for the job's encodes
+
+        Returns:
+            The measurement, or None if the beat cannot be read or measured
+            (the encode then uses single-pass loudnorm)
+
+        Raises:
+            Cancelled: If ``cancel`` was cancelled during the measuring pass
+        """
+        try:
+            digest = file_digest(path)
+        except OSError:
+            return None
+
+        cached = self.lookup(digest)
+        if cached is not None:
+            return cached
+
+        with self._lock_for(digest):
+            cached = self.lookup(digest)
+            if cached is not None:
+                return cached
+            try:
+                measurement = measure_loudness(path, cancel=cancel, policy=policy)
+            except (ffmpeg.Error, ProcessHung, ValueError, OSError):
+                return None
+            self.store(digest, measurement)
+            return measurement
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global instance - lazy loaded
+_loudness_index: Optional[LoudnessIndex] = None
+
+
+def get_loudness_index() -> LoudnessIndex:
+    """Get global LoudnessIndex instance (singleton pattern)."""
+    global _loudness_index
+    if _loudness_index is None:
+        _loudness_index = LoudnessIndex(get_paths().loudness_index)
+    return _loudness_index
+
+
+__all__ = [
+    'LoudnessIndex',
+    'LoudnessMeasurement',
+    'TARGET_LUFS',
+    'get_loudness_index',
+    'loudnorm_args',
+    'measure_loudness',
+    'parse_loudnorm_output',
+]
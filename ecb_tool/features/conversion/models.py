@@ -5,6 +5,75 @@ from pathlib import Path
 from typing import Optional, List
 
 
+@dataclass(frozen=True)
+class EncodeProfile:
+    """Video encoder settings tuned for a kind of source material."""
+    
+    name: str
+    label: str
+    fps: Optional[int] = None  # None = use ConversionConfig.fps
+    video_bitrate: Optional[str] = None  # None = use ConversionConfig.video_bitrate
+    tune: Optional[str] = None  # libx264 -tune
+    keyframe_seconds: Optional[float] = None  # None = encoder default GOP
+
+
+ENCODE_PROFILES = {
+    "standard": EncodeProfile(
+        name="standard",
+        label="Estándar (movimiento completo)",
+    ),
+    # A single looped cover barely changes between frames: a very low frame
+    # rate, long GOPs and the still-image tune keep quality at a fraction of
+    # the CPU time and bitrate.
+    "static_cover": EncodeProfile(
+        name="static_cover",
+        label="Portada estática (rápido)",
+        fps=1,
+        video_bitrate="300k",
+        tune="stillimage",
+        keyframe_seconds=10,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """One of several videos produced from the same job in a single ffmpeg run."""
+    
+    name: str
+    resolution: str  # WIDTHxHEIGHT
+    suffix: str = ""  # Appended to the job's output name; "" = the output itself
+    fit: str = "pad"  # "pad" letterboxes the cover, "crop" fills the frame
+    video_bitrate: Optional[str] = None  # None = use ConversionConfig's
+    
+    def output_path(self, output_file: Path) -> Path:
+        """Where this rendition of ``output_file`` is written."""
+        return output_file.with_name(f"{output_file.stem}{self.suffix}{output_file.suffix}")
+
+
+RENDITIONS = {
+    "16:9": Rendition(name="16:9", resolution="1920x1080"),
+    # Vertical Short: a letterboxed landscape cover would be mostly bars
+    "shorts": Rendition(name="shorts", resolution="1080x1920", suffix="_short", fit="crop",
+                        video_bitrate="1500k"),
+    "720p": Rendition(name="720p", resolution="1280x720", suffix="_720p", video_bitrate="1M"),
+}
+
+
+# libx264 presets, fastest to slowest
+X264_PRESETS = [
+    "ultrafast", "superfast", "veryfast", "faster", "fast",
+    "medium", "slow", "slower", "veryslow",
+]
+
+# Preset value that means "use the calibration for this machine"
+AUTO_PRESET = "auto"
+
+# Inputs the converter picks up from the beats and covers folders
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.m4a', '.aac'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+
 @dataclass
 class ConversionConfig:
     """Configuration for video conversion."""
@@ -19,23 +88,73 @@ class ConversionConfig:
     fps: int = 30
     video_bitrate: str = "2M"
     video_format: str = "mp4"
+    encode_profile: str = "standard"  # Key of ENCODE_PROFILES
+    preset: str = "medium"  # One of X264_PRESETS, or AUTO_PRESET
+    crf: Optional[int] = None  # Constant quality capped at the bitrate; None = bitrate mode
     
     # Audio settings
     audio_bitrate: str = "192k"
     audio_format: str = "aac"
+    loudness_target: Optional[float] = None  # LUFS each beat is normalized to; None = off
+    volume_db: float = 0.0  # Gain applied to the whole audio after normalization
     
     # Processing
     beats_per_video: int = 1
-    batch_size: int = 1
+    target_min_minutes: float = 0.0  # Duration window for mixes; 0 = use beats_per_video
+    target_max_minutes: float = 0.0
+    batch_size: int = 1  # Parallel jobs ("lotes"); 0 = CPU-aware default
+    adaptive_batch: bool = False  # Let the pool adjust parallel jobs; only with batch_size 0
+    min_batch_size: int = 1  # Hard limits for the adaptive pool
+    max_batch_size: int = 0  # 0 = half the CPUs (never below batch_size)
+    threads: int = 0  # ffmpeg -threads per job; 0 = let ffmpeg decide
+    chunk_min_minutes: float = 0.0  # Encode longer videos in parallel chunks; 0 = never
+    chunk_minutes: float = 5.0  # Length of each chunk
+    reuse_cover_segments: bool = False  # Stream-copy cached cover loops
+    preprocess_covers: bool = False  # Letterbox covers once with Pillow
+    video_source: str = "cover"  # "cover" loops the image, "visualizer" adds spectrum bars
+    skip_up_to_date: bool = False  # Keep outputs whose build fingerprint matches
+    disk_reserve_gb: float = 2.0  # Free space jobs may never eat into
+    process_nice: int = 10  # CPU niceness of ffmpeg children; 0 = normal priority
+    io_class: int = 2  # ionice class of ffmpeg children (1-3); 0 = normal priority
+    io_level: int = 7  # ionice level within the class (0-7)
+    stall_seconds: float = 120.0  # No progress for this long = hung; 0 = never
+    hang_retries: int = 1  # Restarts of a hung job before it fails
     
     # Auto-cleanup
     auto_delete_beats: bool = False
     auto_delete_covers: bool = False
     
-    # Fades
-    fade_in_duration: float = 2.0
-    fade_out_duration: float = 2.0
+    # Fades, in seconds (0 = off); none is applied unless enable_fades
+    fade_in_duration: float = 2.0  # Video, from black
+    fade_out_duration: float = 2.0  # Video, to black
+    fade_transition_duration: float = 0.0  # Video dip to black between BPV beats
+    audio_fade_in_duration: float = 0.0
+    audio_fade_out_duration: float = 0.0
+    audio_crossfade_duration: float = 0.0  # Overlap between BPV beats
     enable_fades: bool = True
+    
+    @property
+    def profile(self) -> EncodeProfile:
+        """Active encode profile (falls back to standard)."""
+        if self.video_source == "visualizer":
+            # Moving bars need full motion, not the still-image settings
+            return ENCODE_PROFILES["standard"]
+        return ENCODE_PROFILES.get(self.encode_profile, ENCODE_PROFILES["standard"])
+    
+    @property
+    def effective_fps(self) -> int:
+        """Frame rate after applying the encode profile."""
+        return self.profile.fps or self.fps
+    
+    @property
+    def effective_video_bitrate(self) -> str:
+        """Video bitrate after applying the encode profile."""
+        return self.profile.video_bitrate or self.video_bitrate
+    
+    @property
+    def packs_by_duration(self) -> bool:
+        """True if beats are grouped to hit a video length instead of a count."""
+        return self.target_min_minutes > 0 and self.target_max_minutes >= self.target_min_minutes
 
 
 @dataclass
@@ -46,9 +165,29 @@ class ConversionJob:
     beat_files: List[Path]  # Changed to list
     cover_file: Path
     output_file: Path
-    status: str = "pending"  # pending, processing, completed, failed
+    status: str = "pending"  # pending, processing, completed, failed, cancelled
     progress: float = 0.0
     error_message: Optional[str] = None
+    renditions: List[Rendition] = field(default_factory=list)  # Empty = output_file only
+    threads: int = 0  # ffmpeg -threads for this job; 0 = the config's share
+    
+    @property
+    def output_files(self) -> List[Path]:
+        """Every video the job writes."""
+        if not self.renditions:
+            return [self.output_file]
+        return [rendition.output_path(self.output_file) for rendition in self.renditions]
 
 
-__all__ = ['ConversionConfig', 'ConversionJob']
+__all__ = [
+    'AUDIO_EXTENSIONS',
+    'AUTO_PRESET',
+    'ConversionConfig',
+    'ConversionJob',
+    'EncodeProfile',
+    'ENCODE_PROFILES',
+    'IMAGE_EXTENSIONS',
+    'RENDITIONS',
+    'Rendition',
+    'X264_PRESETS',
+]
@@ -0,0 +1,146 @@
+"""Grouping of beats into videos.
+
+Both packers consume an iterable lazily and yield one group of beats per
+video, so only the beats actually needed are listed, probed and held in
+memory, even with very large libraries.
+"""
+
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from ecb_tool.core.media_index import MediaIndex
+
+
+# Beats probed together when streaming durations from the media index
+PROBE_CHUNK = 64
+
+# Beats that did not fit the current video and wait for a later one. Bounds
+# the memory of the duration packer and how far ahead it looks.
+MAX_HELD_BEATS = 32
+
+
+def pack_by_count(beats: Iterable[Path], per_video: int) -> Iterator[List[Path]]:
+    """
+    Yield consecutive groups of ``per_video`` beats (the classic BPV mode).
+
+    A trailing group with fewer beats is dropped.
+    """
+    per_video = max(1, per_video)
+    source = iter(beats)
+    while True:
+        group = list(islice(source, per_video))
+        if len(group) < per_video:
+            return
+        yield group
+
+
+def indexed_durations(
+    beats: Iterable[Path],
+    index: MediaIndex,
+    chunk: int = PROBE_CHUNK,
+) -> Iterator[Tuple[Path, Optional[float]]]:
+    """
+    Pair beats with their duration, probing them a chunk at a time in parallel.
+
+    Beats that cannot be probed are paired with None.
+    """
+    source = iter(beats)
+    while True:
+        batch = list(islice(source, chunk))
+        if not batch:
+            return
+        infos = index.probe_many(batch)
+        for beat in batch:
+            info = infos[beat]
+            yield beat, info.duration if info and info.ok else None
+
+
+def pack_by_duration(
+    beats: Iterable[Tuple[Path, Optional[float]]],
+    min_seconds: float,
+    max_seconds: float,
+    on_skip: Optional[Callable[[Path], None]] = None,
+) -> Iterator[List[Path]]:
+    """
+    Yield groups of beats whose total length falls in a duration window.
+
+    Beats are taken in order. One that would push the current video past
+    ``max_seconds`` is held back and offered to the following videos first.
+    A beat longer than the whole window becomes a video on its own. Once
+    the source runs out, held beats keep filling videos while they can;
+    the ones left over that cannot reach ``min_seconds`` are not yielded
+    and are reported through ``on_skip``.
+
+    Args:
+        beats: (beat, duration) pairs, e.g. from ``indexed_durations``
+        min_seconds: Shortest acceptable video
+        max_seconds: Longest acceptable video
+        on_skip: Called for beats left out of this run (unknown duration,
+            held back for longer than MAX_HELD_BEATS other beats, or too
+            few left at the end to fill a video)
+
+    Raises:
+        ValueError: If the window is empty
+    """
+    if min_seconds <= 0 or max_seconds < min_seconds:
+        raise ValueError(f"Invalid duration window: {min_seconds}-{max_seconds}s")
+
+    source = iter(beats)
+    held: deque = deque()
+    exhausted = False
+
+    while True:
+        group: List[Path] = []
+        total = 0.0
+
+        # Beats held back by earlier videos go first, in order
+        for _ in range(len(held)):
+            if total >= min_seconds:
+                break
+            beat, duration = held.popleft()
+            if total + duration <= max_seconds:
+                group.append(beat)
+                total += duration
+            else:
+                held.append((beat, duration))
+
+        while total < min_seconds and not exhausted:
+            item = next(source, None)
+            if item is None:
+                exhausted = True
+                break
+
+            beat, duration = item
+            if not duration:
+                if on_skip:
+                    on_skip(beat)
+            elif duration > max_seconds:
+                # Too long for any mix: publish it alone
+                yield [beat]
+            elif total + duration <= max_seconds:
+                group.append(beat)
+                total += duration
+            else:
+                held.append((beat, duration))
+                if len(held) > MAX_HELD_BEATS:
+                    skipped, _ = held.popleft()
+                    if on_skip:
+                        on_skip(skipped)
+
+        if total < min_seconds:
+            # Out of beats: what is left cannot fill another video
+            if on_skip:
+                for beat in group + [beat for beat, _ in held]:
+                    on_skip(beat)
+            return
+        yield group
+
+
+__all__ = [
+    'MAX_HELD_BEATS',
+    'indexed_durations',
+    'pack_by_count',
+    'pack_by_duration',
+]
@@ -0,0 +1,217 @@
+"""Run planning: predicted wall time, output size and upload time.
+
+Predictions combine the probed beat durations, the configured bitrates and
+throughput measured on past runs. Encode speed is stored per settings (see
+scheduling.speed_key), output bytes per second of video per settings, and
+upload bytes per second for the connection. Every completed job and upload
+feeds its measurement back, so the estimates converge on what this machine
+and connection actually achieve.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from ecb_tool.features.conversion.models import ConversionConfig, Rendition
+from ecb_tool.features.conversion.scheduling import (
+    DEFAULT_SPEED,
+    estimate_seconds,
+    planned_makespan,
+    smooth_speed,
+    speed_key,
+)
+
+
+# Upload throughput assumed before any upload was measured (~20 Mbit/s)
+DEFAULT_UPLOAD_RATE = 2.5 * 1024 ** 2
+
+# Container and muxing overhead over the nominal bitrates
+CONTAINER_OVERHEAD = 1.02
+
+_BITRATE_UNITS = {'k': 1e3, 'm': 1e6, 'g': 1e9}
+
+
+def parse_bitrate(value: str) -> float:
+    """Bits per second of an ffmpeg bitrate such as '2M' or '192k'."""
+    text = str(value).strip().lower()
+    unit = _BITRATE_UNITS.get(text[-1:], None)
+    if unit is None:
+        return float(text)
+    return float(text[:-1]) * unit
+
+
+def size_key(config: ConversionConfig, renditions: Iterable[Rendition] = ()) -> str:
+    """Settings that change the output size per second of video."""
+    mode = "loop" if config.reuse_cover_segments else "encode"
+    names = ",".join(rendition.name for rendition in renditions) or "-"
+    return "|".join(str(value) for value in (
+        config.encode_profile,
+        config.preset,
+        config.crf,
+        config.resolution,
+        config.effective_fps,
+        config.effective_video_bitrate,
+        config.audio_bitrate,
+        config.video_source,
+        mode,
+        names,
+    ))
+
+
+def nominal_bytes_per_second(config: ConversionConfig, renditions: Iterable[Rendition] = ()) -> float:
+    """
+    Output bytes per second of video implied by the configured bitrates.
+
+    In CRF mode the bitrate is only a ceiling, so this is an upper bound until
+    real outputs have been measured.
+    """
+    renditions = list(renditions)
+    video = sum(
+        parse_bitrate(rendition.video_bitrate or config.effective_video_bitrate)
+        for rendition in renditions
+    ) if renditions else parse_bitrate(config.effective_video_bitrate)
+    audio = parse_bitrate(config.audio_bitrate)
+    return (video + audio) / 8 * CONTAINER_OVERHEAD
+
+
+@dataclass
+class RunPlan:
+    """Predicted cost of a conversion run."""
+
+    jobs: int
+    media_seconds: float  # Length of all the videos to produce
+    unknown_durations: int  # Jobs whose beats could not be probed (not counted)
+    wall_seconds: float
+    output_bytes: float
+    upload_seconds: float
+    calibrated: bool  # False: encode speed is the default guess, not a measurement
+
+
+@dataclass
+class UploadPlan:
+    """Predicted cost of uploading the videos waiting in the queue."""
+
+    videos: int
+    total_bytes: int
+    seconds: float
+    calibrated: bool  # False: the upload rate is the default guess
+
+
+def output_rate(config: ConversionConfig, state_manager, renditions: Iterable[Rendition] = ()) -> float:
+    """Output bytes per second of video: measured if possible, else nominal."""
+    renditions = list(renditions)
+    return (state_manager.get_output_rate(size_key(config, renditions))
+            or nominal_bytes_per_second(config, renditions))
+
+
+def upload_rate(state_manager) -> float:
+    """Measured upload throughput in bytes per second (or the default)."""
+    return state_manager.get_upload_rate() or DEFAULT_UPLOAD_RATE
+
+
+def plan_run(
+    config: ConversionConfig,
+    durations: List[Optional[float]],
+    workers: int,
+    state_manager,
+    renditions: Iterable[Rendition] = (),
+) -> RunPlan:
+    """
+    Predict a run before it starts.
+
+    Args:
+        config: Conversion settings
+        durations: Output length of each job (None if unknown)
+        workers: Jobs converted in parallel
+        state_manager: Source of the throughput history
+        renditions: Renditions every job writes
+    """
+    renditions = list(renditions)
+    measured_speed = state_manager.get_encode_speed(speed_key(config, workers))
+    speed = measured_speed or DEFAULT_SPEED
+    # The runner starts the longest jobs first
+    costs = sorted((estimate_seconds(duration, speed) for duration in durations), reverse=True)
+
+    media_seconds = sum(duration for duration in durations if duration)
+    output_bytes = media_seconds * output_rate(config, state_manager, renditions)
+
+    return RunPlan(
+        jobs=len(durations),
+        media_seconds=media_seconds,
+        unknown_durations=sum(1 for duration in durations if not duration),
+        wall_seconds=planned_makespan(costs, workers) if costs else 0.0,
+        output_bytes=output_bytes,
+        upload_seconds=output_bytes / upload_rate(state_manager),
+        calibrated=measured_speed is not None,
+    )
+
+
+def plan_upload(videos: Iterable[Path], state_manager) -> UploadPlan:
+    """Predict how long uploading ``videos`` takes."""
+    sizes = []
+    for video in videos:
+        try:
+            sizes.append(Path(video).stat().st_size)
+        except OSError:
+            continue
+    total = sum(sizes)
+    return UploadPlan(
+        videos=len(sizes),
+        total_bytes=total,
+        seconds=total / upload_rate(state_manager),
+        calibrated=state_manager.get_upload_rate() is not None,
+    )
+
+
+def record_output(
+    state_manager,
+    config: ConversionConfig,
+    media_seconds: Optional[float],
+    output_bytes: int,
+    renditions: Iterable[Rendition] = (),
+) -> None:
+    """Calibrate the output size estimate with a finished job."""
+    if not media_seconds or output_bytes <= 0:
+        return
+    key = size_key(config, renditions)
+    rate = smooth_speed(state_manager.get_output_rate(key), output_bytes / media_seconds)
+    state_manager.set_output_rate(key, rate)
+
+
+def record_upload(state_manager, uploaded_bytes: int, seconds: float) -> None:
+    """Calibrate the upload rate with a finished upload."""
+    if uploaded_bytes <= 0 or seconds <= 0:
+        return
+    rate = smooth_speed(state_manager.get_upload_rate(), uploaded_bytes / seconds)
+    state_manager.set_upload_rate(rate)
+
+
+def format_bytes(size: float) -> str:
+    """Human-readable size (MB below 1 GB, GB above)."""
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:.1f} GB"
+    return f"{size / 1024 ** 2:.0f} MB"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as H:MM:SS."""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+__all__ = [
+    'DEFAULT_UPLOAD_RATE',
+    'RunPlan',
+    'UploadPlan',
+    'format_bytes',
+    'format_duration',
+    'nominal_bytes_per_second',
+    'output_rate',
+    'parse_bitrate',
+    'plan_run',
+    'plan_upload',
+    'record_output',
+    'record_upload',
+    'size_key',
+    'upload_rate',
+]
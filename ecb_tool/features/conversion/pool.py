@@ -0,0 +1,193 @@
+"""Worker pool that runs several conversion jobs at once."""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+
+from ecb_tool.features.conversion.concurrency import ConcurrencyController
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.diskspace import POLL_SECONDS, DiskGovernor
+from ecb_tool.features.conversion.models import ConversionJob
+
+
+# Cores we try to hand to each ffmpeg child when the pool size is automatic.
+# libx264 stops scaling well past a handful of threads for a looped still image,
+# so several narrower encoders beat one wide one.
+THREADS_PER_AUTO_WORKER = 4
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def default_pool_size(cpus: Optional[int] = None) -> int:
+    """CPU-aware number of concurrent ffmpeg jobs."""
+    cpus = cpus or available_cpus()
+    return max(1, cpus // THREADS_PER_AUTO_WORKER)
+
+
+def resolve_pool_size(batch_size: int, cpus: Optional[int] = None) -> int:
+    """
+    Turn the configured ``lotes`` value into a worker count.
+
+    Args:
+        batch_size: Configured parallel jobs (0 or less means automatic)
+        cpus: CPUs available (detected if None)
+
+    Returns:
+        Number of jobs to run at once
+    """
+    if batch_size and batch_size > 0:
+        return int(batch_size)
+    return default_pool_size(cpus)
+
+
+def threads_per_job(pool_size: int, cpus: Optional[int] = None) -> int:
+    """Share of the CPUs each ffmpeg child gets via ``-threads``."""
+    cpus = cpus or available_cpus()
+    return max(1, cpus // max(1, pool_size))
+
+
+class ConversionPool:
+    """Runs conversion jobs concurrently on a fixed number of worker threads.
+
+    Each worker only waits on its ffmpeg child, so threads are enough; the
+    encoding itself happens in the subprocesses. Jobs are handed out lazily,
+    which means a stop request prevents any further job from starting.
+    With a governor, a job whose output does not fit on the disk is held
+    back (and the pool pauses) until space is available again. While
+    ``should_pause`` is true no job starts either. With a concurrency
+    controller, the number of jobs in flight follows its limit (up to its
+    maximum) instead of ``workers``. Each job then starts with the share of
+    the CPUs the current limit gives it, and only once that share is free,
+    so a grown pool does not oversubscribe the cores.
+    Callbacks run on the thread that called ``run``.
+    """
+
+    def __init__(
+        self,
+        converter: VideoConverter,
+        workers: int,
+        should_stop: Optional[Callable[[], bool]] = None,
+        governor: Optional[DiskGovernor] = None,
+        poll_seconds: float = POLL_SECONDS,
+        should_pause: Optional[Callable[[], bool]] = None,
+        concurrency: Optional[ConcurrencyController] = None,
+    ):
+        self.converter = converter
+        self.workers = max(1, int(workers))
+        self.should_stop = should_stop or (lambda: False)
+        self.should_pause = should_pause or (lambda: False)
+        self.concurrency = concurrency
+        self.governor = governor
+        self.poll_seconds = poll_seconds
+
+    def _limit(self) -> int:
+        """Jobs allowed in flight right now."""
+        if self.concurrency is not None:
+            return self.concurrency.limit()
+        return self.workers
+
+    def _fits(self, in_flight: dict, share: int) -> bool:
+        """True if a job with ``share`` threads fits next to the running ones."""
+        used = sum(job.threads for job in in_flight.values())
+        # Past one thread per CPU, the limit itself is the bound
+        return used + share <= max(available_cpus(), self._limit())
+
+    def run(
+        self,
+        jobs: Iterable[ConversionJob],
+        on_start: Optional[Callable[[ConversionJob], None]] = None,
+        on_done: Optional[Callable[[ConversionJob, bool], None]] = None,
+        on_wait: Optional[Callable[[ConversionJob, float], None]] = None,
+    ) -> bool:
+        """
+        Run jobs until all are done or a stop is requested.
+
+        Args:
+            jobs: Jobs to convert, in the order they should start
+            on_start: Called when a job is handed to a worker
+            on_done: Called with (job, success) when a job finishes
+            on_wait: Called with (job, missing bytes) when the pool pauses
+                because the next job does not fit on the disk
+
+        Returns:
+            True if every job was started, False if stopped early
+        """
+        pending = iter(jobs)
+        in_flight = {}
+        held = None  # Next job, waiting for disk space
+        paused = False
+        exhausted = False
+        stopped = False
+
+        threads = self.concurrency.maximum if self.concurrency is not None else self.workers
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='ffmpeg') as executor:
+            while True:
+                if not stopped and self.should_stop():
+                    stopped = True
+                hold = not stopped and not exhausted and self.should_pause()
+                while not hold and not exhausted and not stopped and len(in_flight) < self._limit():
+                    if self.should_stop():
+                        stopped = True
+                        break
+                    share = threads_per_job(self._limit())
+                    if self.concurrency is not None and not self._fits(in_flight, share):
+                        # Grown: wait for wider jobs started earlier to finish
+                        break
+                    job, held = held or next(pending, None), None
+                    if job is None:
+                        exhausted = True
+                        break
+                    if self.governor and not self.governor.admit(job):
+                        if on_wait and not paused:
+                            on_wait(job, self.governor.shortfall(job))
+                        held, paused = job, True
+                        break
+                    paused = False
+                    if self.concurrency is not None:
+                        job.threads = share
+                    job.status = "processing"
+                    if on_start:
+                        on_start(job)
+                    in_flight[executor.submit(self.converter.convert, job)] = job
+
+                waiting = hold or (held is not None and not stopped)
+                if waiting and not in_flight:
+                    # Paused: nothing running will free space, wait for the user
+                    time.sleep(self.poll_seconds)
+                    continue
+                if not in_flight:
+                    break
+
+                # While paused, check again even if no job finishes; the
+                # concurrency limit may also grow between two completions
+                timeout = self.poll_seconds if waiting or self.concurrency is not None else None
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    if self.governor:
+                        self.governor.release(job)
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        job.status = "failed"
+                        job.error_message = str(e)
+                        success = False
+                    if on_done:
+                        on_done(job, success)
+
+        return not stopped
+
+
+__all__ = [
+    'ConversionPool',
+    'available_cpus',
+    'default_pool_size',
+    'resolve_pool_size',
+    'threads_per_job',
+]
@@ -0,0 +1,185 @@
+"""Streaming FFmpeg progress and bounded stderr capture."""
+
+import threading
+from collections import deque
+from contextlib import nullcontext
+from typing import BinaryIO, Callable, Optional
+
+import ffmpeg
+
+from ecb_tool.features.conversion.cancellation import CancellationToken, Cancelled
+from ecb_tool.features.conversion.supervisor import (
+    ProcessHung,
+    SupervisorPolicy,
+    Watchdog,
+    apply_priority,
+)
+
+
+# Lines of stderr kept for error reports. Long encodes can print megabytes of
+# warnings; only the tail is useful to explain a failure.
+STDERR_TAIL_LINES = 200
+
+# Minimum change (in percent) before on_progress is called again
+PROGRESS_STEP = 0.5
+
+
+def parse_out_time(line: str) -> Optional[float]:
+    """
+    Parse the encoded timestamp from a ``-progress`` line.
+
+    FFmpeg reports ``out_time_us`` and ``out_time_ms``; despite its name the
+    latter is also in microseconds.
+
+    Returns:
+        Seconds encoded so far, or None if the line carries no timestamp
+    """
+    key, _, value = line.partition('=')
+    if key not in ('out_time_us', 'out_time_ms'):
+        return None
+    try:
+        return max(0.0, int(value) / 1_000_000)
+    except ValueError:
+        return None  # "N/A" before the first frame is muxed
+
+
+class ProgressTracker:
+    """Turns ``-progress`` key/value lines into a percentage."""
+
+    def __init__(
+        self,
+        duration: Optional[float],
+        on_progress: Optional[Callable[[float], None]] = None,
+    ):
+        self.duration = duration if duration and duration > 0 else None
+        self.on_progress = on_progress
+        self.out_time = 0.0
+        self.percent = 0.0
+        self.finished = False
+
+    def feed(self, line: str) -> None:
+        """Consume one line of the progress stream."""
+        line = line.strip()
+        if line == 'progress=end':
+            self.finished = True
+            return
+
+        seconds = parse_out_time(line)
+        if seconds is None:
+            return
+        self.out_time = seconds
+
+        if self.duration is None:
+            return
+        # 100% is only reported once ffmpeg has exited cleanly
+        percent = min(99.9, seconds / self.duration * 100)
+        if percent - self.percent >= PROGRESS_STEP:
+            self.percent = percent
+            if self.on_progress:
+                self.on_progress(percent)
+
+
+def run_with_progress(
+    stream,
+    duration: Optional[float] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+    feed: Optional[Callable[[BinaryIO], None]] = None,
+    cancel: Optional[CancellationToken] = None,
+    policy: Optional[SupervisorPolicy] = None,
+) -> bytes:
+    """
+    Run an ffmpeg-python output stream, reporting progress as it encodes.
+
+    Args:
+        stream: ffmpeg-python output node
+        duration: Expected output duration in seconds (None if unknown)
+        on_progress: Called with the percentage encoded so far
+        feed: Writes ffmpeg's input to the stdin pipe it is given (for
+            ``pipe:`` inputs); runs on its own thread, stdin is closed after
+        cancel: Token that kills ffmpeg when cancelled
+        policy: Priority and hang limits ffmpeg runs under (None = unsupervised)
+
+    Returns:
+        The last STDERR_TAIL_LINES lines of ffmpeg's stderr
+
+    Raises:
+        Cancelled: If ``cancel`` was cancelled before ffmpeg finished
+        ProcessHung: If the watchdog killed ffmpeg for stalling or overrunning
+        ffmpeg.Error: If ffmpeg exits with a non-zero code; ``stderr``
+            holds the last STDERR_TAIL_LINES lines
+        Exception: Whatever ``feed`` raised, once ffmpeg has exited
+    """
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    stream = stream.global_args('-hide_banner', '-nostats', '-progress', 'pipe:1')
+    process = stream.run_async(pipe_stdin=feed is not None, pipe_stdout=True, pipe_stderr=True)
+    if policy is not None:
+        apply_priority(process, policy)
+
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+    feed_errors = []
+
+    def drain_stderr():
+        for raw in process.stderr:
+            stderr_tail.append(raw)
+
+    def write_stdin():
+        try:
+            feed(process.stdin)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its return code explains why
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    # stderr must be drained concurrently or ffmpeg blocks once the pipe fills
+    threads = [threading.Thread(target=drain_stderr, daemon=True)]
+    if feed is not None:
+        threads.append(threading.Thread(target=write_stdin, daemon=True))
+    for thread in threads:
+        thread.start()
+
+    tracker = ProgressTracker(duration, on_progress)
+    watchdog = None
+    try:
+        if policy is not None:
+            paused_seconds = (lambda: cancel.paused_seconds) if cancel is not None else (lambda: 0.0)
+            watchdog = Watchdog(process, policy, duration, lambda: tracker.out_time,
+                                paused_seconds).start()
+        with cancel.track(process) if cancel is not None else nullcontext():
+            for raw in process.stdout:
+                tracker.feed(raw.decode('utf-8', errors='replace'))
+            process.wait()
+    finally:
+        # Also when a progress callback raised: the watchdog must not outlive
+        # the child (its PID may be reused) and ffmpeg must not be left running
+        if watchdog is not None:
+            watchdog.stop()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        for thread in threads:
+            thread.join()
+
+    if cancel is not None and cancel.cancelled and process.returncode != 0:
+        raise Cancelled()
+    if watchdog is not None and watchdog.reason:
+        raise ProcessHung(watchdog.reason)
+    if process.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, b''.join(stderr_tail))
+    if feed_errors:
+        # The input was cut short, so the output is incomplete
+        raise feed_errors[0]
+    return b''.join(stderr_tail)
+
+
+__all__ = [
+    'STDERR_TAIL_LINES',
+    'ProgressTracker',
+    'parse_out_time',
+    'run_with_progress',
+]
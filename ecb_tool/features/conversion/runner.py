@@ -1,26 +1,83 @@
 """Runner for video conversion process."""
 
+import json
 import os
+import signal
 import sys
 import time
 import random
+from collections import Counter
+from itertools import islice
+from dataclasses import asdict, replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from ecb_tool.core.paths import get_paths
+from ecb_tool.core.media_index import get_media_index
 from ecb_tool.core.config import ConfigManager
-from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
-from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.models import (
+    AUTO_PRESET,
+    RENDITIONS,
+    ConversionConfig,
+    ConversionJob,
+    Rendition,
+)
+from ecb_tool.features.conversion.calibration import resolve_preset
+from ecb_tool.features.conversion.converter import VideoConverter, partial_path
+from ecb_tool.features.conversion.fingerprint import (
+    NON_OUTPUT_FIELDS,
+    is_up_to_date,
+    job_fingerprint,
+    output_record,
+)
+from ecb_tool.features.conversion import visualizer
+from ecb_tool.features.conversion.cancellation import CancellationToken, StopFlagWatcher
+from ecb_tool.features.conversion.concurrency import ConcurrencyController, ConcurrencyDecision, SystemMonitor
+from ecb_tool.features.conversion.diskspace import GB, DiskGovernor
+from ecb_tool.features.conversion.journal import ConversionJournal
+from ecb_tool.features.conversion.packing import indexed_durations, pack_by_count, pack_by_duration
+from ecb_tool.features.conversion.planner import (
+    RunPlan,
+    format_bytes,
+    format_duration,
+    output_rate,
+    plan_run,
+    record_output,
+)
+from ecb_tool.features.conversion.pool import (
+    ConversionPool,
+    available_cpus,
+    resolve_pool_size,
+    threads_per_job,
+)
+from ecb_tool.features.conversion.scheduling import (
+    DEFAULT_SPEED,
+    estimate_seconds,
+    order_longest_first,
+    smooth_speed,
+    speed_key,
+)
+from ecb_tool.features.conversion.transitions import plan_transitions
 from ecb_tool.core.state_manager import get_state_manager
 
 
 class ConversionRunner:
     """Runs the conversion process based on configuration."""
     
-    def __init__(self):
-        """Initialize the conversion runner."""
+    def __init__(self, on_event: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the conversion runner.
+        
+        Args:
+            on_event: Called with a dict for every step of a run ("plan",
+                "start", "progress", "done", "wait", "idle", "summary"),
+                for callers that follow the run without parsing its output
+        """
         self.paths = get_paths()
         self.state_manager = get_state_manager()
+        self.journal = ConversionJournal(self.paths.conversion_journal)
+        self.cancel_token = CancellationToken()
+        self.on_event = on_event
         self._load_config()
         self._setup_converter()
         self.should_stop = False
@@ -30,13 +87,45 @@ class ConversionRunner:
         config_schema = {
             "conversion": {
                 "bpv": 1,
+                "duracion_min_minutos": 0,
+                "duracion_max_minutos": 0,
                 "lotes": 2,
+                "lotes_adaptativo": True,
+                "lotes_min": 1,
+                "lotes_max": 0,
+                "tramos_desde_minutos": 20,
+                "tramos_minutos": 5,
                 "resolucion": "1920x1080",
                 "fps": 30,
                 "bitrate_video": "2M",
                 "formato_video": "mp4",
+                "perfil_video": "standard",
+                "preset": "medium",
+                "crf": None,
+                "objetivo_tiempo_real": 8.0,
+                "variantes": [],
+                "reutilizar_segmentos_portada": True,
+                "preprocesar_portadas": True,
+                "fuente_video": "cover",
+                "omitir_actualizados": True,
+                "reserva_disco_gb": 2.0,
+                "prioridad_nice": 10,
+                "prioridad_io_clase": 2,
+                "prioridad_io_nivel": 7,
+                "bloqueo_segundos": 120,
+                "reintentos_bloqueo": 1,
                 "bitrate_audio": "192k",
                 "formato_audio": "aac",
+                "normalizar_volumen": False,
+                "loudness_objetivo": -14.0,
+                "ajuste_volumen_db": 0.0,
+                "fade_in_video": {"activo": True, "duracion": 2},
+                "fade_out_video": {"activo": True, "duracion": 2},
+                "fade_transicion_video": {"activo": True, "duracion": 1},
+                "fade_in_audio": {"activo": True, "duracion": 2},
+                "fade_out_audio": {"activo": True, "duracion": 2},
+                "fade_transicion_audio": {"activo": False, "duracion": 0},
+                "enable_fades": True,
                 "autoborrado_beats": False,
                 "papelera_beats": False,
                 "autoborrado_portadas": False,
@@ -48,6 +137,9 @@ class ConversionRunner:
             self.paths.conversion_config,
             config_schema
         )
+        
+        order_config = ConfigManager(self.paths.order_config, {"cover_mode": "Random"})
+        self.cover_mode = order_config.get("cover_mode", "Random")
     
     def _setup_converter(self):
         """Setup the video converter."""
@@ -62,14 +154,80 @@ class ConversionRunner:
             video_bitrate=conv_settings.get("bitrate_video", "2M"),
             audio_bitrate=conv_settings.get("bitrate_audio", "192k"),
             audio_format=conv_settings.get("formato_audio", "aac"),
+            loudness_target=(conv_settings.get("loudness_objetivo", -14.0)
+                             if conv_settings.get("normalizar_volumen", False) else None),
+            volume_db=conv_settings.get("ajuste_volumen_db", 0.0),
             video_format=conv_settings.get("formato_video", "mp4"),
+            encode_profile=conv_settings.get("perfil_video", "standard"),
+            preset=conv_settings.get("preset", "medium"),
+            crf=conv_settings.get("crf"),
+            reuse_cover_segments=conv_settings.get("reutilizar_segmentos_portada", True),
+            preprocess_covers=conv_settings.get("preprocesar_portadas", True),
+            video_source=conv_settings.get("fuente_video", "cover"),
+            skip_up_to_date=conv_settings.get("omitir_actualizados", True),
+            disk_reserve_gb=conv_settings.get("reserva_disco_gb", 2.0),
+            process_nice=conv_settings.get("prioridad_nice", 10),
+            io_class=conv_settings.get("prioridad_io_clase", 2),
+            io_level=conv_settings.get("prioridad_io_nivel", 7),
+            stall_seconds=conv_settings.get("bloqueo_segundos", 120),
+            hang_retries=conv_settings.get("reintentos_bloqueo", 1),
             batch_size=conv_settings.get("lotes", 2),
+            adaptive_batch=conv_settings.get("lotes_adaptativo", True),
+            min_batch_size=conv_settings.get("lotes_min", 1),
+            max_batch_size=conv_settings.get("lotes_max", 0),
+            chunk_min_minutes=conv_settings.get("tramos_desde_minutos", 20),
+            chunk_minutes=conv_settings.get("tramos_minutos", 5),
             beats_per_video=conv_settings.get("bpv", 1),
+            target_min_minutes=conv_settings.get("duracion_min_minutos", 0),
+            target_max_minutes=conv_settings.get("duracion_max_minutos", 0),
             auto_delete_beats=conv_settings.get("autoborrado_beats", False),
-            auto_delete_covers=conv_settings.get("autoborrado_portadas", False)
+            auto_delete_covers=conv_settings.get("autoborrado_portadas", False),
+            fade_in_duration=_fade_seconds(conv_settings.get("fade_in_video")),
+            fade_out_duration=_fade_seconds(conv_settings.get("fade_out_video")),
+            fade_transition_duration=_fade_seconds(conv_settings.get("fade_transicion_video")),
+            audio_fade_in_duration=_fade_seconds(conv_settings.get("fade_in_audio")),
+            audio_fade_out_duration=_fade_seconds(conv_settings.get("fade_out_audio")),
+            audio_crossfade_duration=_fade_seconds(conv_settings.get("fade_transicion_audio")),
+            # Master switch over every fade above
+            enable_fades=conv_settings.get("enable_fades", True),
         )
         
-        self.converter = VideoConverter(self.converter_config)
+        # Parallel jobs: "lotes" from config, or a CPU-aware default when 0.
+        # Each ffmpeg child gets its own share of the cores.
+        self.pool_size = resolve_pool_size(self.converter_config.batch_size)
+        self.converter_config.threads = threads_per_job(self.pool_size)
+        
+        # "auto": slowest preset this machine can afford at these settings
+        if self.converter_config.preset == AUTO_PRESET:
+            if resolve_preset(self.converter_config, self.state_manager) is None:
+                print(f"⚠️ Preset automático sin calibrar; usando {self.converter_config.preset}. "
+                      f"Ejecuta: python -m ecb_tool.features.conversion.calibration")
+        
+        if self.converter_config.video_source == "visualizer" and not visualizer.is_available():
+            print("⚠️ El visualizador necesita NumPy (pip install numpy); se usa la portada en bucle")
+            self.converter_config.video_source = "cover"
+        
+        # ffprobe runs niced and gives up on hung files like the encodes do
+        get_media_index().configure(timeout=self.converter_config.stall_seconds,
+                                    nice=self.converter_config.process_nice)
+        
+        self.converter = VideoConverter(
+            self.converter_config,
+            on_progress=lambda job_id, percent: self._emit("progress", job=job_id,
+                                                           percent=round(percent, 1)),
+            cancel_token=self.cancel_token,
+        )
+        self.renditions = self._load_renditions(conv_settings.get("variantes", []))
+    
+    def _load_renditions(self, names: List[str]) -> List[Rendition]:
+        """Renditions every job writes in one pass ("variantes"); empty = one video."""
+        renditions = []
+        for name in names:
+            if name in RENDITIONS:
+                renditions.append(RENDITIONS[name])
+            else:
+                print(f"⚠️ Variante desconocida ignorada: {name}")
+        return renditions
     
     def _select_cover(self, covers: List[Path], mode: str = "random") -> Path:
         """Select a cover based on mode."""
@@ -108,6 +266,23 @@ class ConversionRunner:
         else:
             return random.choice(covers)
     
+    def _beat_groups(self, beats: List[Path],
+                     config: Optional[ConversionConfig] = None) -> Iterator[List[Path]]:
+        """Lazily group beats into videos, by count or by target duration."""
+        config = config or self.converter_config
+        if not config.packs_by_duration:
+            return pack_by_count(beats, config.beats_per_video)
+        
+        def skipped(beat: Path):
+            print(f"⚠️ Beat omitido: {beat.name}")
+        
+        return pack_by_duration(
+            indexed_durations(beats, get_media_index()),
+            config.target_min_minutes * 60,
+            config.target_max_minutes * 60,
+            on_skip=skipped,
+        )
+    
     def _create_jobs(self, num_orders: int = 1) -> List[ConversionJob]:
         """Create conversion jobs."""
         beats = self.converter.list_beats()
@@ -121,21 +296,19 @@ class ConversionRunner:
             print("⚠️ No hay portadas disponibles")
             return []
         
-        bpv = self.converter_config.beats_per_video
         jobs = []
+        groups = self._beat_groups(beats)
         
         for order in range(num_orders):
-            if len(beats) < bpv:
+            # Take beats for this job
+            job_beats = next(groups, None)
+            if job_beats is None:
                 print(f"⚠️ No hay suficientes beats para la orden {order + 1}")
                 break
             
-            # Take beats for this job
-            job_beats = beats[:bpv]
-            beats = beats[bpv:]  # Remove used beats
-            
             # Select cover
             try:
-                cover = self._select_cover(covers, mode=cover_mode)
+                cover = self._select_cover(covers, mode=self.cover_mode)
             except ValueError as e:
                 print(f"⚠️ Error seleccionando portada: {e}")
                 break
@@ -149,9 +322,10 @@ class ConversionRunner:
             
             job = ConversionJob(
                 id=f"job-{order + 1:03d}",
-                beat_file=main_beat,
+                beat_files=job_beats,
                 cover_file=cover,
-                output_file=output_file
+                output_file=output_file,
+                renditions=list(self.renditions)
             )
             
             jobs.append(job)
@@ -159,9 +333,125 @@ class ConversionRunner:
         
         return jobs
     
-    def _check_stop_flag(self) -> bool:
-        """Check if stop flag exists."""
-        return self.paths.stop_flag.exists()
+    def _output_duration(self, beats: List[Path]) -> Optional[float]:
+        """Length of the video made from ``beats`` (crossfades overlap them)."""
+        return plan_transitions(self.converter_config, self.converter.probe_durations(beats),
+                                len(beats)).duration
+    
+    def plan(self, num_orders: int = 1, beats_per_video: Optional[int] = None) -> RunPlan:
+        """
+        Predict the cost of a run without starting it.
+        
+        Args:
+            num_orders: Number of videos to create
+            beats_per_video: BPV to plan with instead of the configured one
+        
+        Returns:
+            Predicted wall time, output size and upload time
+        """
+        config = self.converter_config
+        if beats_per_video is not None and not config.packs_by_duration:
+            config = replace(config, beats_per_video=beats_per_video)
+        # Only the beats the orders would use are probed; packing by
+        # duration probes them lazily as it goes
+        groups = list(islice(self._beat_groups(self.converter.list_beats(), config), num_orders))
+        get_media_index().probe_many(beat for group in groups for beat in group)
+        durations = [self._output_duration(group) for group in groups]
+        
+        return plan_run(config, durations, self.pool_size, self.state_manager, self.renditions)
+    
+    def _resume_jobs(self) -> List[ConversionJob]:
+        """Unfinished jobs of a run that was interrupted, still runnable."""
+        unfinished = self.journal.unfinished_jobs()
+        # A crash can leave half-written videos behind
+        for job in unfinished:
+            for output_file in job.output_files:
+                partial_path(output_file).unlink(missing_ok=True)
+        
+        # The jobs were planned for the recorded settings; with other
+        # settings they would build different videos than planned
+        if unfinished and not self._same_output_params(self.journal.params()):
+            print(f"⚠️ Los ajustes cambiaron desde la ejecución interrumpida: "
+                  f"se descartan sus {len(unfinished)} órdenes pendientes")
+            self.journal.discard()
+            return []
+        
+        jobs = []
+        for job in unfinished:
+            if all(output_file.exists() for output_file in job.output_files):
+                continue  # Finished right before the crash
+            if not job.cover_file.exists() or not all(beat.exists() for beat in job.beat_files):
+                print(f"⚠️ Orden {job.id} descartada: faltan archivos")
+                continue
+            jobs.append(job)
+        return jobs
+    
+    def _skip_up_to_date(self, jobs: List[ConversionJob]) -> Tuple[List[ConversionJob], Dict[str, str]]:
+        """
+        Drop jobs whose video was already built from the same inputs and settings.
+        
+        Returns:
+            Jobs left to run, and the fingerprint of each of them
+        """
+        if not self.converter_config.skip_up_to_date:
+            return jobs, {}
+        
+        pending = []
+        fingerprints = {}
+        for job in jobs:
+            try:
+                fingerprint = job_fingerprint(job, self.converter_config)
+            except OSError:
+                pending.append(job)  # Unreadable input: the conversion reports it
+                continue
+            
+            if all(
+                is_up_to_date(output_file, fingerprint,
+                              self.state_manager.get_output_fingerprint(str(output_file)))
+                for output_file in job.output_files
+            ):
+                print(f"⏭️ Sin cambios, se omite: {job.output_file.name}")
+                continue
+            
+            fingerprints[job.id] = fingerprint
+            pending.append(job)
+        return pending, fingerprints
+    
+    def _journal_params(self) -> dict:
+        """Encoding parameters recorded with the run."""
+        return {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in asdict(self.converter_config).items()
+        }
+    
+    def _same_output_params(self, recorded: Optional[dict]) -> bool:
+        """True if ``recorded`` journal params build the same videos as the current settings."""
+        if recorded is None:
+            return False
+        # Compared as stored, so tuples and lists are alike
+        current = json.loads(json.dumps(self._journal_params(), default=str))
+        
+        def output_params(params: dict) -> dict:
+            return {key: value for key, value in params.items() if key not in NON_OUTPUT_FIELDS}
+        
+        return output_params(recorded) == output_params(current)
+    
+    def _emit(self, event: str, **fields) -> None:
+        """Report a step of the run to on_event."""
+        if self.on_event:
+            self.on_event({"event": event, **fields})
+    
+    def cancel(self) -> None:
+        """Stop the run now: kill the encodes in progress and start no more jobs."""
+        self.cancel_token.cancel()
+    
+    def pause(self) -> None:
+        """Suspend the encodes in progress and start no more jobs until resume()."""
+        self.cancel_token.pause()
+    
+    def resume(self) -> None:
+        """Continue a paused run where it stopped."""
+        self.cancel_token.resume()
     
     def run(self, num_orders: int = 1) -> None:
         """
@@ -175,65 +465,229 @@ class ConversionRunner:
         print("=" * 60)
         print(f"📊 Configuración:")
         print(f"  - Resolución: {self.converter_config.resolution}")
-        print(f"  - FPS: {self.converter_config.fps}")
-        print(f"  - Bitrate Video: {self.converter_config.video_bitrate}")
+        print(f"  - Perfil: {self.converter_config.profile.label}")
+        print(f"  - Preset: {self.converter_config.preset}"
+              + (f" (CRF {self.converter_config.crf})" if self.converter_config.crf is not None else ""))
+        print(f"  - FPS: {self.converter_config.effective_fps}")
+        print(f"  - Bitrate Video: {self.converter_config.effective_video_bitrate}")
         print(f"  - Bitrate Audio: {self.converter_config.audio_bitrate}")
-        print(f"  - Beats por video: {self.converter_config.beats_per_video}")
+        if self.converter_config.packs_by_duration:
+            print(f"  - Duración por video: {self.converter_config.target_min_minutes:g}-"
+                  f"{self.converter_config.target_max_minutes:g} min")
+        else:
+            print(f"  - Beats por video: {self.converter_config.beats_per_video}")
+        if self.renditions:
+            print(f"  - Variantes: {', '.join(r.name for r in self.renditions)}")
+        print(f"  - Trabajos en paralelo: {self.pool_size} ({self.converter_config.threads} hilos c/u)")
         print(f"  - Órdenes: {num_orders}")
         print("=" * 60)
         
-        # Create jobs
-        jobs = self._create_jobs(num_orders)
+        # Finish an interrupted run before planning a new one
+        jobs = self._resume_jobs()
+        resumed = bool(jobs)
+        if resumed:
+            print(f"\n♻️ Reanudando {len(jobs)} órdenes pendientes de la ejecución anterior\n")
+        else:
+            jobs = self._create_jobs(num_orders)
+            
+            if not jobs:
+                print("\n❌ No se pudieron crear órdenes de conversión")
+                self._emit("idle", reason="no_jobs")
+                return
+            
+            print(f"\n✓ {len(jobs)} órdenes creadas\n")
         
+        # Re-encode only what changed since the last build
+        jobs, fingerprints = self._skip_up_to_date(jobs)
         if not jobs:
-            print("\n❌ No se pudieron crear órdenes de conversión")
+            print("\n✓ Todos los videos están al día")
+            self._emit("idle", reason="up_to_date")
             return
         
-        print(f"\n✓ {len(jobs)} órdenes creadas\n")
+        # Probe every beat up front, in parallel; jobs then read the index
+        get_media_index().probe_many(beat for job in jobs for beat in job.beat_files)
+        
+        # Longest jobs first, so no long mix is left running alone at the end
+        key = speed_key(self.converter_config, self.pool_size)
+        speed = self.state_manager.get_encode_speed(key) or DEFAULT_SPEED
+        durations = {job.id: self._output_duration(job.beat_files) for job in jobs}
+        costs = {job.id: estimate_seconds(durations[job.id], speed) for job in jobs}
+        jobs = order_longest_first(jobs, costs)
+        
+        # A queue shorter than the pool would leave cores idle: share them
+        # among the jobs there are, so a lone long mix encodes its chunks
+        # on every core
+        if len(jobs) < self.pool_size:
+            self.converter_config.threads = threads_per_job(len(jobs))
+        
+        plan = plan_run(self.converter_config, [durations[job.id] for job in jobs],
+                        self.pool_size, self.state_manager, self.renditions)
+        print(f"🔮 Previsión: {format_duration(plan.wall_seconds)} de conversión, "
+              f"{format_bytes(plan.output_bytes)}, {format_duration(plan.upload_seconds)} de subida"
+              + ("" if plan.calibrated else " (sin calibrar)"))
+        self._emit("plan", jobs=len(jobs), resumed=resumed, wall_seconds=round(plan.wall_seconds),
+                   output_bytes=round(plan.output_bytes), calibrated=plan.calibrated)
+        
+        self.journal.start(jobs, self._journal_params(), resumed=resumed)
         
         # Process jobs
         completed = 0
         failed = 0
+        cancelled = 0
+        started = 0
+        start_times = {}
+        paused_at_start = {}
+        run_start = time.monotonic()
         
-        for i, job in enumerate(jobs, 1):
-            if self._check_stop_flag():
-                print("\n⏹️ Proceso detenido por el usuario")
-                break
-            
-            print(f"\n[{i}/{len(jobs)}] Procesando: {job.output_file.name}")
+        # Covers can be shared between jobs; only delete once nobody needs them
+        cover_refs = Counter(job.cover_file for job in jobs)
+        
+        def on_start(job: ConversionJob):
+            nonlocal started
+            started += 1
+            start_times[job.id] = time.monotonic()
+            paused_at_start[job.id] = self.cancel_token.paused_seconds
+            self.journal.update(job)
+            print(f"\n[{started}/{len(jobs)}] Procesando: {job.output_file.name}")
+            self._emit("start", job=job.id, output=str(job.output_file), index=started, total=len(jobs))
             print("-" * 60)
-            
-            job.status = "processing"
-            success = self.converter.convert(job)
+        
+        def on_done(job: ConversionJob, success: bool):
+            nonlocal completed, failed, cancelled, speed
+            cover_refs[job.cover_file] -= 1
+            self.journal.update(job)
+            self._emit("done", job=job.id, status=job.status, error=job.error_message)
             
             if success:
                 print(f"✅ Completado: {job.output_file.name}")
                 completed += 1
                 
+                # Calibrate the speed and size estimates for the next runs
+                # (time spent paused is not encoding time)
+                paused = self.cancel_token.paused_seconds - paused_at_start[job.id]
+                elapsed = time.monotonic() - start_times[job.id] - paused
+                if durations[job.id] and elapsed > 0:
+                    speed = smooth_speed(speed, durations[job.id] / elapsed)
+                    self.state_manager.set_encode_speed(key, speed)
+                record_output(self.state_manager, self.converter_config, durations[job.id],
+                              sum(f.stat().st_size for f in job.output_files if f.exists()),
+                              job.renditions)
+                
+                # Remember what the video was built from
+                if job.id in fingerprints:
+                    for output_file in job.output_files:
+                        record = output_record(output_file, fingerprints[job.id])
+                        self.state_manager.set_output_fingerprint(str(output_file), record)
+                
                 # Cleanup if configured
-                self.converter.cleanup(job)
+                self.converter.cleanup(job, delete_cover=cover_refs[job.cover_file] == 0)
                 
                 # Update state
                 self._update_state(job, "completed")
+            elif job.status == "cancelled":
+                print(f"⏹️ Cancelado: {job.output_file.name}")
+                cancelled += 1
             else:
                 print(f"❌ Error: {job.error_message}")
                 failed += 1
                 self._update_state(job, "failed", job.error_message)
         
+        def on_wait(job: ConversionJob, missing: float):
+            print(f"\n💾 Espacio en disco insuficiente para {job.output_file.name} "
+                  f"(faltan {format_bytes(missing)}); conversión en pausa hasta que se libere")
+            self._emit("wait", job=job.id, missing_bytes=round(missing))
+        
+        # Only start jobs whose output fits, keeping the reserve free. Jobs
+        # with unknown length are only held to the reserve.
+        bytes_per_second = output_rate(self.converter_config, self.state_manager, self.renditions)
+        governor = DiskGovernor(
+            self.converter_config.videos_dir,
+            lambda job: (durations.get(job.id) or 0.0) * bytes_per_second,
+            reserve_bytes=self.converter_config.disk_reserve_gb * GB,
+        )
+        
+        # STOP kills running encodes at once and PAUSE suspends them, whether
+        # it comes from the UI or from the flag files written by another process
+        pool = ConversionPool(self.converter, self.pool_size,
+                              should_stop=lambda: self.cancel_token.cancelled,
+                              governor=governor,
+                              should_pause=lambda: self.cancel_token.paused,
+                              concurrency=self._concurrency(jobs, durations))
+        with StopFlagWatcher(self.paths.stop_flag, self.cancel_token,
+                             pause_flag=self.paths.pause_flag):
+            finished = pool.run(jobs, on_start=on_start, on_done=on_done, on_wait=on_wait)
+        if not finished or cancelled:
+            # Stopped on purpose: the next run plans the orders it is asked for
+            print("\n⏹️ Proceso detenido por el usuario")
+            self.journal.discard()
+        else:
+            self.journal.finish()
+        
         # Summary
         print("\n" + "=" * 60)
         print("📊 RESUMEN DE CONVERSIÓN")
         print("=" * 60)
         print(f"✅ Completados: {completed}")
         print(f"❌ Fallidos: {failed}")
+        if cancelled:
+            print(f"⏹️ Cancelados: {cancelled}")
+        paused = self.cancel_token.paused_seconds
+        print(f"⏱️ Tiempo total: {format_duration(time.monotonic() - run_start)} "
+              f"(previsto: {format_duration(plan.wall_seconds)}"
+              + (f", en pausa: {format_duration(paused)})" if paused else ")"))
         print(f"📁 Videos: {self.converter_config.videos_dir}")
         print("=" * 60)
+        self._emit("summary", completed=completed, failed=failed, cancelled=cancelled,
+                   stopped=not finished, elapsed_seconds=round(time.monotonic() - run_start))
+    
+    def _concurrency(self, jobs: List[ConversionJob],
+                     durations: Dict[str, Optional[float]]) -> Optional[ConcurrencyController]:
+        """
+        Controller that adapts the number of parallel jobs while the pool runs.
+        
+        Only with "lotes" set to 0 (automatic): an explicit batch size is
+        kept as given. Starts from the CPU-aware default and stays within
+        "lotes_min" and "lotes_max"; every decision is logged to
+        data/concurrency_log.csv.
+        
+        Returns:
+            The controller, or None when adaptive batching is off, "lotes"
+            is explicit or every job starts at once anyway
+        """
+        config = self.converter_config
+        if not config.adaptive_batch or config.batch_size > 0 or len(jobs) <= self.pool_size:
+            return None
+        
+        def encoded_seconds() -> float:
+            return sum(job.progress / 100 * (durations.get(job.id) or 0.0) for job in jobs)
+        
+        def on_decision(decision: ConcurrencyDecision):
+            load = decision.load
+            self.state_manager.log_concurrency(
+                decision.workers, decision.previous, decision.throughput,
+                load.cpu_busy if load else None,
+                load.iowait if load else None,
+                load.memory_available if load else None,
+                decision.reason,
+            )
+            if decision.workers != decision.previous:
+                print(f"\n⚙️ Trabajos en paralelo: {decision.previous} → {decision.workers} "
+                      f"({decision.reason})")
+        
+        return ConcurrencyController(
+            minimum=config.min_batch_size,
+            maximum=config.max_batch_size or max(self.pool_size, available_cpus() // 2),
+            initial=self.pool_size,
+            encoded_seconds=encoded_seconds,
+            monitor=SystemMonitor(),
+            on_decision=on_decision,
+        )
     
     def _update_state(self, job: ConversionJob, status: str, error: str = ""):
         """Update conversion state file."""
         self.state_manager.log_conversion(
             job_id=job.id,
-            beat=job.beat_file.name,
+            beat=", ".join(beat.name for beat in job.beat_files),
             cover=job.cover_file.name,
             output=job.output_file.name,
             status=status,
@@ -241,6 +695,13 @@ class ConversionRunner:
         )
 
 
+def _fade_seconds(setting: Optional[dict]) -> float:
+    """Length of a fade from its {"activo", "duracion"} setting; 0 when off."""
+    if not setting or not setting.get("activo", False):
+        return 0.0
+    return max(0.0, float(setting.get("duracion", 0)))
+
+
 def main():
     """Main entry point for conversion runner."""
     # Load order configuration
@@ -256,6 +717,8 @@ def main():
     
     try:
         runner = ConversionRunner()
+        # A terminated runner kills its ffmpeg children instead of orphaning them
+        signal.signal(signal.SIGTERM, lambda signum, frame: runner.cancel())
         runner.run(num_orders)
     except KeyboardInterrupt:
         print("\n\n⏹️ Proceso interrumpido por el usuario")
@@ -0,0 +1,78 @@
+"""Job ordering for the conversion pool.
+
+The pool hands jobs to whichever worker frees up first, so the order jobs
+are submitted in decides the makespan (wall time of the whole batch).
+Starting the longest jobs first (LPT) keeps a long mix from being left
+alone at the end while the other workers sit idle.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+
+
+# Encoded seconds per wall second assumed before a machine is calibrated
+DEFAULT_SPEED = 8.0
+
+# Fixed cost of a job regardless of length (process start, probing, muxing)
+JOB_OVERHEAD_SECONDS = 2.0
+
+# Weight of the newest measurement in the calibrated speed
+SPEED_SMOOTHING = 0.3
+
+
+def speed_key(config: ConversionConfig, workers: int) -> str:
+    """Settings that change encode speed; each gets its own calibration."""
+    mode = "loop" if config.reuse_cover_segments else "encode"
+    return (f"{config.encode_profile}|{config.preset}|{config.resolution}|"
+            f"{config.effective_fps}|{mode}|x{workers}")
+
+
+def smooth_speed(previous: Optional[float], measured: float) -> float:
+    """Blend a new speed measurement into the calibrated one."""
+    if not previous:
+        return measured
+    return previous + SPEED_SMOOTHING * (measured - previous)
+
+
+def estimate_seconds(duration: Optional[float], speed: float) -> float:
+    """
+    Expected wall time of a job.
+
+    Args:
+        duration: Output length in seconds (None if unknown)
+        speed: Encoded seconds per wall second
+    """
+    return JOB_OVERHEAD_SECONDS + (duration or 0.0) / max(speed, 1e-6)
+
+
+def order_longest_first(jobs: Iterable[ConversionJob], costs: Dict[str, float]) -> List[ConversionJob]:
+    """
+    Sort jobs by estimated cost, longest first (LPT).
+
+    Jobs with equal cost keep their original order.
+    """
+    return sorted(jobs, key=lambda job: costs.get(job.id, 0.0), reverse=True)
+
+
+def planned_makespan(costs: Iterable[float], workers: int) -> float:
+    """
+    Wall time of running jobs in the given order on ``workers`` workers.
+
+    Each job goes to the worker that becomes free first, as ConversionPool does.
+    """
+    loads = [0.0] * max(1, workers)
+    for cost in costs:
+        heapq.heappush(loads, heapq.heappop(loads) + cost)
+    return max(loads)
+
+
+__all__ = [
+    'DEFAULT_SPEED',
+    'estimate_seconds',
+    'order_longest_first',
+    'planned_makespan',
+    'smooth_speed',
+    'speed_key',
+]
@@ -0,0 +1,114 @@
+"""Cache of pre-encoded cover loop segments.
+
+A cover is usually reused by many videos. Instead of encoding the same still
+image for the full length of every beat, a short segment is encoded once per
+cover and encoder settings, and each job repeats it with the concat demuxer
+using stream copy. Only the audio is encoded per job.
+"""
+
+import hashlib
+import math
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from ecb_tool.features.conversion.cache import file_digest
+from ecb_tool.features.conversion.models import ConversionConfig
+
+
+# Length of each cached loop segment. Longer segments mean shorter concat
+# lists; shorter ones waste less encode time on the first use of a cover.
+SEGMENT_SECONDS = 30
+
+# Disk budget for cached segments; least recently used ones are evicted
+SEGMENT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+
+def segment_key(cover: Path, config: ConversionConfig) -> str:
+    """
+    Cache key for a cover rendered with the given settings.
+
+    Covers are keyed by content, so renaming or copying a cover still hits
+    the cache, and editing it in place does not return a stale segment.
+    """
+    profile = config.profile
+    params = "|".join(str(value) for value in (
+        file_digest(cover),
+        config.resolution,
+        config.effective_fps,
+        config.effective_video_bitrate,
+        config.preset,
+        config.crf,
+        profile.tune,
+        profile.keyframe_seconds,
+        config.preprocess_covers,
+        SEGMENT_SECONDS,
+        'libx264',
+        'yuv420p',
+    ))
+    return hashlib.sha256(params.encode('utf-8')).hexdigest()[:32]
+
+
+def fade_clip_key(cover: Path, config: ConversionConfig, kind: str, frames: int) -> str:
+    """Cache key for a clip of the cover fading in or out over ``frames`` frames."""
+    params = f"{segment_key(cover, config)}|fade-{kind}|{frames}"
+    return hashlib.sha256(params.encode('utf-8')).hexdigest()[:32]
+
+
+def write_concat_entries(entries: Iterable[Tuple[Path, Optional[float]]], list_file: Path) -> None:
+    """
+    Write a concat demuxer list from (file, outpoint) entries.
+
+    An outpoint cuts its file short after that many seconds; None plays it whole.
+    """
+    lines = []
+    for file, outpoint in entries:
+        # The concat demuxer quotes with single quotes; escape any in the path
+        entry = Path(file).resolve().as_posix().replace("'", "'\\''")
+        lines.append(f"file '{entry}'\n")
+        if outpoint is not None:
+            lines.append(f"outpoint {outpoint:.6f}\n")
+    list_file.write_text(''.join(lines), encoding='utf-8')
+
+
+def write_concat_files(files: Iterable[Path], list_file: Path) -> None:
+    """Write a concat demuxer list playing ``files`` back to back."""
+    write_concat_entries(((file, None) for file in files), list_file)
+
+
+def loop_entries(segment: Path, seconds: float, fps: int) -> List[Tuple[Path, Optional[float]]]:
+    """
+    Concat entries repeating a segment for exactly ``seconds`` (whole frames).
+
+    The cover is a still image, so cutting the last copy between keyframes
+    shows no artifacts.
+    """
+    frames = round(seconds * fps)
+    full, rest = divmod(frames, SEGMENT_SECONDS * fps)
+    entries = [(segment, None)] * full
+    if rest:
+        entries.append((segment, rest / fps))
+    return entries
+
+
+def write_concat_list(segment: Path, duration: float, list_file: Path) -> int:
+    """
+    Write a concat demuxer list repeating a segment to cover ``duration``.
+
+    Returns:
+        Number of times the segment is repeated
+    """
+    repeats = max(1, math.ceil(duration / SEGMENT_SECONDS))
+    write_concat_files([segment] * repeats, list_file)
+    return repeats
+
+
+__all__ = [
+    'SEGMENT_CACHE_MAX_BYTES',
+    'SEGMENT_SECONDS',
+    'fade_clip_key',
+    'loop_entries',
+    'segment_key',
+    'write_concat_entries',
+    'write_concat_files',
+    'write_concat_list',
+]
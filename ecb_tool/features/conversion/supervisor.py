@@ -0,0 +1,253 @@
+"""Supervision of ffmpeg children: priority, time limits and hang detection.
+
+Encodes used to run at normal priority with no time limit, so a long batch
+made the UI stutter and a stuck ffmpeg blocked the queue forever. Every
+child started through run_with_progress is now:
+
+- lowered in CPU priority (nice) and, on Linux, in I/O priority (ionice,
+  class and level configurable),
+  so the interface and a live session keep the machine responsive;
+- watched by a Watchdog thread that samples its CPU time and memory from
+  /proc and kills it when it has not advanced for ``stall_seconds`` (a hang)
+  or has run far longer than its length allows (a wall-clock limit derived
+  from the expected duration). The CPU samples tell a child blocked on I/O
+  or a lock (no CPU used) from one still busy without producing output
+  (a long analysis pass, or a spinning encoder): the busy one gets
+  ``busy_stall_factor`` times longer before it is killed.
+
+Time spent paused by the user counts towards neither limit. What happens
+to a killed job (restart or fail) is up to the caller; the converter
+retries it ``retries`` times.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+
+# Niceness ffmpeg children run at (0-19; 0 = normal priority)
+DEFAULT_NICE = 10
+
+# I/O priority of ffmpeg children (ionice): lowest level of the best-effort class
+DEFAULT_IO_CLASS = 2
+DEFAULT_IO_LEVEL = 7
+
+# Seconds without encoding progress after which a child is considered hung
+DEFAULT_STALL_SECONDS = 120.0
+
+# Seconds between two looks at a running child
+SAMPLE_INTERVAL = 2.0
+
+# Share of one core a stalled child must use to count as busy, not blocked
+BUSY_CPU_SHARE = 0.5
+
+# How much longer a busy child may go without progress than a blocked one
+BUSY_STALL_FACTOR = 3.0
+
+_PROC = Path('/proc')
+
+
+@dataclass
+class SupervisorPolicy:
+    """How ffmpeg children are run and when they are given up on."""
+
+    nice: int = DEFAULT_NICE  # 0 = leave the priority alone
+    io_class: int = DEFAULT_IO_CLASS  # ionice: 1 realtime, 2 best-effort, 3 idle; 0 = leave alone
+    io_level: int = DEFAULT_IO_LEVEL  # 0 (highest) to 7 (lowest), for classes 1 and 2
+    stall_seconds: float = DEFAULT_STALL_SECONDS  # 0 = no hang detection
+    min_speed: float = 0.25  # Slowest credible encode (media s per wall s); 0 = no limit
+    timeout_margin: float = 300.0  # Added to the limit for start-up and muxing
+    retries: int = 1  # Restarts of a hung job before it fails
+    sample_interval: float = SAMPLE_INTERVAL
+    busy_stall_factor: float = BUSY_STALL_FACTOR  # Stall grace while the child still uses CPU
+
+    def time_limit(self, duration: Optional[float]) -> Optional[float]:
+        """
+        Wall-clock limit for producing ``duration`` seconds of media.
+
+        Returns:
+            Seconds, or None without a known duration or with no min_speed
+        """
+        if not duration or self.min_speed <= 0:
+            return None
+        return duration / self.min_speed + self.timeout_margin
+
+
+@dataclass
+class ProcessSample:
+    """Resource use of a child at one point in time."""
+
+    cpu_seconds: float  # User + system CPU time so far
+    rss_bytes: int  # Resident memory
+
+
+class ProcessHung(Exception):
+    """Raised when the watchdog killed a child that stopped making progress."""
+
+
+def sample_process(pid: int) -> Optional[ProcessSample]:
+    """
+    Read a process's CPU time and resident memory from /proc.
+
+    Returns:
+        The sample, or None where /proc is unavailable or the process is gone
+    """
+    try:
+        stat = (_PROC / str(pid) / 'stat').read_text()
+        statm = (_PROC / str(pid) / 'statm').read_text()
+    except OSError:
+        return None
+    # The command name may contain spaces; the fields after it are fixed
+    fields = stat.rsplit(')', 1)[1].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / ticks
+    rss_bytes = int(statm.split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    return ProcessSample(cpu_seconds, rss_bytes)
+
+
+def ionice_args(policy: SupervisorPolicy) -> List[str]:
+    """ionice options for the policy's I/O priority; empty to leave it alone."""
+    if policy.io_class <= 0:
+        return []
+    args = ['-c', str(min(3, policy.io_class))]
+    if policy.io_class < 3:  # The idle class has no levels
+        args += ['-n', str(max(0, min(7, policy.io_level)))]
+    return args
+
+
+def apply_priority(process: subprocess.Popen, policy: SupervisorPolicy) -> None:
+    """Lower a freshly started child's CPU and I/O priority (POSIX only)."""
+    if policy.nice > 0 and hasattr(os, 'setpriority'):
+        try:
+            os.setpriority(os.PRIO_PROCESS, process.pid, min(19, policy.nice))
+        except OSError:
+            pass  # Already exited
+    args = ionice_args(policy)
+    ionice = shutil.which('ionice') if args else None
+    if ionice:
+        # The realtime class needs privileges; ionice then fails and the child keeps its priority
+        subprocess.run([ionice, *args, '-p', str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class Watchdog:
+    """Kills a child that hangs or overruns its time limit.
+
+    Progress is the encoded timestamp (ProgressTracker.out_time); a child
+    whose timestamp does not move for ``stall_seconds`` is hung. Where /proc
+    is available, a child that kept using CPU since its last progress is
+    busy rather than blocked and gets ``busy_stall_factor`` times longer.
+    """
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        policy: SupervisorPolicy,
+        duration: Optional[float],
+        progress: Callable[[], float],
+        paused_seconds: Callable[[], float] = lambda: 0.0,
+    ):
+        """
+        Args:
+            process: Child to watch
+            policy: Limits to enforce
+            duration: Expected output length (None if unknown)
+            progress: Current encoded timestamp in seconds
+            paused_seconds: Time the run has spent paused so far
+        """
+        self.process = process
+        self.policy = policy
+        self.limit = policy.time_limit(duration)
+        self.progress = progress
+        self.paused_seconds = paused_seconds
+        self.reason: Optional[str] = None  # Why the child was killed
+        self.last_sample: Optional[ProcessSample] = None
+        self.peak_rss = 0
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name='ffmpeg-watchdog', daemon=True)
+
+    def _watch(self) -> None:
+        start = time.monotonic()
+        paused_at_start = self.paused_seconds()
+        last_out_time = self.progress()
+        last_progress = 0.0
+        cpu_at_progress: Optional[float] = None  # CPU time when progress last moved
+
+        while not self._done.wait(self.policy.sample_interval):
+            # Active time: wall time minus the user's pauses
+            active = time.monotonic() - start - (self.paused_seconds() - paused_at_start)
+            sample = sample_process(self.process.pid)
+            if sample is not None:
+                self.last_sample = sample
+                self.peak_rss = max(self.peak_rss, sample.rss_bytes)
+                if cpu_at_progress is None:
+                    cpu_at_progress = sample.cpu_seconds
+
+            out_time = self.progress()
+            if out_time > last_out_time:
+                last_out_time, last_progress = out_time, active
+                if sample is not None:
+                    cpu_at_progress = sample.cpu_seconds
+
+            if self.limit is not None and active > self.limit:
+                self._kill(f"superó el límite de {self.limit:.0f} s")
+                return
+            stalled = active - last_progress
+            if self.policy.stall_seconds <= 0 or stalled <= self.policy.stall_seconds:
+                continue
+
+            # CPU used since the last progress, as a share of one core
+            busy = None
+            if sample is not None and cpu_at_progress is not None and stalled > 0:
+                busy = (sample.cpu_seconds - cpu_at_progress) / stalled
+            if busy is None:
+                self._kill(f"sin progreso durante {stalled:.0f} s")
+                return
+            if busy < BUSY_CPU_SHARE:
+                self._kill(f"sin progreso durante {stalled:.0f} s, bloqueado ({busy:.0%} de CPU)")
+                return
+            if stalled > self.policy.stall_seconds * self.policy.busy_stall_factor:
+                self._kill(f"sin progreso durante {stalled:.0f} s con la CPU ocupada ({busy:.0%})")
+                return
+
+    def _kill(self, reason: str) -> None:
+        if self.last_sample is not None:
+            reason += (f" (CPU {self.last_sample.cpu_seconds:.0f} s, "
+                       f"memoria {self.peak_rss / 1024 ** 2:.0f} MB)")
+        self.reason = reason
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+
+    def start(self) -> 'Watchdog':
+        """Start watching in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching (the child has exited)."""
+        self._done.set()
+        self._thread.join()
+
+
+__all__ = [
+    'BUSY_CPU_SHARE',
+    'BUSY_STALL_FACTOR',
+    'DEFAULT_IO_CLASS',
+    'DEFAULT_IO_LEVEL',
+    'DEFAULT_NICE',
+    'DEFAULT_STALL_SECONDS',
+    'ProcessHung',
+    'ProcessSample',
+    'SupervisorPolicy',
+    'Watchdog',
+    'apply_priority',
+    'ionice_args',
+    'sample_process',
+]
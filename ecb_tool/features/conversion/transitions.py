@@ -0,0 +1,182 @@
+"""Fade and crossfade filter graphs for a job.
+
+The fade settings are compiled once per job into a ``TransitionPlan``. The
+plan records where each beat starts once BPV beats overlap, and the time
+window of every audio and video fade. It is then applied to the graph of the
+job's single encode: acrossfade between beats, and afade and fade filters
+limited to their windows. No setting adds an encode pass.
+
+When the cover loop is stream-copied from cached segments, only the fade
+windows are encoded. They become short cached clips that ``video_timeline``
+splices between stretches of the copied loop.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import ffmpeg
+
+from ecb_tool.features.conversion.models import ConversionConfig
+
+
+@dataclass(frozen=True)
+class Fade:
+    """One fade window: 'in' rises from black/silence, 'out' falls to it."""
+
+    kind: str
+    start: float
+    duration: float
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+@dataclass
+class TransitionPlan:
+    """Timing of every transition in one job's output."""
+
+    duration: Optional[float]  # Output length; None if a beat could not be probed
+    crossfade: float = 0.0  # Audio overlap between consecutive beats
+    audio_fades: List[Fade] = field(default_factory=list)
+    video_fades: List[Fade] = field(default_factory=list)
+
+    @property
+    def filters_audio(self) -> bool:
+        """True if the audio must go through a filter graph (no stream copy)."""
+        return bool(self.crossfade or self.audio_fades)
+
+
+def _on_frames(seconds: float, fps: int) -> float:
+    """Round to a whole number of frames, so video fades start on a frame."""
+    return round(seconds * fps) / fps
+
+
+def _edge_fades(total: Optional[float], fade_in: float, fade_out: float) -> List[Fade]:
+    """Fades at the start and end, each at most half the output long."""
+    fades = []
+    if total is not None:
+        fade_in = min(fade_in, total / 2)
+        fade_out = min(fade_out, total / 2)
+    if fade_in > 0:
+        fades.append(Fade('in', 0.0, fade_in))
+    if fade_out > 0 and total is not None:
+        fades.append(Fade('out', total - fade_out, fade_out))
+    return fades
+
+
+def plan_transitions(config: ConversionConfig, durations: Optional[List[float]],
+                     beats: int = 1) -> TransitionPlan:
+    """
+    Compile the fade settings of ``config`` for one job.
+
+    Args:
+        config: Conversion settings
+        durations: Length of each beat, in order; None if any is unknown.
+            Without durations only the fades that need no timing (fade ins
+            and the crossfade itself) are planned.
+        beats: Number of beats, used when durations is None
+
+    Returns:
+        The plan; fades that do not fit (windows longer than half the output,
+        dips overlapping another fade) are shortened or dropped
+    """
+    if durations is not None:
+        beats = len(durations)
+    total = sum(durations) if durations is not None else None
+    if not config.enable_fades:
+        return TransitionPlan(duration=total)
+
+    crossfade = 0.0
+    if beats > 1 and config.audio_crossfade_duration > 0:
+        crossfade = config.audio_crossfade_duration
+        if durations is not None:
+            # acrossfade fails if the overlap is longer than a beat
+            crossfade = min(crossfade, min(durations) / 2)
+
+    starts = []
+    if durations is not None:
+        position = 0.0
+        for length in durations:
+            starts.append(position)
+            position += length - crossfade
+        total = position + crossfade
+
+    plan = TransitionPlan(
+        duration=total,
+        crossfade=crossfade,
+        audio_fades=_edge_fades(total, config.audio_fade_in_duration,
+                                config.audio_fade_out_duration),
+    )
+
+    fps = config.effective_fps
+    if total is not None:
+        total = _on_frames(total, fps)
+    video_fades = _edge_fades(total, _on_frames(config.fade_in_duration, fps),
+                              _on_frames(config.fade_out_duration, fps))
+
+    # Dip to black at each beat change, centered on the middle of the crossfade
+    half = _on_frames(config.fade_transition_duration / 2, fps)
+    if half > 0 and total is not None:
+        for start in starts[1:]:
+            middle = _on_frames(start + crossfade / 2, fps)
+            dip = [Fade('out', middle - half, half), Fade('in', middle, half)]
+            if all(other.end <= dip[0].start or other.start >= dip[1].end
+                   for other in video_fades):
+                video_fades.extend(dip)
+
+    plan.video_fades = sorted(video_fades, key=lambda fade: fade.start)
+    return plan
+
+
+def crossfade_streams(streams: list, seconds: float):
+    """Chain ``streams`` with acrossfade, each overlapping the next by ``seconds``."""
+    joined = streams[0]
+    for stream in streams[1:]:
+        joined = ffmpeg.filter([joined, stream], 'acrossfade', d=round(seconds, 3))
+    return joined
+
+
+def apply_fades(stream, fades: List[Fade], filter_name: str = 'fade'):
+    """
+    Add one fade filter per window; frames outside every window pass untouched.
+
+    Args:
+        stream: ffmpeg-python stream
+        fades: Windows to apply
+        filter_name: 'fade' for video, 'afade' for audio
+    """
+    for fade in fades:
+        stream = stream.filter(filter_name, t=fade.kind,
+                               st=round(fade.start, 3), d=round(fade.duration, 3))
+    return stream
+
+
+def video_timeline(plan: TransitionPlan) -> List[Tuple[str, float]]:
+    """
+    Pieces of a stream-copied video with the plan's video fades.
+
+    Returns:
+        (kind, seconds) in playback order; kind is 'loop' for plain cover,
+        or 'in'/'out' for a clip fading from or to black
+    """
+    pieces = []
+    position = 0.0
+    for fade in plan.video_fades:
+        if fade.start > position:
+            pieces.append(('loop', fade.start - position))
+        pieces.append((fade.kind, fade.duration))
+        position = fade.end
+    if plan.duration is not None and plan.duration > position:
+        pieces.append(('loop', plan.duration - position))
+    return pieces
+
+
+__all__ = [
+    'Fade',
+    'TransitionPlan',
+    'apply_fades',
+    'crossfade_streams',
+    'plan_transitions',
+    'video_timeline',
+]
@@ -0,0 +1,228 @@
+"""Audio-reactive spectrum bars rendered with NumPy.
+
+A separate ffmpeg process decodes the beats to mono PCM. Spectra are computed
+for a batch of frames at a time (one strided window view and one FFT per
+batch), bars are drawn over the preprocessed cover into a preallocated frame
+buffer, and each raw RGB frame is written straight to the encoder's stdin.
+Rendering a frame allocates nothing; only the per-batch FFT does.
+
+NumPy is optional. Without it the converter keeps using the looped cover.
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:  # Optional: pip install numpy
+    np = None
+
+
+# Analysis rate; divisible by the usual frame rates (24, 25, 30, 48, 50, 60)
+SAMPLE_RATE = 24000
+
+FFT_SIZE = 2048
+
+# Frequency range spread over the bars, log-spaced
+MIN_FREQUENCY = 40.0
+MAX_FREQUENCY = 12000.0
+
+# Level shown as an empty bar, in dB below full scale
+FLOOR_DB = -60.0
+
+# Share of its height a bar keeps from one frame to the next when the level drops
+DECAY = 0.85
+
+# Frames analyzed per FFT batch, in seconds of video
+BATCH_SECONDS = 2
+
+BAR_COUNT = 64
+BAR_COLOR = (36, 234, 255)
+BAR_GAP = 0.25  # Share of each bar's slot left empty
+BARS_HEIGHT = 0.3  # Share of the frame height the tallest bar reaches
+BARS_MARGIN = 0.05  # Space below the bars, as a share of the frame height
+
+
+def is_available() -> bool:
+    """True if NumPy is installed and the visualizer can run."""
+    return np is not None
+
+
+def band_matrix(sample_rate: int, fft_size: int, bands: int) -> "np.ndarray":
+    """
+    Matrix averaging FFT bins into log-spaced bands.
+
+    Returns:
+        Array of shape (bands, fft_size // 2 + 1)
+    """
+    n_bins = fft_size // 2 + 1
+    frequencies = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+    edges = np.geomspace(MIN_FREQUENCY, min(MAX_FREQUENCY, sample_rate / 2), bands + 1)
+
+    matrix = np.zeros((bands, n_bins), dtype=np.float32)
+    for band in range(bands):
+        selected = (frequencies >= edges[band]) & (frequencies < edges[band + 1])
+        if not selected.any():
+            # Low bands are narrower than a bin: use the nearest one
+            center = np.sqrt(edges[band] * edges[band + 1])
+            selected = np.abs(frequencies - center) == np.abs(frequencies - center).min()
+        matrix[band, selected] = 1.0 / selected.sum()
+    return matrix
+
+
+class SpectrumAnalyzer:
+    """Turns PCM into smoothed bar levels (0-1), one row per video frame."""
+
+    def __init__(self, fps: int, sample_rate: int = SAMPLE_RATE,
+                 fft_size: int = FFT_SIZE, bands: int = BAR_COUNT):
+        if sample_rate % fps:
+            raise ValueError(f"{fps} fps does not divide the {sample_rate} Hz analysis rate")
+        self.hop = sample_rate // fps
+        self.fft_size = fft_size
+        self.window = np.hanning(fft_size).astype(np.float32)
+        # A full-scale sine reads as 0 dB
+        self.scale = 2.0 / self.window.sum()
+        self.bands = band_matrix(sample_rate, fft_size, bands).T
+        self.levels = np.zeros(bands, dtype=np.float32)
+        # Samples before the current batch that the first windows still cover
+        self.history = np.zeros(max(0, fft_size - self.hop), dtype=np.float32)
+
+    def analyze(self, pcm: "np.ndarray") -> "np.ndarray":
+        """
+        Levels for the frames covered by ``pcm``.
+
+        Args:
+            pcm: Mono float32 samples, a whole number of frames long
+
+        Returns:
+            Array of shape (frames, bands); each frame's window ends where the
+            frame ends
+        """
+        frames = len(pcm) // self.hop
+        buffer = np.concatenate((self.history, pcm[:frames * self.hop]))
+        if self.history.size:
+            self.history = buffer[-self.history.size:].copy()
+
+        first = self.history.size + self.hop - self.fft_size
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.fft_size)
+        windows = windows[first::self.hop][:frames]
+
+        spectrum = np.abs(np.fft.rfft(windows * self.window, axis=1)) * self.scale
+        decibels = 20.0 * np.log10(spectrum @ self.bands + 1e-9)
+        raw = np.clip((decibels - FLOOR_DB) / -FLOOR_DB, 0.0, 1.0).astype(np.float32)
+
+        # Bars jump up at once and fall back gradually
+        for row in raw:
+            np.multiply(self.levels, DECAY, out=self.levels)
+            np.maximum(row, self.levels, out=self.levels)
+            row[:] = self.levels
+        return raw
+
+
+class BarRenderer:
+    """Draws spectrum bars over a background into one reused frame buffer."""
+
+    def __init__(self, background: "np.ndarray", bars: int = BAR_COUNT):
+        self.background = np.ascontiguousarray(background, dtype=np.uint8)
+        self.frame = np.empty_like(self.background)
+        height, width = self.background.shape[:2]
+
+        self.bar_height = max(1, int(height * BARS_HEIGHT))
+        bottom = height - int(height * BARS_MARGIN)
+        self.region = self.frame[bottom - self.bar_height:bottom]
+
+        # Which bar each pixel column belongs to, and whether it is a gap
+        slot = np.arange(width) * bars / width
+        self.column_bar = slot.astype(np.intp)
+        self.column_gap = (slot - self.column_bar) >= (1.0 - BAR_GAP)
+
+        self.rows = np.arange(self.bar_height, dtype=np.float32)[:, None]
+        self.column_level = np.empty(width, dtype=np.float32)
+        self.mask = np.empty((self.bar_height, width), dtype=bool)
+        self.color = np.array(BAR_COLOR, dtype=np.uint8)
+
+    def render(self, levels: "np.ndarray") -> "np.ndarray":
+        """
+        Draw one frame.
+
+        Returns:
+            The shared frame buffer; it is overwritten by the next call
+        """
+        np.copyto(self.frame, self.background)
+
+        # Row where each column's bar starts; gaps start below the region
+        np.take(levels, self.column_bar, out=self.column_level)
+        np.multiply(self.column_level, -self.bar_height, out=self.column_level)
+        np.add(self.column_level, self.bar_height, out=self.column_level)
+        np.copyto(self.column_level, self.bar_height, where=self.column_gap)
+
+        np.greater_equal(self.rows, self.column_level, out=self.mask)
+        np.copyto(self.region, self.color, where=self.mask[..., None])
+        return self.frame
+
+
+def _read_samples(stream: BinaryIO, buffer: "np.ndarray") -> int:
+    """Fill ``buffer`` from a pipe; returns the number of samples read."""
+    view = memoryview(buffer).cast('B')
+    filled = 0
+    while filled < len(view):
+        count = stream.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled // buffer.itemsize
+
+
+def load_background(cover: Path) -> "np.ndarray":
+    """Cover as an RGB array; it must already have the video's size."""
+    with Image.open(cover) as img:
+        return np.asarray(img.convert('RGB'))
+
+
+def render_stream(pcm: BinaryIO, background: "np.ndarray", fps: int, sink: BinaryIO) -> int:
+    """
+    Render bars for all the PCM in ``pcm`` and write raw RGB24 frames to ``sink``.
+
+    Args:
+        pcm: Mono float32 little-endian samples at SAMPLE_RATE
+        background: Frame-sized RGB image the bars are drawn on
+        fps: Video frame rate
+        sink: Encoder input (raw video)
+
+    Returns:
+        Number of frames written
+    """
+    analyzer = SpectrumAnalyzer(fps)
+    renderer = BarRenderer(background)
+    batch = np.empty(analyzer.hop * fps * BATCH_SECONDS, dtype=np.float32)
+    written = 0
+
+    while True:
+        count = _read_samples(pcm, batch)
+        if not count:
+            break
+        # Pad the last partial frame with silence
+        frames = -(-count // analyzer.hop)
+        batch[count:frames * analyzer.hop] = 0.0
+
+        for levels in analyzer.analyze(batch[:frames * analyzer.hop]):
+            sink.write(renderer.render(levels).data)
+        written += frames
+
+        if count < len(batch):
+            break
+    return written
+
+
+__all__ = [
+    'BAR_COUNT',
+    'SAMPLE_RATE',
+    'BarRenderer',
+    'SpectrumAnalyzer',
+    'band_matrix',
+    'is_available',
+    'load_background',
+    'render_stream',
+]
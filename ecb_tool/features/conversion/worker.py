@@ -1,7 +1,9 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 from ecb_tool.core.paths import get_paths
+from ecb_tool.features.conversion.cancellation import CancellationToken
 from ecb_tool.features.conversion.converter import VideoConverter
 from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+from ecb_tool.features.conversion.pool import ConversionPool, resolve_pool_size, threads_per_job
 from pathlib import Path
 
 class ConversionWorker(QThread):
@@ -15,32 +17,44 @@ class ConversionWorker(QThread):
         self.config = config
         self.jobs = jobs
         self.stop_requested = False
+        self.cancel_token = CancellationToken()
         
     def run(self):
         self.log_signal.emit("🚀 Starting conversion process...")
         
-        converter = VideoConverter(self.config, on_progress=self._on_progress_callback)
+        workers = resolve_pool_size(self.config.batch_size)
+        if self.config.threads <= 0:
+            self.config.threads = threads_per_job(workers)
+        
+        converter = VideoConverter(self.config, on_progress=self._on_progress_callback,
+                                   cancel_token=self.cancel_token)
+        pool = ConversionPool(converter, workers, should_stop=lambda: self.cancel_token.cancelled,
+                              should_pause=lambda: self.cancel_token.paused)
+        pool.run(self.jobs, on_start=self._on_job_started, on_done=self._on_job_done)
         
-        for job in self.jobs:
-            if self.stop_requested:
-                break
-                
-            self.status_signal.emit(job.id, "Processing")
-            self.log_signal.emit(f"Processing job: {job.id}")
-            
-            success = converter.convert(job)
-            
-            status = "Completed" if success else "Failed"
-            self.status_signal.emit(job.id, status)
-            
-            if success:
-                self.progress_signal.emit(job.id, 100.0)
-            
         self.log_signal.emit("✅ Process finished.")
         self.finished_signal.emit()
 
+    def _on_job_started(self, job):
+        self.status_signal.emit(job.id, "Processing")
+        self.log_signal.emit(f"Processing job: {job.id}")
+    
+    def _on_job_done(self, job, success):
+        status = "Completed" if success else ("Cancelled" if job.status == "cancelled" else "Failed")
+        self.status_signal.emit(job.id, status)
+        
+        if success:
+            self.progress_signal.emit(job.id, 100.0)
+
     def _on_progress_callback(self, job_id, percent):
         self.progress_signal.emit(job_id, percent)
 
     def stop(self):
         self.stop_requested = True
+        self.cancel_token.cancel()
+
+    def pause(self):
+        self.cancel_token.pause()
+
+    def resume(self):
+        self.cancel_token.resume()
@@ -28,15 +28,44 @@ class SettingsManager:
                 },
                 "conversion": {
                     "bpv": 1,
+                    "duracion_min_minutos": 0,
+                    "duracion_max_minutos": 0,
                     "lotes": 2,
+                    "lotes_adaptativo": True,
+                    "lotes_min": 1,
+                    "lotes_max": 0,
+                    "tramos_desde_minutos": 20,
+                    "tramos_minutos": 5,
                     "resolucion": "1920x1080",
                     "fps": 30,
                     "bitrate_video": "2M",
                     "bitrate_audio": "192k",
                     "formato_video": "mp4",
+                    "perfil_video": "standard",
+                    "preset": "medium",
+                    "crf": None,
+                    "objetivo_tiempo_real": 8.0,
+                    "variantes": [],
+                    "reutilizar_segmentos_portada": True,
+                    "preprocesar_portadas": True,
+                    "fuente_video": "cover",
+                    "omitir_actualizados": True,
+                    "reserva_disco_gb": 2.0,
+                    "prioridad_nice": 10,
+                    "prioridad_io_clase": 2,
+                    "prioridad_io_nivel": 7,
+                    "bloqueo_segundos": 120,
+                    "reintentos_bloqueo": 1,
                     "formato_audio": "aac",
-                    "fade_in_duration": 2.0,
-                    "fade_out_duration": 2.0,
+                    "normalizar_volumen": False,
+                    "loudness_objetivo": -14.0,
+                    "ajuste_volumen_db": 0.0,
+                    "fade_in_video": {"activo": True, "duracion": 2},
+                    "fade_out_video": {"activo": True, "duracion": 2},
+                    "fade_transicion_video": {"activo": True, "duracion": 1},
+                    "fade_in_audio": {"activo": True, "duracion": 2},
+                    "fade_out_audio": {"activo": True, "duracion": 2},
+                    "fade_transicion_audio": {"activo": False, "duracion": 0},
                     "enable_fades": True,
                     "autoborrado_beats": False,
                     "autoborrado_portadas": False,
@@ -2,13 +2,46 @@
 import os
 import json
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QPushButton, QSpinBox
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
+from ecb_tool.core.paths import get_paths
 from ecb_tool.core.shared.screen_utils import get_screen_adapter
 from ecb_tool.core.shared.file_validator import get_file_validator
 from ecb_tool.core.shared.paths import ORDER_PATH, PARAR_PATH
 from ecb_tool.features.ui.legacy_src.application.process_controller import ProcessController
 from ecb_tool.features.ui.pieces.text import header_text, body_text
+from ecb_tool.features.conversion.planner import format_bytes, format_duration
+
+
+class PlanWorker(QThread):
+    """Calcula la previsión de la ejecución fuera del hilo de la interfaz."""
+    planned = pyqtSignal(object)  # RunPlan
+    failed = pyqtSignal(str)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.orders = 1
+        self.bpv = 1
+        self._runner = None
+        self._settings_stamp = None
+    
+    def _runner_for_settings(self):
+        """Runner de la previsión; solo se reconstruye si cambian los ajustes de conversión."""
+        from ecb_tool.features.conversion.runner import ConversionRunner
+        settings = get_paths().conversion_config
+        stamp = settings.stat().st_mtime_ns if settings.exists() else None
+        if self._runner is None or stamp != self._settings_stamp:
+            self._runner = ConversionRunner()
+            self._settings_stamp = stamp
+        return self._runner
+    
+    def run(self):
+        try:
+            plan = self._runner_for_settings().plan(self.orders, self.bpv)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.planned.emit(plan)
 
 
 class ConversionControl(QWidget):
@@ -77,6 +110,11 @@ class ConversionControl(QWidget):
         self.max_value = max_widget.findChild(QLabel, "value")
         stats_grid.addWidget(max_widget)
         
+        # Tiempo previsto
+        eta_widget = self._create_stat_widget("⏱️", "Previsto", "-")
+        self.eta_value = eta_widget.findChild(QLabel, "value")
+        stats_grid.addWidget(eta_widget)
+        
         stats_grid.addStretch()
         layout.addLayout(stats_grid)
         
@@ -139,6 +177,28 @@ class ConversionControl(QWidget):
         
         controls.addStretch()
         
+        # Botón PAUSA/REANUDAR (solo durante la conversión)
+        self.pause_button = QPushButton("⏸ PAUSAR")
+        self.pause_button.setObjectName("conversion_pause_btn")
+        self.pause_button.setMinimumHeight(self.screen_adapter.scale(50))
+        self.pause_button.setFont(QFont("Segoe UI", self.screen_adapter.get_font_size(14), QFont.Weight.Bold))
+        self.pause_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.pause_button.setStyleSheet("""
+            QPushButton#conversion_pause_btn {
+                background-color: #23304a;
+                color: #f4f8ff;
+                border: 1px solid #3998ff;
+                border-radius: 12px;
+                padding: 12px 20px;
+            }
+            QPushButton#conversion_pause_btn:hover {
+                background-color: #2d3e5c;
+            }
+        """)
+        self.pause_button.clicked.connect(self._toggle_pause)
+        self.pause_button.setVisible(False)
+        controls.addWidget(self.pause_button)
+        
         # Botón RUN/STOP
         self.run_button = QPushButton("▶ CONVERTIR")
         self.run_button.setObjectName("conversion_run_btn")
@@ -176,6 +236,11 @@ class ConversionControl(QWidget):
         self.validation_label = body_text("", color="#8ad6ff", alignment=Qt.AlignmentFlag.AlignLeft)
         self.validation_label.setStyleSheet("color: #8ad6ff; font-size: 12px;")
         layout.addWidget(self.validation_label)
+        
+        # Previsión de la ejecución
+        self.plan_label = body_text("", color="#8ad6ff", alignment=Qt.AlignmentFlag.AlignLeft)
+        self.plan_label.setStyleSheet("color: #8ad6ff; font-size: 12px;")
+        layout.addWidget(self.plan_label)
     
     def _create_stat_widget(self, icon, label, value):
         """Crea un widget de estadística compacto."""
@@ -221,6 +286,53 @@ class ConversionControl(QWidget):
         self.monitor_timer.timeout.connect(self._update_state)
         self.monitor_timer.start(500)
         self._update_state()
+        
+        # La previsión sondea los beats: se calcula en segundo plano y se
+        # refresca con menos frecuencia
+        self.plan_worker = PlanWorker(self)
+        self.plan_worker.planned.connect(self._show_plan)
+        self.plan_worker.failed.connect(self._plan_failed)
+        self.plan_worker.finished.connect(self._plan_finished)
+        self._plan_pending = False
+        self.plan_timer = QTimer(self)
+        self.plan_timer.timeout.connect(self._update_plan)
+        self.plan_timer.start(10000)
+        self._update_plan()
+    
+    def _update_plan(self):
+        """Pide la previsión de tiempo, espacio y subida de la ejecución."""
+        if self.plan_worker.isRunning():
+            # Se recalcula al terminar, con los valores de entonces
+            self._plan_pending = True
+            return
+        self.plan_worker.orders = self.orders_spin.value()
+        self.plan_worker.bpv = self.bpv_spin.value()
+        self.plan_worker.start()
+    
+    def _plan_finished(self):
+        if self._plan_pending:
+            self._plan_pending = False
+            self._update_plan()
+    
+    def _plan_failed(self, message):
+        self.eta_value.setText("-")
+        self.plan_label.setText(f"⚠️ Sin previsión: {message}")
+    
+    def _show_plan(self, plan):
+        """Muestra la previsión calculada."""
+        if plan.jobs == 0:
+            self.eta_value.setText("-")
+            self.plan_label.setText("")
+            return
+        
+        self.eta_value.setText(format_duration(plan.wall_seconds))
+        text = (f"🔮 {plan.jobs} videos · {format_duration(plan.wall_seconds)} de conversión · "
+                f"{format_bytes(plan.output_bytes)} · {format_duration(plan.upload_seconds)} de subida")
+        if plan.unknown_durations:
+            text += f" · {plan.unknown_durations} sin duración"
+        if not plan.calibrated:
+            text += " (estimación sin calibrar)"
+        self.plan_label.setText(text)
     
     def _update_state(self):
         """Actualiza el estado del control."""
@@ -245,7 +357,8 @@ class ConversionControl(QWidget):
         
         # Validación
         if not conversion['ready']:
-            self.validation_label.setText(f"⚠️ Faltan recursos para convertir")
+            missing = ", ".join(conversion['missing'])
+            self.validation_label.setText(f"⚠️ Faltan recursos para convertir: {missing}")
             self.validation_label.setStyleSheet("color: #ff9500; font-size: 12px;")
             self.run_button.setEnabled(False)
         else:
@@ -255,8 +368,12 @@ class ConversionControl(QWidget):
         
         # Check si está ejecutando
         is_running = self._is_conversion_running()
+        self.pause_button.setVisible(is_running)
         if is_running:
-            self.status_indicator.setStyleSheet("color: #24eaff; font-size: 20px;")
+            is_paused = self.controller.is_paused()
+            self.pause_button.setText("▶ REANUDAR" if is_paused else "⏸ PAUSAR")
+            indicator = "#ff9500" if is_paused else "#24eaff"
+            self.status_indicator.setStyleSheet(f"color: {indicator}; font-size: 20px;")
             self.run_button.setText("⏹ DETENER")
             self.run_button.setStyleSheet("""
                 QPushButton#conversion_run_btn {
@@ -311,11 +428,13 @@ class ConversionControl(QWidget):
         """Actualiza órdenes en config."""
         self._update_config({'ordenes': value})
         self._update_state()
+        self._update_plan()
     
     def _on_bpv_changed(self, value):
         """Actualiza BPV en config."""
         self._update_config({'bpv': value})
         self._update_state()
+        self._update_plan()
     
     def _update_config(self, updates):
         """Actualiza el archivo de configuración."""
@@ -355,6 +474,14 @@ class ConversionControl(QWidget):
         
         QTimer.singleShot(200, self._update_state)
     
+    def _toggle_pause(self):
+        """Pausa o reanuda la conversión en curso."""
+        if self.controller.is_paused():
+            self.controller.resume()
+        else:
+            self.controller.pause()
+        self._update_state()
+    
     def _update_config(self, updates):
         """Actualiza el archivo de configuración."""
         try:
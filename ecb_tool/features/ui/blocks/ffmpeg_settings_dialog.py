@@ -2,20 +2,56 @@ import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QSpinBox, QDoubleSpinBox, QComboBox, QCheckBox, 
                              QPushButton, QGroupBox, QGridLayout, QScrollArea, QWidget)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from ecb_tool.core.shared.screen_utils import get_screen_adapter
 from ecb_tool.core.config import ConfigManager
+from ecb_tool.core.paths import get_paths
 from ecb_tool.core.shared.paths import ROOT_DIR
+from ecb_tool.features.conversion.cancellation import CancellationToken, Cancelled
+from ecb_tool.features.conversion.converter import VideoConverter, compare_profiles
+from ecb_tool.features.conversion.models import AUTO_PRESET, ConversionConfig, ENCODE_PROFILES, X264_PRESETS
 
 CONVERSION_CONFIG_PATH = os.path.join(ROOT_DIR, 'config', 'ajustes_conversion.json')
 
+# Valor del selector de CRF que lo desactiva (se guarda como null)
+CRF_OFF = -1
+
+
+class CompareWorker(QThread):
+    """Worker thread para las codificaciones de prueba de los perfiles."""
+    compared = pyqtSignal(dict)  # perfil -> medidas
+    failed = pyqtSignal(str)  # mensaje; vacío si se canceló
+    
+    def __init__(self, config, beat, cover, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.beat = beat
+        self.cover = cover
+        self.cancel_token = CancellationToken()
+    
+    def cancel(self):
+        """Detiene la comparación y mata la codificación en curso."""
+        self.cancel_token.cancel()
+    
+    def run(self):
+        try:
+            results = compare_profiles(self.config, self.beat, self.cover, list(ENCODE_PROFILES),
+                                       cancel=self.cancel_token)
+        except Cancelled:
+            self.failed.emit("")
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.compared.emit(results)
+
 
 class FFmpegSettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.screen_adapter = get_screen_adapter()
+        self.compare_worker = None  # Comparación de perfiles en curso
         
         self.setWindowTitle("Configuración de Conversión FFMPEG")
         self.setModal(True)
@@ -28,14 +64,22 @@ class FFmpegSettingsDialog(QDialog):
         schema = {
             "conversion": {
                 "bpv": 1,
+                "duracion_min_minutos": 0,
+                "duracion_max_minutos": 0,
                 "lotes": 2,
                 "resolucion": "1920x1080",
                 "fps": 30,
                 "bitrate_video": "2M",
                 "formato_video": "mp4",
+                "perfil_video": "standard",
+                "reutilizar_segmentos_portada": True,
+                "preprocesar_portadas": True,
+                "fuente_video": "cover",
                 "bitrate_audio": "192k",
                 "formato_audio": "aac",
                 "ajuste_volumen_db": 0.0,
+                "normalizar_volumen": False,
+                "loudness_objetivo": -14.0,
                 "fade_in_video": {"activo": True, "duracion": 2},
                 "fade_out_video": {"activo": True, "duracion": 2},
                 "fade_transicion_video": {"activo": True, "duracion": 1},
@@ -50,7 +94,7 @@ class FFmpegSettingsDialog(QDialog):
                 "enviar_portadas_papelera": False,
                 "codec_video": "libx264",
                 "preset": "medium",
-                "crf": 23,
+                "crf": None,
                 "audio_channels": 2,
                 "audio_sample_rate": 44100
             }
@@ -205,12 +249,31 @@ class FFmpegSettingsDialog(QDialog):
         
         # Lotes
         lotes_label = QLabel("Lotes paralelos:")
+        lotes_label.setToolTip("Vídeos que se convierten a la vez.\nAuto: según los núcleos de la CPU")
         self.lotes_spin = QSpinBox()
-        self.lotes_spin.setMinimum(1)
-        self.lotes_spin.setMaximum(10)
+        self.lotes_spin.setMinimum(0)
+        self.lotes_spin.setMaximum(32)
+        self.lotes_spin.setSpecialValueText("Auto")
         general_layout.addWidget(lotes_label, 0, 2)
         general_layout.addWidget(self.lotes_spin, 0, 3)
         
+        # Duración objetivo (mezclas)
+        duracion_label = QLabel("Duración por vídeo (min):")
+        duracion_label.setToolTip(
+            "Junta beats hasta que el vídeo dure entre el mínimo y el máximo.\n"
+            "Ejemplo: 28-32 para mezclas de media hora. BPV: usar BPV en su lugar"
+        )
+        self.duracion_min_spin = QSpinBox()
+        self.duracion_min_spin.setRange(0, 600)
+        self.duracion_min_spin.setSpecialValueText("BPV")
+        self.duracion_max_spin = QSpinBox()
+        self.duracion_max_spin.setRange(0, 600)
+        self.duracion_max_spin.setSpecialValueText("BPV")
+        general_layout.addWidget(duracion_label, 1, 0)
+        general_layout.addWidget(self.duracion_min_spin, 1, 1)
+        general_layout.addWidget(QLabel("hasta"), 1, 2)
+        general_layout.addWidget(self.duracion_max_spin, 1, 3)
+        
         general_group.setLayout(general_layout)
         content_layout.addWidget(general_group)
         
@@ -258,6 +321,37 @@ class FFmpegSettingsDialog(QDialog):
         self.loop_portada_check = QCheckBox("Loop de portada")
         video_layout.addWidget(self.loop_portada_check, 2, 2, 1, 2)
         
+        # Perfil de codificación
+        perfil_label = QLabel("Perfil:")
+        perfil_label.setToolTip("Portada estática: pocos fps, keyframes largos y tune stillimage.\nMucho más rápido y ligero para vídeos de una sola imagen.")
+        self.perfil_combo = QComboBox()
+        for key, profile in ENCODE_PROFILES.items():
+            self.perfil_combo.addItem(profile.label, key)
+        video_layout.addWidget(perfil_label, 3, 0)
+        video_layout.addWidget(self.perfil_combo, 3, 1)
+        
+        self.compare_btn = QPushButton("Comparar perfiles")
+        self.compare_btn.setToolTip("Codifica una muestra con cada perfil y mide velocidad y tamaño")
+        self.compare_btn.clicked.connect(self._compare_profiles)
+        video_layout.addWidget(self.compare_btn, 3, 2, 1, 2)
+        
+        self.reuse_segments_check = QCheckBox("Reutilizar segmentos de portada (sin recodificar vídeo)")
+        self.reuse_segments_check.setToolTip("Codifica cada portada una sola vez y la repite con copia de stream.\nSolo se codifica el audio de cada vídeo.")
+        video_layout.addWidget(self.reuse_segments_check, 5, 0, 1, 4)
+        
+        self.preprocess_covers_check = QCheckBox("Preprocesar portadas (redimensionar una sola vez)")
+        self.preprocess_covers_check.setToolTip("Ajusta cada portada a la resolución con bandas negras y sin transparencia\nantes de codificar, en lugar de escalarla en cada fotograma.")
+        video_layout.addWidget(self.preprocess_covers_check, 6, 0, 1, 4)
+        
+        self.visualizer_check = QCheckBox("Visualizador de espectro sobre la portada")
+        self.visualizer_check.setToolTip("Dibuja barras que siguen al audio sobre la portada (requiere NumPy).\nCodifica el vídeo completo: más lento que la portada en bucle.")
+        video_layout.addWidget(self.visualizer_check, 7, 0, 1, 4)
+        
+        self.compare_label = QLabel("")
+        self.compare_label.setWordWrap(True)
+        self.compare_label.setStyleSheet("color: #8ad6ff; font-size: 12px;")
+        video_layout.addWidget(self.compare_label, 4, 0, 1, 4)
+        
         video_group.setLayout(video_layout)
         content_layout.addWidget(video_group)
         
@@ -330,6 +424,16 @@ class FFmpegSettingsDialog(QDialog):
         audio_layout.addWidget(vol_label, 1, 0)
         audio_layout.addWidget(self.volumen_spin, 1, 1)
         
+        # Normalización de loudness
+        self.loudness_check = QCheckBox("Normalizar volumen (LUFS):")
+        self.loudness_check.setToolTip("Iguala el volumen de beats de distintos productores.\nCada beat se mide una sola vez y la medida se guarda.")
+        self.loudness_spin = QDoubleSpinBox()
+        self.loudness_spin.setMinimum(-30)
+        self.loudness_spin.setMaximum(-5)
+        self.loudness_spin.setSingleStep(0.5)
+        audio_layout.addWidget(self.loudness_check, 1, 2)
+        audio_layout.addWidget(self.loudness_spin, 1, 3)
+        
         audio_group.setLayout(audio_layout)
         content_layout.addWidget(audio_group)
         
@@ -421,16 +525,23 @@ class FFmpegSettingsDialog(QDialog):
         # Preset
         preset_label = QLabel("Preset:")
         self.preset_combo = QComboBox()
-        self.preset_combo.addItems(["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"])
+        self.preset_combo.addItems([AUTO_PRESET] + X264_PRESETS)
+        self.preset_combo.setToolTip(
+            "auto: el preset más lento que esta máquina codifica al ritmo objetivo.\n"
+            "Calibrar con: python -m ecb_tool.features.conversion.calibration"
+        )
         advanced_layout.addWidget(preset_label, 0, 2)
         advanced_layout.addWidget(self.preset_combo, 0, 3)
         
         # CRF (Calidad)
         crf_label = QLabel("CRF (Calidad):")
-        crf_label.setToolTip("0-51: menor valor = mejor calidad. Recomendado: 18-28")
+        crf_label.setToolTip("0-51: menor valor = mejor calidad. Recomendado: 18-28\n"
+                             "Desactivado: se usa el bitrate de vídeo")
         self.crf_spin = QSpinBox()
-        self.crf_spin.setMinimum(0)
+        # -1 = sin CRF: control por bitrate
+        self.crf_spin.setMinimum(CRF_OFF)
         self.crf_spin.setMaximum(51)
+        self.crf_spin.setSpecialValueText("Desactivado (bitrate)")
         advanced_layout.addWidget(crf_label, 1, 0)
         advanced_layout.addWidget(self.crf_spin, 1, 1)
         
@@ -478,6 +589,8 @@ class FFmpegSettingsDialog(QDialog):
         
         self.bpv_spin.setValue(conv.get("bpv", 1))
         self.lotes_spin.setValue(conv.get("lotes", 2))
+        self.duracion_min_spin.setValue(int(conv.get("duracion_min_minutos", 0)))
+        self.duracion_max_spin.setValue(int(conv.get("duracion_max_minutos", 0)))
         
         # Video
         res = conv.get("resolucion", "1920x1080")
@@ -497,6 +610,13 @@ class FFmpegSettingsDialog(QDialog):
         if idx >= 0:
             self.formato_video_combo.setCurrentIndex(idx)
         
+        idx = self.perfil_combo.findData(conv.get("perfil_video", "standard"))
+        if idx >= 0:
+            self.perfil_combo.setCurrentIndex(idx)
+        
+        self.reuse_segments_check.setChecked(conv.get("reutilizar_segmentos_portada", True))
+        self.preprocess_covers_check.setChecked(conv.get("preprocesar_portadas", True))
+        self.visualizer_check.setChecked(conv.get("fuente_video", "cover") == "visualizer")
         self.multiportada_check.setChecked(conv.get("multiportada", False))
         self.loop_portada_check.setChecked(conv.get("loop_portada", True))
         
@@ -525,6 +645,8 @@ class FFmpegSettingsDialog(QDialog):
             self.formato_audio_combo.setCurrentIndex(idx)
         
         self.volumen_spin.setValue(conv.get("ajuste_volumen_db", 0.0))
+        self.loudness_check.setChecked(conv.get("normalizar_volumen", False))
+        self.loudness_spin.setValue(conv.get("loudness_objetivo", -14.0))
         
         # Fades Audio
         fade_in_a = conv.get("fade_in_audio", {"activo": True, "duracion": 2})
@@ -558,7 +680,8 @@ class FFmpegSettingsDialog(QDialog):
         if idx >= 0:
             self.preset_combo.setCurrentIndex(idx)
         
-        self.crf_spin.setValue(conv.get("crf", 23))
+        crf = conv.get("crf")
+        self.crf_spin.setValue(CRF_OFF if crf is None else crf)
         
         channels = conv.get("audio_channels", 2)
         self.channels_combo.setCurrentIndex(0 if channels == 1 else 1)
@@ -567,15 +690,87 @@ class FFmpegSettingsDialog(QDialog):
         sample_map = {44100: 0, 48000: 1, 96000: 2}
         self.sample_combo.setCurrentIndex(sample_map.get(sample, 0))
     
+    def _compare_profiles(self):
+        """Mide velocidad y tamaño de cada perfil con una muestra real, en segundo plano."""
+        if self.compare_worker is not None:
+            self.compare_worker.cancel()
+            return
+        
+        paths = get_paths()
+        config = ConversionConfig(
+            beats_dir=paths.beats,
+            covers_dir=paths.covers,
+            videos_dir=paths.videos,
+            resolution=self.resolution_combo.currentText(),
+            fps=self.fps_spin.value(),
+            video_bitrate=self.bitrate_video_combo.currentText(),
+            audio_bitrate=self.bitrate_audio_combo.currentText(),
+        )
+        converter = VideoConverter(config)
+        beats = converter.list_beats()
+        covers = converter.list_covers()
+        if not beats or not covers:
+            self.compare_label.setText("⚠️ Hace falta al menos un beat y una portada para comparar")
+            return
+        
+        self.compare_label.setText("⏳ Codificando muestras...")
+        self.compare_btn.setText("Cancelar comparación")
+        self.compare_worker = CompareWorker(config, beats[0], covers[0], self)
+        self.compare_worker.compared.connect(self._show_comparison)
+        self.compare_worker.failed.connect(self._comparison_failed)
+        self.compare_worker.finished.connect(self._comparison_finished)
+        self.compare_worker.start()
+    
+    def _comparison_finished(self):
+        self.compare_btn.setText("Comparar perfiles")
+        self.compare_worker = None
+    
+    def _comparison_failed(self, message):
+        if message:
+            self.compare_label.setText(f"❌ Error al comparar: {message}")
+        else:
+            self.compare_label.setText("⏹️ Comparación cancelada")
+    
+    def _show_comparison(self, results):
+        """Muestra las medidas de cada perfil."""
+        lines = []
+        for key, result in results.items():
+            lines.append(
+                f"{ENCODE_PROFILES[key].label}: {result['elapsed']:.1f} s, "
+                f"{result['bytes'] / 1024:.0f} KB ({result['speed']:.1f}x tiempo real)"
+            )
+        
+        base, fast = results.get("standard"), results.get("static_cover")
+        if base and fast and fast['elapsed'] > 0 and base['bytes'] > 0:
+            lines.append(
+                f"→ Portada estática: {base['elapsed'] / fast['elapsed']:.1f}x más rápido, "
+                f"{(1 - fast['bytes'] / base['bytes']) * 100:.0f}% menos tamaño"
+            )
+        
+        self.compare_label.setText("\n".join(lines))
+    
+    def done(self, result):
+        """Cancela la comparación en curso al cerrar el diálogo."""
+        if self.compare_worker is not None:
+            self.compare_worker.cancel()
+            self.compare_worker.wait()
+        super().done(result)
+    
     def save_settings(self):
         """Guarda la configuración"""
         new_config = {
             "bpv": self.bpv_spin.value(),
             "lotes": self.lotes_spin.value(),
+            "duracion_min_minutos": self.duracion_min_spin.value(),
+            "duracion_max_minutos": self.duracion_max_spin.value(),
             "resolucion": self.resolution_combo.currentText(),
             "fps": self.fps_spin.value(),
             "bitrate_video": self.bitrate_video_combo.currentText(),
             "formato_video": self.formato_video_combo.currentText(),
+            "perfil_video": self.perfil_combo.currentData(),
+            "reutilizar_segmentos_portada": self.reuse_segments_check.isChecked(),
+            "preprocesar_portadas": self.preprocess_covers_check.isChecked(),
+            "fuente_video": "visualizer" if self.visualizer_check.isChecked() else "cover",
             "multiportada": self.multiportada_check.isChecked(),
             "loop_portada": self.loop_portada_check.isChecked(),
             "fade_in_video": {
@@ -593,6 +788,8 @@ class FFmpegSettingsDialog(QDialog):
             "bitrate_audio": self.bitrate_audio_combo.currentText(),
             "formato_audio": self.formato_audio_combo.currentText(),
             "ajuste_volumen_db": self.volumen_spin.value(),
+            "normalizar_volumen": self.loudness_check.isChecked(),
+            "loudness_objetivo": self.loudness_spin.value(),
             "fade_in_audio": {
                 "activo": self.fade_in_audio_check.isChecked(),
                 "duracion": self.fade_in_audio_spin.value()
@@ -611,7 +808,7 @@ class FFmpegSettingsDialog(QDialog):
             "enviar_portadas_papelera": self.papelera_portadas_check.isChecked(),
             "codec_video": self.codec_combo.currentText(),
             "preset": self.preset_combo.currentText(),
-            "crf": self.crf_spin.value(),
+            "crf": None if self.crf_spin.value() == CRF_OFF else self.crf_spin.value(),
             "audio_channels": 1 if self.channels_combo.currentIndex() == 0 else 2,
             "audio_sample_rate": [44100, 48000, 96000][self.sample_combo.currentIndex()],
             "nombre_salida_auto": True
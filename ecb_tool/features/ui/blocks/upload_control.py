@@ -6,7 +6,9 @@ from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
 from ecb_tool.core.shared.screen_utils import get_screen_adapter
 from ecb_tool.core.shared.file_validator import get_file_validator
-from ecb_tool.core.shared.paths import ORDER_PATH, ROOT_DIR
+from ecb_tool.core.shared.paths import ORDER_PATH, ROOT_DIR, VIDEOS_DIR
+from ecb_tool.core.state_manager import get_state_manager
+from ecb_tool.features.conversion.planner import format_bytes, format_duration, plan_upload
 from ecb_tool.features.ui.legacy_src.application.process_controller import ProcessController
 from ecb_tool.features.ui.pieces.text import header_text, body_text
 
@@ -22,6 +24,7 @@ class UploadControl(QWidget):
         self.screen_adapter = get_screen_adapter()
         self.controller = ProcessController()
         self.file_validator = get_file_validator()
+        self._upload_plan_key = None  # Videos y estado de la última previsión
         
         self.setStyleSheet("""
             QWidget {
@@ -82,6 +85,11 @@ class UploadControl(QWidget):
         self.scheduled_value = scheduled_widget.findChild(QLabel, "value")
         stats_grid.addWidget(scheduled_widget)
         
+        # Tiempo de subida previsto
+        eta_widget = self._create_stat_widget("⏱️", "Subida", "-")
+        self.eta_value = eta_widget.findChild(QLabel, "value")
+        stats_grid.addWidget(eta_widget)
+        
         stats_grid.addStretch()
         layout.addLayout(stats_grid)
         
@@ -217,6 +225,9 @@ class UploadControl(QWidget):
         scheduled_count = self._get_scheduled_count()
         self.scheduled_value.setText(str(scheduled_count))
         
+        # Previsión de subida
+        self._update_upload_plan()
+        
         # Autenticación
         if self._is_authenticated():
             self.auth_status.setText("✅ Autenticado")
@@ -286,6 +297,42 @@ class UploadControl(QWidget):
                 }
             """)
     
+    def _update_upload_plan(self):
+        """
+        Muestra el tiempo previsto para subir los videos en cola.
+        
+        Se llama en cada refresco (500 ms): solo se recalcula, con un stat
+        por video, cuando cambian los videos o el estado guardado.
+        """
+        try:
+            names = sorted(
+                name for name in os.listdir(VIDEOS_DIR)
+                if name.lower().endswith('.mp4') and not name.startswith('.')
+            )
+        except OSError:
+            names = []
+        state_manager = get_state_manager()
+        try:
+            state_stamp = os.stat(state_manager.state_json_path).st_mtime_ns
+        except OSError:
+            state_stamp = None
+        key = (tuple(names), state_stamp)
+        if key == self._upload_plan_key:
+            return
+        self._upload_plan_key = key
+        
+        videos = [os.path.join(VIDEOS_DIR, name) for name in names]
+        plan = plan_upload(videos, state_manager)
+        if plan.videos == 0:
+            self.eta_value.setText("-")
+            self.eta_value.setToolTip("")
+            return
+        self.eta_value.setText(format_duration(plan.seconds))
+        self.eta_value.setToolTip(
+            f"{plan.videos} videos, {format_bytes(plan.total_bytes)}"
+            + ("" if plan.calibrated else "\nVelocidad estimada: aún no se ha medido ninguna subida")
+        )
+    
     def _is_authenticated(self):
         """Verifica si está autenticado."""
         credentials_path = os.path.join(ROOT_DIR, 'oauth', 'credentials.json')
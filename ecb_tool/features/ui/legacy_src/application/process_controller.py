@@ -2,7 +2,7 @@ import os
 import sys
 import subprocess
 import threading
-from ecb_tool.core.shared.paths import ROOT_DIR, ORDER_PATH, PARAR_PATH
+from ecb_tool.core.shared.paths import ROOT_DIR, ORDER_PATH, PARAR_PATH, PAUSAR_PATH
 from ecb_tool.core.config import ConfigManager
 
 class ProcessController:
@@ -17,6 +17,7 @@ class ProcessController:
         }
         self.order_config = ConfigManager(ORDER_PATH, schema)
         self.process_thread = None
+        self.runner = None
 
     def is_running(self) -> bool:
         """Verifica si hay un proceso en ejecución."""
@@ -57,6 +58,7 @@ class ProcessController:
         
         if os.path.exists(PARAR_PATH):
             os.remove(PARAR_PATH)
+        self._clear_pause_flag()
         
         # Start conversion in background thread
         if mode.lower() in ['convertir', 'alternar', 'simultaneo']:
@@ -75,14 +77,16 @@ class ProcessController:
         """Run conversion process in background."""
         try:
             from ecb_tool.features.conversion import ConversionRunner
-            runner = ConversionRunner()
+            self.runner = ConversionRunner()
             num_orders = self.order_config.get('ordenes', 1)
-            runner.run(num_orders)
+            self.runner.run(num_orders)
         except Exception as e:
             print(f"Error en proceso de conversión: {e}")
             import traceback
             traceback.print_exc()
         finally:
+            self.runner = None
+            self._clear_pause_flag()
             # Mark process as finished
             self.order_config.config.update({'proceso': False})
             self.order_config.save()
@@ -94,3 +98,36 @@ class ProcessController:
         
         with open(PARAR_PATH, 'w', encoding='utf-8') as f:
             f.write('STOP')
+        
+        # La conversión corre en este proceso: cancelarla directamente
+        # detiene los ffmpeg en curso sin esperar a que se lea la bandera
+        runner = self.runner
+        if runner is not None:
+            runner.cancel()
+        self._clear_pause_flag()
+
+    def is_paused(self) -> bool:
+        """Verifica si el proceso en ejecución está en pausa."""
+        return os.path.exists(PAUSAR_PATH)
+
+    def pause(self) -> None:
+        """Suspende los ffmpeg en curso sin perder su progreso."""
+        with open(PAUSAR_PATH, 'w', encoding='utf-8') as f:
+            f.write('PAUSA')
+        
+        runner = self.runner
+        if runner is not None:
+            runner.pause()
+
+    def resume(self) -> None:
+        """Reanuda un proceso en pausa donde se quedó."""
+        self._clear_pause_flag()
+        
+        runner = self.runner
+        if runner is not None:
+            runner.resume()
+
+    def _clear_pause_flag(self) -> None:
+        """Elimina la bandera de pausa si existe."""
+        if os.path.exists(PAUSAR_PATH):
+            os.remove(PAUSAR_PATH)
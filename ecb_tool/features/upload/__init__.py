@@ -1,10 +1,27 @@
 """Video upload feature."""
 
-from ecb_tool.features.upload.uploader import VideoUploader
-from ecb_tool.features.upload.models import UploadConfig, UploadJob
+from importlib import import_module
+
+# Imported on first use: the YouTube client libraries are slow to load
+_EXPORTS = {
+    'VideoUploader': 'ecb_tool.features.upload.uploader',
+    'UploadConfig': 'ecb_tool.features.upload.models',
+    'UploadJob': 'ecb_tool.features.upload.models',
+    'UploadRunner': 'ecb_tool.features.upload.runner',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'VideoUploader',
     'UploadConfig',
     'UploadJob',
+    'UploadRunner',
 ]
@@ -0,0 +1,183 @@
+"""Upload runner for headless use (no Qt).
+
+Uploads the finished videos waiting in the videos folder one after the
+other. Titles are taken from the titles file and the description from the
+shared description file, as in the desktop app. An uploaded video leaves the
+queue: it is deleted or sent to the trash if configured, and moved to the
+uploaded folder otherwise, so the next run does not upload it again.
+"""
+
+import shutil
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ecb_tool.core.config import ConfigManager
+from ecb_tool.core.paths import get_paths
+from ecb_tool.core.state_manager import get_state_manager
+from ecb_tool.features.conversion.planner import format_bytes, format_duration, plan_upload
+from ecb_tool.features.upload.models import UploadConfig, UploadJob
+from ecb_tool.features.upload.uploader import VideoUploader, YouTubeAuth
+
+
+# "estado" values of the upload settings, as YouTube privacy statuses
+PRIVACY_STATUSES = {
+    "publico": "public",
+    "privado": "private",
+    "no_listado": "unlisted",
+}
+
+
+class UploadRunner:
+    """Runs the upload process based on configuration."""
+
+    def __init__(
+        self,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        interactive: bool = False,
+    ):
+        """
+        Initialize the upload runner.
+
+        Args:
+            on_event: Called with a dict for every step of a run ("plan",
+                "start", "progress", "done", "idle", "error", "summary")
+            interactive: Open a browser to sign in to YouTube when needed;
+                off by default, since the runner is meant for servers
+        """
+        self.paths = get_paths()
+        self.state_manager = get_state_manager()
+        self.on_event = on_event
+        self.should_stop = False
+        self._load_config()
+        self.uploader = VideoUploader(self.upload_config, auth=YouTubeAuth(interactive=interactive))
+
+    def _load_config(self):
+        """Load upload configuration."""
+        config_schema = {
+            "subida": {
+                "estado": "publico",
+                "autoborrado_videos": False,
+                "papelera_videos": False,
+                "contenido_niños": False,
+            }
+        }
+        settings = ConfigManager(self.paths.upload_config, config_schema).get("subida", {})
+
+        self.upload_config = UploadConfig(
+            videos_dir=self.paths.videos,
+            uploaded_dir=self.paths.uploaded,
+            privacy_status=PRIVACY_STATUSES.get(settings.get("estado", "publico"), "public"),
+            made_for_kids=settings.get("contenido_niños", False),
+            titles_file=self.paths.titles_file,
+            description_file=self.paths.description_file,
+            # Older settings files call it "autoborrado_subidos"
+            auto_delete_videos=settings.get("autoborrado_videos",
+                                            settings.get("autoborrado_subidos", False)),
+            move_to_trash=settings.get("papelera_videos", False),
+        )
+
+    def _emit(self, event: str, **fields) -> None:
+        """Report a step of the run to on_event."""
+        if self.on_event:
+            self.on_event({"event": event, **fields})
+
+    def cancel(self) -> None:
+        """Stop after the upload in progress."""
+        self.should_stop = True
+
+    def _return_title(self, title: str) -> None:
+        """Put a title taken for a failed upload back at the top of the titles file."""
+        titles_file = self.upload_config.titles_file
+        remaining = titles_file.read_text(encoding='utf-8') if titles_file.exists() else ""
+        titles_file.write_text(f"{title}\n{remaining}", encoding='utf-8')
+
+    def _archive(self, job: UploadJob) -> None:
+        """Take an uploaded video out of the queue."""
+        self.uploader.cleanup(job)
+        if job.video_file.exists():
+            self.upload_config.uploaded_dir.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(job.video_file), str(self.upload_config.uploaded_dir / job.video_file.name))
+
+    def run(self, limit: Optional[int] = None) -> None:
+        """
+        Run the upload process.
+
+        Args:
+            limit: Upload at most this many videos (None = all waiting)
+        """
+        videos = self.uploader.list_videos()
+        if limit is not None:
+            videos = videos[:limit]
+        if not videos:
+            print("✓ No hay videos para subir")
+            self._emit("idle", reason="no_videos")
+            return
+
+        plan = plan_upload(videos, self.state_manager)
+        print(f"🔮 Previsión: {plan.videos} videos, {format_bytes(plan.total_bytes)}, "
+              f"{format_duration(plan.seconds)} de subida"
+              + ("" if plan.calibrated else " (sin calibrar)"))
+        self._emit("plan", videos=plan.videos, total_bytes=plan.total_bytes,
+                   seconds=round(plan.seconds), calibrated=plan.calibrated)
+
+        # Without a valid sign-in every upload would fail the same way
+        try:
+            self.uploader.auth.authenticate()
+        except Exception as e:
+            print(f"❌ No se pudo iniciar sesión en YouTube: {e}")
+            self._emit("error", message=str(e))
+            return
+
+        completed = 0
+        failed = 0
+        run_start = time.monotonic()
+        description = self.uploader.get_description()
+
+        for index, video in enumerate(videos, 1):
+            if self.should_stop:
+                break
+
+            taken_title = self.uploader.get_next_title()
+            job = UploadJob(
+                id=f"up-{video.stem}",
+                video_file=video,
+                title=taken_title or video.stem,
+                description=description,
+            )
+            print(f"\n[{index}/{len(videos)}] Subiendo: {video.name}")
+            self._emit("start", job=job.id, video=str(video), title=job.title,
+                       index=index, total=len(videos))
+
+            success = self.uploader.upload(
+                job, on_progress=lambda percent: self._emit("progress", job=job.id, percent=percent)
+            )
+            if success:
+                print(f"✅ Subido: {job.video_id}")
+                completed += 1
+                self._archive(job)
+            else:
+                print(f"❌ Error: {job.error_message}")
+                failed += 1
+                if taken_title:
+                    self._return_title(taken_title)
+
+            self.state_manager.log_upload(
+                job_id=job.id,
+                video=video.name,
+                video_id=job.video_id or "",
+                title=job.title,
+                status=job.status,
+                error=job.error_message or "",
+            )
+            self._emit("done", job=job.id, status=job.status, video_id=job.video_id,
+                       error=job.error_message)
+
+        if self.should_stop:
+            print("\n⏹️ Proceso detenido por el usuario")
+        print(f"\n📊 Subidos: {completed}, fallidos: {failed}, "
+              f"tiempo: {format_duration(time.monotonic() - run_start)}")
+        self._emit("summary", completed=completed, failed=failed, stopped=self.should_stop,
+                   elapsed_seconds=round(time.monotonic() - run_start))
+
+
+__all__ = ['PRIVACY_STATUSES', 'UploadRunner']
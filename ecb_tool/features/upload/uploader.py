@@ -1,7 +1,8 @@
 """YouTube video uploader."""
 
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from googleapiclient.errors import HttpError
@@ -10,6 +11,8 @@ from google.auth.transport.requests import Request
 import pickle
 
 from ecb_tool.core.paths import get_paths
+from ecb_tool.core.state_manager import get_state_manager
+from ecb_tool.features.conversion.planner import record_upload
 from ecb_tool.features.upload.models import UploadConfig, UploadJob
 
 
@@ -18,9 +21,16 @@ class YouTubeAuth:
     
     SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
     
-    def __init__(self):
-        """Initialize YouTube authentication."""
+    def __init__(self, interactive: bool = True):
+        """
+        Initialize YouTube authentication.
+        
+        Args:
+            interactive: Open a browser to sign in when there is no valid
+                token; headless runs fail instead
+        """
         self.paths = get_paths()
+        self.interactive = interactive
         self.credentials = None
         self.youtube_service = None
     
@@ -39,6 +49,11 @@ class YouTubeAuth:
             if self.credentials and self.credentials.expired and self.credentials.refresh_token:
                 self.credentials.refresh(Request())
             else:
+                if not self.interactive:
+                    raise PermissionError(
+                        f"No valid YouTube token in {token_file}\n"
+                        "Sign in once from the desktop app and copy the token here"
+                    )
                 if not secrets_file.exists():
                     raise FileNotFoundError(
                         f"OAuth credentials not found: {secrets_file}\n"
@@ -62,16 +77,17 @@ class YouTubeAuth:
 class VideoUploader:
     """Handles video uploads to YouTube."""
     
-    def __init__(self, config: UploadConfig):
+    def __init__(self, config: UploadConfig, auth: Optional[YouTubeAuth] = None):
         """
         Initialize VideoUploader.
         
         Args:
             config: Upload configuration
+            auth: YouTube sign-in to use (default: interactive)
         """
         self.config = config
         self.paths = get_paths()
-        self.auth = YouTubeAuth()
+        self.auth = auth or YouTubeAuth()
     
     def list_videos(self) -> List[Path]:
         """List all available video files for upload."""
@@ -79,6 +95,7 @@ class VideoUploader:
         
         if self.config.videos_dir.exists():
             for file in self.config.videos_dir.iterdir():
+                # Videos still being written end in '.mp4.part' and are skipped
                 if file.suffix.lower() == '.mp4' and not file.name.startswith('.'):
                     videos.append(file)
         
@@ -119,12 +136,13 @@ class VideoUploader:
         except Exception:
             return ""
     
-    def upload(self, job: UploadJob) -> bool:
+    def upload(self, job: UploadJob, on_progress: Optional[Callable[[float], None]] = None) -> bool:
         """
         Upload a video to YouTube.
         
         Args:
             job: Upload job to process
+            on_progress: Called with the percentage sent after each chunk
         
         Returns:
             True if successful, False otherwise
@@ -163,10 +181,17 @@ class VideoUploader:
             )
             
             response = None
+            start = time.monotonic()
             while response is None:
                 status, response = request.next_chunk()
                 if status:
                     job.progress = int(status.progress() * 100)
+                    if on_progress:
+                        on_progress(job.progress)
+            
+            # Calibrate the upload time predicted by the run planner
+            record_upload(get_state_manager(), job.video_file.stat().st_size,
+                          time.monotonic() - start)
             
             job.status = "completed"
             job.progress = 100.0
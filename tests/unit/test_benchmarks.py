@@ -0,0 +1,40 @@
+"""Unit tests for benchmark baseline comparison."""
+
+from benchmarks.suite import BenchmarkResult, compare_reports
+
+
+def _report(**metrics):
+    result = BenchmarkResult(name="convert/standard/1920x1080/bpv1", kind="convert",
+                             params={}, media_seconds=180.0, wall_seconds=10.0,
+                             cpu_seconds=40.0, output_bytes=1000)
+    data = result.to_dict()
+    data.update(metrics)
+    return {"results": [data]}
+
+
+def test_realtime_factor():
+    """Test realtime factor is media seconds per wall second, None on failure."""
+    result = BenchmarkResult(name="x", kind="convert", params={},
+                             media_seconds=180.0, wall_seconds=12.0)
+    assert result.realtime_factor == 15.0
+
+    result.ok = False
+    assert result.realtime_factor is None
+
+
+def test_compare_flags_only_regressions_past_tolerance():
+    """Test slower, heavier or larger outputs are reported; noise and gains are not."""
+    baseline = _report()
+
+    assert compare_reports(_report(realtime_factor=17.5), baseline, 0.1) == []
+    assert compare_reports(_report(realtime_factor=30.0, cpu_seconds=20.0), baseline, 0.1) == []
+
+    regressions = compare_reports(
+        _report(realtime_factor=12.0, cpu_seconds=50.0, output_bytes=1050), baseline, 0.1
+    )
+    assert len(regressions) == 2
+    assert "realtime_factor" in regressions[0]
+    assert "cpu_seconds" in regressions[1]
+
+    failed = compare_reports(_report(ok=False, error="boom"), baseline)
+    assert failed and "failed" in failed[0]
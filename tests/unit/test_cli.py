@@ -0,0 +1,186 @@
+"""Unit tests for the headless command line and the upload runner."""
+
+import io
+import json
+import signal
+import subprocess
+import sys
+from argparse import Namespace
+
+import pytest
+
+from ecb_tool import cli
+from ecb_tool.core import paths as paths_module
+from ecb_tool.core import state_manager as state_manager_module
+from ecb_tool.core.paths import ROOT_ENV_VAR
+
+
+@pytest.fixture
+def workspace(temp_project_dir, monkeypatch):
+    """Point the global paths and state manager at a temporary project."""
+    monkeypatch.setenv(ROOT_ENV_VAR, str(temp_project_dir))
+    monkeypatch.setattr(paths_module, "_paths_instance", None)
+    monkeypatch.setattr(state_manager_module, "_state_manager", None)
+    return paths_module.get_paths()
+
+
+@pytest.fixture
+def signals():
+    """Restore the signal handlers a pipeline installs."""
+    saved = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    yield
+    for signum, handler in saved.items():
+        signal.signal(signum, handler)
+
+
+def test_json_lines_writes_one_object_per_line():
+    """Test each event is a timestamped JSON object on its own line."""
+    stream = io.StringIO()
+    emit = cli.JsonLines(stream)
+
+    emit({"event": "start", "job": "job-001", "title": "Año nuevo"})
+    emit({"event": "done", "job": "job-001"})
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["event"] == "start" and first["title"] == "Año nuevo"
+    assert "time" in first
+
+
+@pytest.mark.skipif(cli.fcntl is None, reason="Pipeline locks need fcntl")
+def test_pipeline_lock_is_exclusive(workspace):
+    """Test a second run of the same pipeline is refused, another pipeline is not."""
+    with cli.pipeline_lock("convert"):
+        assert cli.is_locked("convert")
+        assert not cli.is_locked("upload")
+        with pytest.raises(cli.AlreadyRunning):
+            with cli.pipeline_lock("convert"):
+                pass
+
+    assert not cli.is_locked("convert")
+
+
+class FakeRunner:
+    def __init__(self, on_event, failed=0):
+        self.on_event = on_event
+        self.failed = failed
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        self.on_event({"event": "summary", "completed": 1, "failed": self.failed})
+
+
+def test_pipeline_exit_code_follows_the_summary(workspace, signals):
+    """Test failed jobs give a non-zero exit code and every event is emitted."""
+    events = []
+    args = Namespace(every=None)
+
+    assert cli._run_pipeline("convert", FakeRunner, FakeRunner.run, args, events.append) == 0
+    assert events[-1]["event"] == "summary"
+    assert cli._run_pipeline("convert", lambda on_event: FakeRunner(on_event, failed=1),
+                             FakeRunner.run, args, None) == cli.EXIT_FAILED
+
+
+@pytest.mark.skipif(cli.fcntl is None, reason="Pipeline locks need fcntl")
+def test_busy_pipeline_exits_without_running(workspace, signals):
+    """Test a run that finds the pipeline locked reports it and exits."""
+    events = []
+    started = []
+
+    with cli.pipeline_lock("upload"):
+        code = cli._run_pipeline("upload", FakeRunner, started.append,
+                                 Namespace(every=None), events.append)
+
+    assert code == cli.EXIT_BUSY
+    assert events == [{"event": "busy", "pipeline": "upload"}]
+    assert started == []
+
+
+def test_status_counts_the_queues(workspace):
+    """Test the status snapshot of a project."""
+    (workspace.beats / "a.mp3").write_bytes(b"beat")
+    (workspace.beats / "b.wav").write_bytes(b"beat")
+    (workspace.beats / "notes.txt").write_text("not a beat")
+    (workspace.covers / "cover.jpg").write_bytes(b"cover")
+    (workspace.videos / "done.mp4").write_bytes(b"video")
+    (workspace.videos / "writing.mp4.part").write_bytes(b"video")
+
+    status = cli.collect_status()
+
+    assert status["root"] == str(workspace.root)
+    assert status["beats"] == 2
+    assert status["covers"] == 1
+    assert status["videos_to_upload"] == 1
+    assert status["bytes_to_upload"] == 5
+    assert status["converting"] is False
+    assert status["free_bytes"] > 0
+
+
+def test_status_command_does_not_load_qt_or_youtube(temp_project_dir):
+    """Test the CLI starts without the desktop or upload libraries."""
+    script = (
+        "import json, sys\n"
+        "from ecb_tool.cli import main\n"
+        f"main(['--root', {str(temp_project_dir)!r}, 'status', '--json'])\n"
+        "heavy = [m for m in sys.modules if m.split('.')[0] in ('PyQt6', 'googleapiclient')]\n"
+        "print(json.dumps(heavy))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    status, heavy = result.stdout.splitlines()
+    assert json.loads(status)["root"] == str(temp_project_dir)
+    assert json.loads(heavy) == []
+
+
+class FakeAuth:
+    def authenticate(self):
+        return object()
+
+
+def test_upload_runner_archives_uploads_and_returns_failed_titles(workspace):
+    """Test uploaded videos leave the queue and a failed upload keeps its title."""
+    from ecb_tool.features.upload.runner import UploadRunner
+
+    (workspace.videos / "a_video.mp4").write_bytes(b"video")
+    (workspace.videos / "b_video.mp4").write_bytes(b"video")
+    workspace.titles_file.write_text("First\nSecond\nThird\n", encoding="utf-8")
+    events = []
+    runner = UploadRunner(on_event=events.append)
+    runner.uploader.auth = FakeAuth()
+
+    def fake_upload(job, on_progress=None):
+        if job.video_file.name.startswith("a"):
+            on_progress(100.0)
+            job.status, job.video_id = "completed", "yt-123"
+            return True
+        job.status, job.error_message = "failed", "quota"
+        return False
+
+    runner.uploader.upload = fake_upload
+    runner.run()
+
+    assert not (workspace.videos / "a_video.mp4").exists()
+    assert (workspace.uploaded / "a_video.mp4").exists()
+    assert (workspace.videos / "b_video.mp4").exists()
+    assert workspace.titles_file.read_text(encoding="utf-8").split() == ["Second", "Third"]
+    names = [event["event"] for event in events]
+    assert names == ["plan", "start", "progress", "done", "start", "done", "summary"]
+    assert events[-1]["completed"] == 1 and events[-1]["failed"] == 1
+
+
+def test_upload_runner_stops_when_sign_in_fails(workspace):
+    """Test no upload is attempted without a YouTube token."""
+    from ecb_tool.features.upload.runner import UploadRunner
+
+    (workspace.videos / "a_video.mp4").write_bytes(b"video")
+    events = []
+    runner = UploadRunner(on_event=events.append)
+
+    runner.run()
+
+    assert events[-1]["event"] == "error"
+    assert (workspace.videos / "a_video.mp4").exists()
@@ -62,3 +62,115 @@ def test_video_converter_list_covers(project_paths, sample_cover):
     
     assert len(covers) == 1
     assert covers[0].name == "test_cover.jpg"
+
+
+def test_static_cover_profile_overrides_video_settings(project_paths):
+    """Test the static cover profile replaces fps and bitrate."""
+    config = ConversionConfig(
+        beats_dir=project_paths.beats,
+        covers_dir=project_paths.covers,
+        videos_dir=project_paths.videos,
+    )
+    
+    assert config.effective_fps == 30
+    assert config.effective_video_bitrate == "2M"
+    
+    config.encode_profile = "static_cover"
+    
+    assert config.profile.tune == "stillimage"
+    assert config.effective_fps == 1
+    assert config.effective_video_bitrate == "300k"
+
+
+def test_matching_beats_use_concat_demuxer(project_paths, tmp_path, monkeypatch):
+    """Test beats with the same format are spliced instead of re-encoded."""
+    import ecb_tool.core.media_index as media_index
+    
+    codecs = {"a.m4a": "aac", "b.m4a": "aac", "c.mp3": "mp3"}
+    
+    def fake_probe(filename, cmd='ffprobe', **kwargs):
+        return {
+            'format': {'duration': '10'},
+            'streams': [{'codec_type': 'audio', 'codec_name': codecs[Path(filename).name],
+                         'sample_rate': '44100', 'channels': 2, 'channel_layout': 'stereo'}],
+        }
+    
+    monkeypatch.setattr(media_index, 'run_ffprobe', fake_probe)
+    monkeypatch.setattr(media_index, '_media_index', media_index.MediaIndex(tmp_path / "index.sqlite"))
+    for name in codecs:
+        (project_paths.beats / name).write_bytes(b"audio")
+    
+    config = ConversionConfig(
+        beats_dir=project_paths.beats,
+        covers_dir=project_paths.covers,
+        videos_dir=project_paths.videos,
+        beats_per_video=2,
+    )
+    converter = VideoConverter(config)
+    
+    same = [project_paths.beats / "a.m4a", project_paths.beats / "b.m4a"]
+    mixed = [project_paths.beats / "a.m4a", project_paths.beats / "c.mp3"]
+    assert converter._audio_concat_codec(same) == "aac"
+    assert converter._audio_concat_codec(mixed) is None
+    
+    job = ConversionJob(id="1", beat_files=same, cover_file=Path("cover.jpg"),
+                        output_file=project_paths.videos / "out.mp4")
+    audio_list = tmp_path / "beats.txt"
+    args = converter._build_output(job, job.output_file, audio_list=audio_list,
+                                   copy_audio=True).get_args()
+    
+    assert str(audio_list) in args
+    assert args[args.index('-acodec') + 1] == 'copy'
+    assert not any('concat=' in arg for arg in args)
+
+
+def test_trial_speed_counts_only_the_beat_length(project_paths, monkeypatch):
+    """Test a beat shorter than the sample does not inflate the measured speed."""
+    from types import SimpleNamespace
+    from ecb_tool.features.conversion import converter as converter_module
+    
+    def fake_run(out, duration=None, **kwargs):
+        Path(next(arg for arg in out.get_args() if arg.endswith('.mp4'))).write_bytes(b"video")
+    
+    times = iter([100.0, 102.0])
+    monkeypatch.setattr(converter_module, 'run_with_progress', fake_run)
+    monkeypatch.setattr(converter_module, 'time', SimpleNamespace(perf_counter=lambda: next(times)))
+    monkeypatch.setattr(VideoConverter, 'probe_duration', lambda self, files: 4.0)
+    config = ConversionConfig(
+        beats_dir=project_paths.beats,
+        covers_dir=project_paths.covers,
+        videos_dir=project_paths.videos,
+    )
+    
+    result = VideoConverter(config).trial_encode(Path("short.mp3"), Path("cover.jpg"), seconds=15.0)
+    
+    assert result['speed'] == 2.0
+
+
+def test_profile_comparison_can_be_cancelled(project_paths, monkeypatch):
+    """Test cancelling the comparison kills the sample in progress and stops."""
+    from ecb_tool.features.conversion import converter as converter_module
+    from ecb_tool.features.conversion.cancellation import CancellationToken, Cancelled
+    from ecb_tool.features.conversion.converter import compare_profiles
+    
+    token = CancellationToken()
+    samples = []
+    
+    def fake_run(out, duration=None, cancel=None, **kwargs):
+        cancel.raise_if_cancelled()
+        samples.append(out)
+        Path(next(arg for arg in out.get_args() if arg.endswith('.mp4'))).write_bytes(b"video")
+        token.cancel()  # The user cancels during the first sample
+    
+    monkeypatch.setattr(converter_module, 'run_with_progress', fake_run)
+    monkeypatch.setattr(VideoConverter, 'probe_duration', lambda self, files: None)
+    config = ConversionConfig(
+        beats_dir=project_paths.beats,
+        covers_dir=project_paths.covers,
+        videos_dir=project_paths.videos,
+    )
+    
+    with pytest.raises(Cancelled):
+        compare_profiles(config, Path("a.mp3"), Path("cover.jpg"), ["standard", "static_cover"],
+                         cancel=token)
+    assert len(samples) == 1
@@ -0,0 +1,81 @@
+"""Unit tests for the conversion file caches."""
+
+import os
+
+from PIL import Image
+
+from ecb_tool.features.conversion.cache import FileCache
+from ecb_tool.features.conversion.covers import CoverPreprocessor, parse_resolution
+
+
+def test_cache_renders_each_key_once(project_paths):
+    """Test an entry is rendered on first use and reused afterwards."""
+    cache = FileCache(project_paths.temp / "loops", "mp4")
+    renders = []
+    
+    def render(target):
+        renders.append(target)
+        target.write_bytes(b"segment")
+    
+    first = cache.get_or_create("abc", render)
+    second = cache.get_or_create("abc", render)
+    
+    assert first == second == cache.path_for("abc")
+    assert first.read_bytes() == b"segment"
+    assert len(renders) == 1
+    assert not renders[0].exists()  # Written under a temporary name
+
+
+def test_cache_evicts_least_recently_used(project_paths):
+    """Test the cache stays under its byte budget, dropping the oldest entry."""
+    cache = FileCache(project_paths.temp / "lru", "bin", max_bytes=250)
+    
+    for i, key in enumerate(["a", "b"]):
+        path = cache.get_or_create(key, lambda target: target.write_bytes(b"x" * 100))
+        os.utime(path, (1000 + i, 1000 + i))
+    
+    cache.get_or_create("a", lambda target: None)  # Hit refreshes "a"
+    cache.get_or_create("c", lambda target: target.write_bytes(b"x" * 100))
+    
+    assert cache.path_for("a").exists()
+    assert not cache.path_for("b").exists()
+    assert cache.path_for("c").exists()
+
+
+def test_entries_pinned_by_a_running_job_are_not_evicted(project_paths):
+    """Test eviction skips entries a job still uses until it releases them."""
+    cache = FileCache(project_paths.temp / "pinned", "bin", max_bytes=150)
+    
+    old = cache.get_or_create("old", lambda target: target.write_bytes(b"x" * 100), owner="job-1")
+    os.utime(old, (1000, 1000))
+    cache.get_or_create("new", lambda target: target.write_bytes(b"x" * 100), owner="job-2")
+    assert old.exists()  # Over budget, but job-1 is still running
+    
+    FileCache.release("job-1")
+    FileCache.release("job-2")
+    cache.evict()
+    assert not old.exists()
+    assert cache.path_for("new").exists()
+
+
+def test_cover_is_letterboxed_and_flattened(project_paths):
+    """Test a large transparent PNG becomes an RGB image at the target size."""
+    source = project_paths.covers / "phone.png"
+    Image.new("RGBA", (3000, 4000), (255, 0, 0, 128)).save(source)
+    
+    preprocessor = CoverPreprocessor(project_paths.temp / "covers")
+    prepared = preprocessor.prepare(source, "1920x1080")
+    
+    with Image.open(prepared) as img:
+        assert img.size == (1920, 1080)
+        assert img.mode == "RGB"
+        assert img.getpixel((10, 540)) == (0, 0, 0)  # Letterbox bar
+    
+    assert preprocessor.prepare(source, "1920x1080") == prepared
+    assert preprocessor.prepare(source, "1280x720") != prepared
+
+
+def test_parse_resolution_rounds_to_even():
+    """Test odd sizes are made even for yuv420p."""
+    assert parse_resolution("1920x1080") == (1920, 1080)
+    assert parse_resolution("853x481") == (852, 480)
@@ -0,0 +1,98 @@
+"""Unit tests for encoder preset calibration."""
+
+from dataclasses import asdict
+from pathlib import Path
+
+from ecb_tool.features.conversion import calibration
+from ecb_tool.features.conversion.calibration import (
+    calibrate_preset,
+    calibration_key,
+    resolve_preset,
+)
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.models import AUTO_PRESET, ConversionConfig
+
+# Measured speed of each preset on an imaginary machine
+SPEEDS = {"ultrafast": 40.0, "superfast": 30.0, "veryfast": 20.0, "faster": 12.0,
+          "fast": 9.0, "medium": 6.0, "slow": 3.0}
+
+
+class FakeStateManager:
+    def __init__(self):
+        self.calibrations = {}
+
+    def get_calibration(self, key):
+        return self.calibrations.get(key)
+
+    def set_calibration(self, key, data):
+        self.calibrations[key] = data
+
+
+def _config(tmp_path, **kwargs):
+    return ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path, **kwargs)
+
+
+def _fake_trials(monkeypatch):
+    tried = []
+
+    def trial_encode(self, beat, cover, seconds=15.0):
+        tried.append(self.config.preset)
+        return {'elapsed': 1.0, 'bytes': 1000, 'speed': SPEEDS[self.config.preset]}
+
+    monkeypatch.setattr(calibration.VideoConverter, 'trial_encode', trial_encode)
+    return tried
+
+
+def test_slowest_preset_meeting_target(tmp_path, monkeypatch):
+    """Test the search keeps the slowest preset on target and stops after a miss."""
+    tried = _fake_trials(monkeypatch)
+
+    result = calibrate_preset(_config(tmp_path), Path("b.mp3"), Path("c.jpg"), target_speed=8.0)
+
+    assert result.preset == "fast"
+    assert result.meets_target
+    assert tried == ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium"]
+
+
+def test_unreachable_target_falls_back_to_fastest(tmp_path, monkeypatch):
+    """Test a machine too slow for the target gets the fastest preset."""
+    _fake_trials(monkeypatch)
+
+    result = calibrate_preset(_config(tmp_path), Path("b.mp3"), Path("c.jpg"), target_speed=100.0)
+
+    assert result.preset == "ultrafast"
+    assert not result.meets_target
+
+
+def test_auto_preset_uses_stored_calibration(tmp_path, monkeypatch):
+    """Test 'auto' resolves per settings, and to the default when uncalibrated."""
+    _fake_trials(monkeypatch)
+    state = FakeStateManager()
+    config = _config(tmp_path, preset=AUTO_PRESET, crf=23)
+
+    assert resolve_preset(config, state) is None
+    assert config.preset == "medium"
+
+    stored = calibrate_preset(config, Path("b.mp3"), Path("c.jpg"), target_speed=15.0)
+    state.set_calibration(calibration_key(config), asdict(stored))
+
+    config.preset = AUTO_PRESET
+    assert resolve_preset(config, state).preset == "veryfast"
+    assert config.preset == "veryfast"
+
+    other = _config(tmp_path, preset=AUTO_PRESET, crf=18)
+    resolve_preset(other, state)
+    assert other.preset == "medium"
+
+
+def test_preset_and_crf_reach_the_encoder(tmp_path):
+    """Test CRF mode caps the rate at the bitrate instead of targeting it."""
+    args = VideoConverter(_config(tmp_path, preset="veryfast", crf=23))._video_args(30)
+    assert args['preset'] == "veryfast"
+    assert args['crf'] == 23
+    assert args['maxrate'] == "2M"
+    assert 'video_bitrate' not in args
+
+    args = VideoConverter(_config(tmp_path, preset=AUTO_PRESET))._video_args(30)
+    assert 'preset' not in args
+    assert args['video_bitrate'] == "2M"
@@ -0,0 +1,174 @@
+"""Unit tests for cancelling and pausing conversions while ffmpeg runs."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ecb_tool.features.conversion import cancellation
+from ecb_tool.features.conversion import converter as converter_module
+from ecb_tool.features.conversion.cancellation import (
+    SUSPEND_SUPPORTED,
+    CancellationToken,
+    Cancelled,
+    StopFlagWatcher,
+)
+from ecb_tool.features.conversion.converter import VideoConverter, partial_path
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+from ecb_tool.features.conversion.pool import ConversionPool
+from ecb_tool.features.conversion.progress import run_with_progress
+
+# Child that reports progress like ffmpeg, then runs for a long time
+SLOW_CHILD = "import sys, time\nprint('out_time_us=1000000', flush=True)\ntime.sleep(30)\n"
+
+
+class FakeStream:
+    """ffmpeg-python output node stand-in that runs a Python child."""
+
+    def global_args(self, *args):
+        return self
+
+    def run_async(self, pipe_stdin=False, pipe_stdout=False, pipe_stderr=False):
+        return subprocess.Popen([sys.executable, "-c", SLOW_CHILD],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def test_cancel_kills_the_running_child():
+    """Test a cancelled token stops the encode at once, not when it ends."""
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        run_with_progress(FakeStream(), 60.0, cancel=token)
+
+    assert time.monotonic() - start < 5
+
+
+def test_cancelled_token_starts_nothing():
+    """Test no child is spawned once cancellation was requested."""
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(Cancelled):
+        run_with_progress(FakeStream(), 60.0, cancel=token)
+
+
+def test_stop_flag_cancels_the_token(tmp_path):
+    """Test the watcher turns the .parar file into a cancellation."""
+    flag = tmp_path / ".parar"
+    token = CancellationToken()
+
+    with StopFlagWatcher(flag, token, interval=0.01):
+        assert not token.wait(0.05)
+        flag.write_text("STOP")
+        assert token.wait(2)
+
+
+def test_pause_flag_pauses_the_token(tmp_path):
+    """Test the watcher pauses while .pausar exists and resumes when it is gone."""
+    pause_flag = tmp_path / ".pausar"
+    token = CancellationToken()
+
+    with StopFlagWatcher(tmp_path / ".parar", token, interval=0.01, pause_flag=pause_flag):
+        pause_flag.write_text("PAUSA")
+        time.sleep(0.1)
+        assert token.paused
+        pause_flag.unlink()
+        time.sleep(0.1)
+        assert not token.paused
+
+
+def test_cancelled_job_is_reported_and_cleaned(tmp_path, monkeypatch):
+    """Test the converter drops the partial output and marks the job cancelled."""
+    config = ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path)
+    converter = VideoConverter(config)
+    monkeypatch.setattr(converter, "probe_durations", lambda files: None)
+    job = ConversionJob(id="job-001", beat_files=[tmp_path / "a.mp3"],
+                        cover_file=tmp_path / "cover.jpg", output_file=tmp_path / "a_video.mp4")
+
+    def interrupted_run(out, duration=None, on_progress=None, **kwargs):
+        partial_path(job.output_file).write_bytes(b"half a video")
+        raise Cancelled()
+
+    monkeypatch.setattr(converter_module, "run_with_progress", interrupted_run)
+
+    assert converter.convert(job) is False
+    assert job.status == "cancelled"
+    assert not partial_path(job.output_file).exists()
+    assert not Path(job.output_file).exists()
+
+
+def _process_state(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()[0]
+
+
+@pytest.mark.skipif(not SUSPEND_SUPPORTED or not Path("/proc/self/stat").exists(),
+                    reason="needs SIGSTOP and /proc")
+def test_pause_suspends_children_in_place():
+    """Test pause stops tracked children, including ones started while paused."""
+    token = CancellationToken()
+    running = FakeStream().run_async()
+    late = FakeStream().run_async()
+    try:
+        with token.track(running):
+            token.pause()
+            with token.track(late):
+                time.sleep(0.1)
+                assert _process_state(running.pid) == "T"
+                assert _process_state(late.pid) == "T"
+                token.resume()
+                time.sleep(0.1)
+                assert _process_state(running.pid) != "T"
+                assert _process_state(late.pid) != "T"
+    finally:
+        for process in (running, late):
+            process.kill()
+            process.wait()
+
+
+def test_paused_time_is_accounted_separately(monkeypatch):
+    """Test paused_seconds adds up every pause, the current one included."""
+    clock = [100.0]
+    monkeypatch.setattr(cancellation.time, "monotonic", lambda: clock[0])
+    token = CancellationToken()
+
+    token.pause()
+    clock[0] += 30
+    token.resume()
+    clock[0] += 100
+    token.pause()
+    clock[0] += 5
+
+    assert token.paused
+    assert token.paused_seconds == 35
+    token.cancel()
+    assert not token.paused
+    assert token.paused_seconds == 35
+
+
+def test_pool_starts_nothing_while_paused(tmp_path):
+    """Test a paused pool holds its jobs and picks them up on resume."""
+    token = CancellationToken()
+    token.pause()
+    converted = []
+
+    class Converter:
+        def convert(self, job):
+            converted.append(job.id)
+            return True
+
+    jobs = [ConversionJob(id=f"job-{i}", beat_files=[tmp_path / "a.mp3"],
+                          cover_file=tmp_path / "cover.jpg", output_file=tmp_path / f"{i}.mp4")
+            for i in range(2)]
+    pool = ConversionPool(Converter(), workers=2, should_pause=lambda: token.paused,
+                          poll_seconds=0.01)
+
+    threading.Timer(0.1, lambda: (converted.append("resumed"), token.resume())).start()
+    assert pool.run(jobs) is True
+    assert converted[0] == "resumed"
+    assert sorted(converted[1:]) == ["job-0", "job-1"]
@@ -0,0 +1,136 @@
+"""Unit tests for segment-parallel encoding of long videos."""
+
+import threading
+import time
+from pathlib import Path
+
+from ecb_tool.features.conversion import converter as converter_module
+from ecb_tool.features.conversion.chunks import (
+    Chunk,
+    chunk_fades,
+    chunk_workers,
+    gop_frames,
+    plan_chunks,
+)
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+from ecb_tool.features.conversion.transitions import Fade
+
+
+def output_of(args):
+    """File an ffmpeg command line writes to (before the global options)."""
+    return Path(next(arg for arg in reversed(args) if arg.endswith((".part", ".mp4"))))
+
+
+def test_chunks_cover_the_video_on_gop_boundaries():
+    """Test chunks are whole GOPs, back to back, with the tail folded in."""
+    chunks = plan_chunks(3600.0 + 0.5, chunk_seconds=600.0, fps=30, gop=60)
+
+    assert [chunk.start for chunk in chunks] == [0.0, 600.0, 1200.0, 1800.0, 2400.0, 3000.0]
+    assert chunks[-1].end == 3600.5
+    for chunk in chunks[:-1]:
+        assert round(chunk.duration * 30) % 60 == 0
+
+
+def test_chunk_cuts_avoid_fades():
+    """Test a cut inside a fade window moves to the next GOP after it."""
+    dip = [Fade('out', 598.0, 1.0), Fade('in', 599.0, 2.0)]
+
+    chunks = plan_chunks(1800.0, chunk_seconds=600.0, fps=30, gop=60, fades=dip)
+
+    assert chunks[1].start == 602.0
+    assert chunks[2].start == 1202.0
+    assert all(not (fade.start < chunk.start < fade.end) for fade in dip for chunk in chunks)
+
+
+def test_short_video_is_one_chunk():
+    """Test a video shorter than a chunk is not split."""
+    assert plan_chunks(90.0, chunk_seconds=600.0, fps=30, gop=60) == [Chunk(0, 0.0, 90.0)]
+
+
+def test_fades_move_to_the_chunk_timeline():
+    """Test each chunk gets only its own fades, shifted to start at zero."""
+    fades = [Fade('in', 0.0, 2.0), Fade('out', 1198.0, 2.0)]
+
+    assert chunk_fades(fades, Chunk(0, 0.0, 600.0)) == [Fade('in', 0.0, 2.0)]
+    assert chunk_fades(fades, Chunk(1, 600.0, 600.0)) == [Fade('out', 598.0, 2.0)]
+
+
+def test_threads_are_shared_between_chunks():
+    """Test parallel chunk encodes split the job's threads."""
+    assert chunk_workers(16, 6) == (4, 4)
+    assert chunk_workers(16, 2) == (2, 8)
+    assert chunk_workers(2, 6) == (1, 2)
+
+
+def test_gop_follows_the_profile(tmp_path):
+    """Test the chunk length unit is the profile's keyframe interval."""
+    config = ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path,
+                              fps=30, encode_profile="standard")
+    keyframe_seconds = config.profile.keyframe_seconds
+
+    assert gop_frames(config) == (int(30 * keyframe_seconds) if keyframe_seconds else 250)
+
+
+def test_long_job_is_encoded_in_parallel_chunks(project_paths, monkeypatch):
+    """Test chunks run concurrently and the final run copies them and encodes the audio."""
+    config = ConversionConfig(beats_dir=project_paths.beats, covers_dir=project_paths.covers,
+                              videos_dir=project_paths.videos, threads=16,
+                              chunk_min_minutes=30, chunk_minutes=10)
+    converter = VideoConverter(config)
+    converter.paths = project_paths
+    monkeypatch.setattr(converter, "probe_durations", lambda files: [3600.0])
+    runs = []
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0, "seconds": 0.0}
+
+    def fake_run(out, duration=None, on_progress=None, **kwargs):
+        args = out.get_args()
+        if "copy" not in args:
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+                active["seconds"] += duration
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+        runs.append(args)
+        output_of(args).write_bytes(b"video")
+
+    monkeypatch.setattr(converter_module, "run_with_progress", fake_run)
+    job = ConversionJob(id="job-001", beat_files=[project_paths.beats / "a.mp3"],
+                        cover_file=project_paths.covers / "cover.jpg",
+                        output_file=project_paths.videos / "a_video.mp4")
+
+    assert converter.convert(job) is True, job.error_message
+    chunk_runs, final = runs[:-1], runs[-1]
+    assert len(chunk_runs) == 6
+    assert active["seconds"] == 3600.0
+    assert active["max"] == 4
+    assert all(args[args.index("-threads") + 1] == "4" for args in chunk_runs)
+    assert final[final.index("-vcodec") + 1] == "copy"
+    assert final[final.index("-acodec") + 1] == config.audio_format
+    assert job.output_file.exists()
+    assert not list(project_paths.temp.glob("chunks-*"))
+
+
+def test_short_job_is_not_chunked(project_paths, monkeypatch):
+    """Test jobs below the threshold keep the single encode."""
+    config = ConversionConfig(beats_dir=project_paths.beats, covers_dir=project_paths.covers,
+                              videos_dir=project_paths.videos, chunk_min_minutes=30)
+    converter = VideoConverter(config)
+    converter.paths = project_paths
+    monkeypatch.setattr(converter, "probe_durations", lambda files: [600.0])
+    runs = []
+
+    def fake_run(out, duration=None, on_progress=None, **kwargs):
+        runs.append(out.get_args())
+        output_of(runs[-1]).write_bytes(b"video")
+
+    monkeypatch.setattr(converter_module, "run_with_progress", fake_run)
+    job = ConversionJob(id="job-001", beat_files=[project_paths.beats / "a.mp3"],
+                        cover_file=project_paths.covers / "cover.jpg",
+                        output_file=project_paths.videos / "a_video.mp4")
+
+    assert converter.convert(job) is True, job.error_message
+    assert len(runs) == 1
@@ -0,0 +1,221 @@
+"""Unit tests for the adaptive concurrency controller."""
+
+import threading
+import time
+from pathlib import Path
+
+import ecb_tool.features.conversion.pool as pool_module
+from ecb_tool.core import paths as paths_module
+from ecb_tool.core import state_manager as state_manager_module
+from ecb_tool.core.paths import ROOT_ENV_VAR
+from ecb_tool.features.conversion.concurrency import (
+    ConcurrencyController,
+    SystemLoad,
+    SystemMonitor,
+)
+from ecb_tool.features.conversion.models import ConversionJob
+from ecb_tool.features.conversion.pool import ConversionPool
+
+IDLE = SystemLoad(cpu_busy=0.3, iowait=0.01, memory_available=0.6)
+BUSY = SystemLoad(cpu_busy=0.95, iowait=0.01, memory_available=0.6)
+SWAPPING = SystemLoad(cpu_busy=0.5, iowait=0.05, memory_available=0.03)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMonitor:
+    def __init__(self, load):
+        self.load = load
+
+    def sample(self):
+        return self.load
+
+
+class Run:
+    """Encoded seconds that grow at a throughput chosen per step."""
+
+    def __init__(self, load=IDLE, **kwargs):
+        self.clock = FakeClock()
+        self.encoded = 0.0
+        self.monitor = FakeMonitor(load)
+        self.decisions = []
+        kwargs.setdefault("minimum", 1)
+        kwargs.setdefault("maximum", 8)
+        kwargs.setdefault("initial", 2)
+        self.controller = ConcurrencyController(
+            encoded_seconds=lambda: self.encoded, monitor=self.monitor,
+            interval=10.0, on_decision=self.decisions.append, clock=self.clock, **kwargs)
+
+    def step(self, throughput):
+        self.clock.now += 10.0
+        self.encoded += throughput * 10.0
+        return self.controller.limit()
+
+
+def test_limit_grows_while_throughput_improves():
+    """Test additive increase with idle CPU, up to the hard maximum."""
+    run = Run(maximum=4)
+
+    assert run.step(2.0) == 3
+    assert run.step(3.0) == 4
+    assert run.step(4.0) == 4
+    assert run.decisions[-1].reason == "máximo"
+    assert run.decisions[0].throughput == 2.0
+
+
+def test_limit_is_only_reevaluated_once_per_interval():
+    """Test no decision is taken before the interval has passed."""
+    run = Run()
+    run.clock.now += 5.0
+
+    assert run.controller.limit() == 2
+    assert run.decisions == []
+
+
+def test_increase_without_gain_is_undone():
+    """Test an extra job that lowered throughput is removed, then held."""
+    run = Run()
+
+    assert run.step(2.0) == 3
+    assert run.step(1.5) == 2
+    assert run.decisions[-1].reason == "sin mejora"
+    assert run.step(2.0) == 2
+    assert run.decisions[-1].reason == "espera"
+
+
+def test_memory_pressure_halves_the_limit():
+    """Test multiplicative decrease, never below the hard minimum."""
+    run = Run(load=SWAPPING, minimum=2, initial=6)
+
+    assert run.step(2.0) == 3
+    assert run.step(2.0) == 2
+    assert run.decisions[0].reason == "memoria"
+
+
+def test_busy_cpu_holds_the_limit():
+    """Test no job is added while the CPU is saturated."""
+    run = Run(load=BUSY)
+
+    assert run.step(2.0) == 2
+    assert run.decisions[-1].reason == "CPU ocupada"
+
+
+def test_initial_limit_is_clamped():
+    """Test the starting limit respects the hard limits."""
+    assert Run(minimum=2, maximum=3, initial=8).controller.workers == 3
+    assert Run(minimum=2, maximum=3, initial=0).controller.workers == 2
+
+
+def write_proc(proc: Path, idle: int, iowait: int, busy: int):
+    (proc / "stat").write_text(f"cpu  {busy} 0 0 {idle} {iowait} 0 0 0 0 0\ncpu0 0 0 0 0 0 0 0 0\n")
+    (proc / "meminfo").write_text("MemTotal:  1000 kB\nMemFree:  100 kB\nMemAvailable:  250 kB\n")
+
+
+def test_monitor_reads_load_since_the_last_sample(tmp_path):
+    """Test CPU and I/O wait are deltas between samples, memory a ratio."""
+    write_proc(tmp_path, idle=1000, iowait=100, busy=900)
+    monitor = SystemMonitor(tmp_path)
+    write_proc(tmp_path, idle=1200, iowait=200, busy=1600)
+
+    load = monitor.sample()
+
+    assert abs(load.cpu_busy - 0.7) < 1e-9
+    assert abs(load.iowait - 0.1) < 1e-9
+    assert load.memory_available == 0.25
+
+
+def test_monitor_without_proc(tmp_path):
+    """Test sampling degrades to None where /proc is missing."""
+    assert SystemMonitor(tmp_path / "missing").sample() is None
+
+
+class CountingConverter:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.threads = 0
+        self.max_threads = 0
+        self.lock = threading.Lock()
+
+    def convert(self, job):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads += job.threads
+            self.max_threads = max(self.max_threads, self.threads)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+            self.threads -= job.threads
+        job.status = "completed"
+        return True
+
+
+class FixedLimit:
+    maximum = 4
+
+    def __init__(self, workers):
+        self.workers = workers
+
+    def limit(self):
+        return self.workers
+
+
+def make_jobs(tmp_path, count):
+    return [
+        ConversionJob(id=f"job-{i}", beat_files=[tmp_path / f"beat_{i}.mp3"],
+                      cover_file=tmp_path / "cover.jpg", output_file=tmp_path / f"video_{i}.mp4")
+        for i in range(count)
+    ]
+
+
+def test_pool_follows_the_controller_limit(tmp_path):
+    """Test the pool runs as many jobs at once as the controller allows."""
+    converter = CountingConverter()
+    pool = ConversionPool(converter, workers=1, concurrency=FixedLimit(3), poll_seconds=0.01)
+
+    assert pool.run(make_jobs(tmp_path, 6)) is True
+    assert converter.max_active == 3
+
+
+def test_pool_at_its_maximum_shares_the_cpus(tmp_path, monkeypatch):
+    """Test a grown pool narrows new jobs and never exceeds the CPUs."""
+    monkeypatch.setattr(pool_module, 'available_cpus', lambda: 8)
+    converter = CountingConverter()
+    limit = FixedLimit(2)
+    pool = ConversionPool(converter, workers=2, concurrency=limit, poll_seconds=0.01)
+    jobs = make_jobs(tmp_path, 8)
+
+    def grow(job, success):
+        limit.workers = limit.maximum
+
+    assert pool.run(jobs, on_done=grow) is True
+    assert converter.max_active == 4
+    assert jobs[0].threads == 4
+    assert jobs[-1].threads == 2
+    assert converter.max_threads == 8
+
+
+def test_explicit_batch_size_is_not_adapted(temp_project_dir, tmp_path, monkeypatch):
+    """Test only an automatic "lotes" lets the controller change the pool."""
+    from ecb_tool.features.conversion.runner import ConversionRunner
+
+    monkeypatch.setenv(ROOT_ENV_VAR, str(temp_project_dir))
+    monkeypatch.setattr(paths_module, "_paths_instance", None)
+    monkeypatch.setattr(state_manager_module, "_state_manager", None)
+    runner = ConversionRunner()
+    runner.converter_config.adaptive_batch = True
+    runner.pool_size = 2
+    jobs = make_jobs(tmp_path, 6)
+
+    runner.converter_config.batch_size = 2
+    assert runner._concurrency(jobs, {}) is None
+
+    runner.converter_config.batch_size = 0
+    assert runner._concurrency(jobs, {}) is not None
@@ -0,0 +1,130 @@
+"""Unit tests for disk-space admission control."""
+
+import json
+import threading
+
+from ecb_tool.core import paths as paths_module
+from ecb_tool.core.paths import ROOT_ENV_VAR
+from ecb_tool.core.shared.file_validator import FileValidator
+from ecb_tool.features.conversion.converter import partial_path
+from ecb_tool.features.conversion.diskspace import GB, DiskGovernor, free_bytes
+from ecb_tool.features.conversion.models import ConversionJob
+from ecb_tool.features.conversion.pool import ConversionPool
+
+
+MB = 1024 ** 2
+
+
+def make_job(tmp_path, name):
+    return ConversionJob(
+        id=name,
+        beat_files=[tmp_path / f"{name}.mp3"],
+        cover_file=tmp_path / "cover.jpg",
+        output_file=tmp_path / f"{name}.mp4",
+    )
+
+
+class FakeDisk:
+    """Free-space probe the test can fill and empty."""
+
+    def __init__(self, free):
+        self.free = free
+
+    def __call__(self, directory):
+        return self.free
+
+
+def test_jobs_are_admitted_while_the_reserve_holds(tmp_path):
+    """Test each admitted job's estimate is claimed against the free space."""
+    disk = FakeDisk(450 * MB)
+    governor = DiskGovernor(tmp_path, lambda job: 100 * MB, reserve_bytes=200 * MB, free_space=disk)
+    first, second, third = (make_job(tmp_path, name) for name in ("a", "b", "c"))
+
+    assert governor.admit(first)
+    assert governor.admit(second)
+    assert not governor.admit(third)
+    assert governor.shortfall(third) == 50 * MB
+
+    governor.release(first)
+    assert governor.admit(third)
+
+
+def test_partial_files_only_owe_the_rest(tmp_path):
+    """Test bytes already in a running job's .part file are not counted twice."""
+    disk = FakeDisk(300 * MB)
+    governor = DiskGovernor(tmp_path, lambda job: 100 * MB, reserve_bytes=0, free_space=disk)
+    job = make_job(tmp_path, "a")
+    assert governor.admit(job)
+
+    with open(partial_path(job.output_file), "wb") as f:
+        f.truncate(60 * MB)
+    disk.free -= 60 * MB
+
+    assert governor.owed_bytes() == 40 * MB
+    assert governor.shortfall(make_job(tmp_path, "b")) == 0
+
+
+def test_free_bytes_of_a_missing_directory(tmp_path):
+    """Test the probe falls back to the nearest existing parent."""
+    assert free_bytes(tmp_path / "not" / "yet") == free_bytes(tmp_path)
+
+
+class FakeConverter:
+    def __init__(self):
+        self.converted = []
+
+    def convert(self, job):
+        self.converted.append(job.id)
+        job.status = "completed"
+        return True
+
+
+def test_pool_pauses_until_space_is_freed(tmp_path):
+    """Test a job that does not fit waits instead of failing, then runs."""
+    disk = FakeDisk(50 * MB)
+    governor = DiskGovernor(tmp_path, lambda job: 100 * MB, reserve_bytes=0, free_space=disk)
+    converter = FakeConverter()
+    waits = []
+
+    def on_wait(job, missing):
+        waits.append((job.id, missing))
+        # An upload deletes its video a moment later
+        threading.Timer(0.05, setattr, (disk, "free", 500 * MB)).start()
+
+    pool = ConversionPool(converter, workers=2, governor=governor, poll_seconds=0.01)
+    finished = pool.run([make_job(tmp_path, "a"), make_job(tmp_path, "b")], on_wait=on_wait)
+
+    assert finished is True
+    assert converter.converted == ["a", "b"]
+    assert waits == [("a", 50 * MB)]
+
+
+def test_pool_stop_while_paused(tmp_path):
+    """Test a stop request ends a pause without starting the held job."""
+    governor = DiskGovernor(tmp_path, lambda job: 100 * MB, reserve_bytes=0, free_space=FakeDisk(0))
+    converter = FakeConverter()
+    stop = threading.Event()
+
+    pool = ConversionPool(converter, workers=1, should_stop=stop.is_set,
+                          governor=governor, poll_seconds=0.01)
+    finished = pool.run([make_job(tmp_path, "a")], on_wait=lambda job, missing: stop.set())
+
+    assert finished is False
+    assert converter.converted == []
+
+
+def test_validator_uses_the_configured_reserve(temp_project_dir, monkeypatch):
+    """Test the start-up check and the governor agree on the reserve."""
+    monkeypatch.setenv(ROOT_ENV_VAR, str(temp_project_dir))
+    monkeypatch.setattr(paths_module, "_paths_instance", None)
+    validator = FileValidator()
+    monkeypatch.setattr(validator, "free_space", lambda: 10 * GB)
+    config_file = paths_module.get_paths().conversion_config
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+
+    config_file.write_text(json.dumps({"conversion": {"reserva_disco_gb": 5}}))
+    assert 'espacio en disco' not in validator.check_conversion_files()['missing']
+
+    config_file.write_text(json.dumps({"conversion": {"reserva_disco_gb": 20}}))
+    assert validator.reserve_bytes() == 20 * GB
+    assert 'espacio en disco' in validator.check_conversion_files()['missing']
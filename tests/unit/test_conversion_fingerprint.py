@@ -0,0 +1,59 @@
+"""Unit tests for build fingerprints of converted videos."""
+
+import os
+from dataclasses import replace
+
+from ecb_tool.features.conversion.fingerprint import is_up_to_date, job_fingerprint, output_record
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+
+
+def _setup(tmp_path):
+    beats = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+    for beat in beats:
+        beat.write_bytes(beat.name.encode())
+    cover = tmp_path / "cover.jpg"
+    cover.write_bytes(b"cover")
+
+    config = ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path)
+    job = ConversionJob(id="job-001", beat_files=beats, cover_file=cover,
+                        output_file=tmp_path / "a_video.mp4")
+    return config, job
+
+
+def test_fingerprint_tracks_inputs_and_encoding(tmp_path):
+    """Test the fingerprint changes with content and encoding, not with scheduling."""
+    config, job = _setup(tmp_path)
+    base = job_fingerprint(job, config)
+
+    assert job_fingerprint(job, replace(config, batch_size=8, threads=2)) == base
+    assert job_fingerprint(job, replace(config, disk_reserve_gb=20.0)) == base
+    assert job_fingerprint(job, replace(config, adaptive_batch=True, max_batch_size=6)) == base
+    assert job_fingerprint(job, replace(config, process_nice=0, io_class=3, stall_seconds=30)) == base
+    assert job_fingerprint(job, replace(config, video_bitrate="4M")) != base
+    assert job_fingerprint(job, replace(config, encode_profile="static_cover")) != base
+
+    reordered = replace(job, beat_files=list(reversed(job.beat_files)))
+    assert job_fingerprint(reordered, config) != base
+
+    job.cover_file.write_bytes(b"another cover")
+    assert job_fingerprint(job, config) != base
+
+
+def test_output_is_up_to_date_until_touched(tmp_path):
+    """Test a recorded output is kept only while it is the file that was built."""
+    config, job = _setup(tmp_path)
+    fingerprint = job_fingerprint(job, config)
+
+    assert not is_up_to_date(job.output_file, fingerprint, None)
+
+    job.output_file.write_bytes(b"video")
+    record = output_record(job.output_file, fingerprint)
+    assert is_up_to_date(job.output_file, fingerprint, record)
+    assert not is_up_to_date(job.output_file, "other", record)
+
+    stat = job.output_file.stat()
+    os.utime(job.output_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not is_up_to_date(job.output_file, fingerprint, record)
+
+    job.output_file.unlink()
+    assert not is_up_to_date(job.output_file, fingerprint, record)
@@ -0,0 +1,125 @@
+"""Unit tests for the crash-safe conversion journal."""
+
+from pathlib import Path
+
+import pytest
+
+from ecb_tool.core import paths as paths_module
+from ecb_tool.core import state_manager as state_manager_module
+from ecb_tool.core.paths import ROOT_ENV_VAR
+from ecb_tool.features.conversion.converter import partial_path
+from ecb_tool.features.conversion.journal import ConversionJournal
+from ecb_tool.features.conversion.models import ConversionJob
+
+
+def _jobs(videos_dir):
+    return [
+        ConversionJob(
+            id=f"job-{i:03d}",
+            beat_files=[Path(f"beat{i}.mp3")],
+            cover_file=Path("cover.jpg"),
+            output_file=videos_dir / f"beat{i}_video.mp4",
+        )
+        for i in range(3)
+    ]
+
+
+def test_unfinished_jobs_survive_a_crash(tmp_path):
+    """Test a new journal instance sees the jobs that never finished."""
+    journal = ConversionJournal(tmp_path / "journal.json")
+    jobs = _jobs(tmp_path)
+    journal.start(jobs, {"fps": 30})
+
+    jobs[0].status = "completed"
+    journal.update(jobs[0])
+    jobs[1].status = "processing"
+    journal.update(jobs[1])
+    # Process dies here: no finish()
+
+    resumed = ConversionJournal(tmp_path / "journal.json").unfinished_jobs()
+
+    assert [job.id for job in resumed] == ["job-001", "job-002"]
+    assert all(job.status == "pending" for job in resumed)
+    assert resumed[0].output_file == jobs[1].output_file
+    assert journal.load()["params"] == {"fps": 30}
+
+
+def test_finish_removes_journal_only_when_done(tmp_path):
+    """Test an interrupted run keeps its journal so it can be resumed."""
+    journal = ConversionJournal(tmp_path / "journal.json")
+    jobs = _jobs(tmp_path)
+    journal.start(jobs, {})
+
+    jobs[0].status = "completed"
+    journal.update(jobs[0])
+    journal.finish()
+    assert journal.path.exists()
+
+    for job in jobs[1:]:
+        job.status = "failed"
+        journal.update(job)
+    journal.finish()
+    assert not journal.path.exists()
+    assert journal.unfinished_jobs() == []
+
+
+def test_partial_output_is_not_an_mp4(tmp_path):
+    """Test videos being written are invisible to '.mp4' listings."""
+    partial = partial_path(tmp_path / "beat_video.mp4")
+
+    assert partial.parent == tmp_path
+    assert partial.suffix != ".mp4"
+
+
+def test_cancelled_jobs_are_not_resumed(tmp_path):
+    """Test jobs stopped by the user count as finished."""
+    journal = ConversionJournal(tmp_path / "journal.json")
+    jobs = _jobs(tmp_path)
+    journal.start(jobs, {})
+
+    jobs[0].status = "cancelled"
+    journal.update(jobs[0])
+
+    assert [job.id for job in journal.unfinished_jobs()] == ["job-001", "job-002"]
+    journal.discard()
+    assert not journal.path.exists()
+
+
+@pytest.fixture
+def runner(temp_project_dir, monkeypatch):
+    """A conversion runner working on a temporary project."""
+    from ecb_tool.features.conversion.runner import ConversionRunner
+
+    monkeypatch.setenv(ROOT_ENV_VAR, str(temp_project_dir))
+    monkeypatch.setattr(paths_module, "_paths_instance", None)
+    monkeypatch.setattr(state_manager_module, "_state_manager", None)
+    return ConversionRunner()
+
+
+def _interrupted_run(runner):
+    paths = paths_module.get_paths()
+    beat = paths.beats / "beat.mp3"
+    cover = paths.covers / "cover.jpg"
+    beat.write_bytes(b"beat")
+    cover.write_bytes(b"cover")
+    job = ConversionJob(id="job-001", beat_files=[beat], cover_file=cover,
+                        output_file=paths.videos / "beat_video.mp4")
+    runner.journal.start([job], runner._journal_params())
+    return job
+
+
+def test_interrupted_run_resumes_with_the_same_settings(runner):
+    """Test the jobs of a crashed run are picked up again."""
+    job = _interrupted_run(runner)
+    runner.converter_config.threads = 1  # Scheduling only
+
+    assert [resumed.id for resumed in runner._resume_jobs()] == [job.id]
+
+
+def test_interrupted_run_is_discarded_when_settings_changed(runner):
+    """Test jobs planned for other encoding settings are not resumed."""
+    _interrupted_run(runner)
+    runner.converter_config.video_bitrate = "8M"
+
+    assert runner._resume_jobs() == []
+    assert not runner.journal.path.exists()
@@ -0,0 +1,129 @@
+"""Unit tests for cached two-pass loudness normalization."""
+
+import pytest
+
+from ecb_tool.features.conversion import converter as converter_module
+from ecb_tool.features.conversion import loudness
+from ecb_tool.features.conversion.cancellation import CancellationToken, Cancelled
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.loudness import (
+    LoudnessIndex,
+    LoudnessMeasurement,
+    loudnorm_args,
+    parse_loudnorm_output,
+)
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+
+
+LOUDNORM_STDERR = """
+[Parsed_loudnorm_0 @ 0x5581]
+{
+	"input_i" : "-8.52",
+	"input_tp" : "0.31",
+	"input_lra" : "4.10",
+	"input_thresh" : "-18.70",
+	"output_i" : "-14.02",
+	"output_tp" : "-1.00",
+	"output_lra" : "3.90",
+	"output_thresh" : "-24.10",
+	"normalization_type" : "dynamic",
+	"target_offset" : "0.02"
+}
+"""
+
+MEASUREMENT = LoudnessMeasurement(input_i=-8.52, input_tp=0.31, input_lra=4.1, input_thresh=-18.7)
+
+
+def test_parse_loudnorm_report():
+    """Test the first-pass JSON report becomes a measurement."""
+    assert parse_loudnorm_output(LOUDNORM_STDERR) == MEASUREMENT
+    assert parse_loudnorm_output(LOUDNORM_STDERR.replace('"-8.52"', '"-inf"')).silent
+
+
+def test_second_pass_uses_the_measurement():
+    """Test measured values turn loudnorm into a linear corrective pass."""
+    args = loudnorm_args(MEASUREMENT, target=-14.0)
+
+    assert args['I'] == -14.0
+    assert args['measured_I'] == -8.52
+    assert args['measured_thresh'] == -18.7
+    assert args['linear'] == 'true'
+    assert 'measured_I' not in loudnorm_args(None)
+
+
+def test_measurement_is_cached_by_content(tmp_path, monkeypatch):
+    """Test each beat is measured once, even under another name."""
+    calls = []
+    monkeypatch.setattr(loudness, "measure_loudness", lambda path, **kwargs: calls.append(path) or MEASUREMENT)
+    beat = tmp_path / "beat.mp3"
+    beat.write_bytes(b"audio")
+    copy = tmp_path / "copy.mp3"
+    copy.write_bytes(b"audio")
+
+    index = LoudnessIndex(tmp_path / "loudness.sqlite")
+    assert index.get(beat) == MEASUREMENT
+    assert index.get(copy) == MEASUREMENT
+    index.close()
+
+    reopened = LoudnessIndex(tmp_path / "loudness.sqlite")
+    assert reopened.get(beat) == MEASUREMENT
+    reopened.close()
+
+    assert calls == [beat]
+
+
+class _FakeIndex:
+    def get(self, path, **kwargs):
+        return MEASUREMENT
+
+
+def test_each_beat_is_normalized_before_joining(tmp_path, monkeypatch):
+    """Test every beat gets its own corrective pass, then the global gain."""
+    monkeypatch.setattr(converter_module, "get_loudness_index", lambda: _FakeIndex())
+    config = ConversionConfig(
+        beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path,
+        loudness_target=-14.0, volume_db=-1.5, enable_fades=False,
+    )
+    job = ConversionJob(
+        id="job-001",
+        beat_files=[tmp_path / "a.mp3", tmp_path / "b.mp3"],
+        cover_file=tmp_path / "cover.jpg",
+        output_file=tmp_path / "a_video.mp4",
+    )
+
+    args = VideoConverter(config)._build_output(job, job.output_file).compile()
+    graph = args[args.index('-filter_complex') + 1]
+
+    assert graph.count('loudnorm=') == 2
+    assert 'measured_I=-8.52' in graph
+    assert graph.index('loudnorm=') < graph.index('concat=') < graph.index('volume=-1.5dB')
+
+
+def test_stop_during_measurement_cancels_the_job(tmp_path, monkeypatch):
+    """Test STOP during the measuring pass cancels the job instead of failing it."""
+    measured = []
+
+    def fake_run(out, duration=None, cancel=None, policy=None):
+        measured.append(policy)
+        cancel.cancel()  # STOP while ffmpeg decodes the beat
+        cancel.raise_if_cancelled()
+
+    monkeypatch.setattr(loudness, "run_with_progress", fake_run)
+    index = LoudnessIndex(tmp_path / "loudness.sqlite")
+    monkeypatch.setattr(converter_module, "get_loudness_index", lambda: index)
+    beat = tmp_path / "beat.mp3"
+    beat.write_bytes(b"audio")
+    config = ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path,
+                              loudness_target=-14.0, enable_fades=False,
+                              reuse_cover_segments=False)
+    job = ConversionJob(id="job-001", beat_files=[beat], cover_file=tmp_path / "cover.jpg",
+                        output_file=tmp_path / "beat_video.mp4")
+    converter = VideoConverter(config, cancel_token=CancellationToken())
+    monkeypatch.setattr(converter, "probe_durations", lambda files: [60.0])
+
+    assert converter.convert(job) is False
+    assert job.status == "cancelled"
+    assert measured == [converter.policy]  # Supervised like the encodes
+    with pytest.raises(Cancelled):
+        index.get(beat, cancel=converter.cancel_token)  # Nothing was cached
+    index.close()
@@ -0,0 +1,91 @@
+"""Unit tests for grouping beats into videos."""
+
+from itertools import count, islice
+from pathlib import Path
+
+import pytest
+
+from ecb_tool.features.conversion.packing import pack_by_count, pack_by_duration
+
+
+def _beats(*minutes):
+    return [(Path(f"beat{i}.mp3"), m * 60 if m is not None else None) for i, m in enumerate(minutes)]
+
+
+def _minutes(group, beats):
+    durations = dict(beats)
+    return sum(durations[beat] for beat in group) / 60
+
+
+def test_pack_by_count_drops_incomplete_group():
+    """Test BPV groups are consecutive and a short tail is not used."""
+    beats = [Path(f"beat{i}.mp3") for i in range(7)]
+
+    groups = list(pack_by_count(beats, 3))
+
+    assert groups == [beats[0:3], beats[3:6]]
+
+
+def test_pack_by_duration_hits_window():
+    """Test every video lands inside the duration window."""
+    beats = _beats(4, 3, 5, 6, 4, 3, 9, 2, 4, 5, 3, 4, 2, 7, 3)
+
+    groups = list(pack_by_duration(beats, 28 * 60, 32 * 60))
+
+    assert len(groups) == 2
+    for group in groups:
+        assert 28 <= _minutes(group, beats) <= 32
+    used = [beat for group in groups for beat in group]
+    assert len(used) == len(set(used))
+
+
+def test_pack_by_duration_holds_back_beats_that_overflow():
+    """Test a beat that does not fit waits for the next video."""
+    beats = _beats(20, 8, 15, 5, 10)
+
+    groups = list(pack_by_duration(beats, 28 * 60, 32 * 60))
+
+    assert groups == [
+        [Path("beat0.mp3"), Path("beat1.mp3")],
+        [Path("beat2.mp3"), Path("beat3.mp3"), Path("beat4.mp3")],
+    ]
+
+
+def test_pack_by_duration_long_and_unknown_beats():
+    """Test over-long beats go alone and unprobed beats are skipped."""
+    skipped = []
+    beats = _beats(None, 40, 30)
+
+    groups = list(pack_by_duration(beats, 28 * 60, 32 * 60, on_skip=skipped.append))
+
+    assert groups == [[Path("beat1.mp3")], [Path("beat2.mp3")]]
+    assert skipped == [Path("beat0.mp3")]
+
+
+def test_pack_by_duration_reports_beats_left_at_the_end():
+    """Test held beats still fill videos at the end and the rest is reported."""
+    skipped = []
+    beats = _beats(20, 15, 15, 25, 8)
+
+    groups = list(pack_by_duration(beats, 28 * 60, 32 * 60, on_skip=skipped.append))
+
+    assert groups == [
+        [Path("beat0.mp3"), Path("beat4.mp3")],
+        [Path("beat1.mp3"), Path("beat2.mp3")],
+    ]
+    assert skipped == [Path("beat3.mp3")]
+
+
+def test_pack_by_duration_is_lazy():
+    """Test only the beats needed are consumed from an endless source."""
+    endless = ((Path(f"beat{i}.mp3"), 180.0) for i in count())
+
+    groups = list(islice(pack_by_duration(endless, 28 * 60, 32 * 60), 3))
+
+    assert [len(group) for group in groups] == [10, 10, 10]
+
+
+def test_pack_by_duration_rejects_empty_window():
+    """Test an impossible window is reported instead of looping."""
+    with pytest.raises(ValueError):
+        next(pack_by_duration([], 0, 30))
@@ -0,0 +1,168 @@
+"""Unit tests for the run planner (time, size and upload predictions)."""
+
+import pytest
+
+from ecb_tool.features.conversion.models import ConversionConfig, Rendition
+from ecb_tool.features.conversion.planner import (
+    CONTAINER_OVERHEAD,
+    DEFAULT_UPLOAD_RATE,
+    format_duration,
+    nominal_bytes_per_second,
+    parse_bitrate,
+    plan_run,
+    plan_upload,
+    record_output,
+    record_upload,
+    size_key,
+)
+from ecb_tool.features.conversion.scheduling import JOB_OVERHEAD_SECONDS, speed_key
+
+
+class FakeStateManager:
+    def __init__(self):
+        self.speeds = {}
+        self.output_rates = {}
+        self.upload = None
+
+    def get_encode_speed(self, key):
+        return self.speeds.get(key)
+
+    def get_output_rate(self, key):
+        return self.output_rates.get(key)
+
+    def set_output_rate(self, key, rate):
+        self.output_rates[key] = rate
+
+    def get_upload_rate(self):
+        return self.upload
+
+    def set_upload_rate(self, rate):
+        self.upload = rate
+
+
+def _config(tmp_path, **kwargs):
+    kwargs.setdefault("video_bitrate", "2M")
+    kwargs.setdefault("audio_bitrate", "192k")
+    return ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path, **kwargs)
+
+
+def test_parse_bitrate():
+    """Test ffmpeg bitrate suffixes."""
+    assert parse_bitrate("2M") == 2_000_000
+    assert parse_bitrate("192k") == 192_000
+    assert parse_bitrate("800") == 800
+
+
+def test_nominal_size_adds_every_rendition(tmp_path):
+    """Test each rendition's video bitrate counts, the audio only once."""
+    config = _config(tmp_path)
+    renditions = [
+        Rendition(name="1080p", resolution="1920x1080"),
+        Rendition(name="720p", resolution="1280x720", suffix="_720p", video_bitrate="1M"),
+    ]
+
+    single = nominal_bytes_per_second(config)
+    both = nominal_bytes_per_second(config, renditions)
+
+    assert single == pytest.approx((2_000_000 + 192_000) / 8 * CONTAINER_OVERHEAD)
+    assert both == pytest.approx((3_000_000 + 192_000) / 8 * CONTAINER_OVERHEAD)
+
+
+def test_uncalibrated_plan_uses_defaults(tmp_path):
+    """Test a first run is predicted from the default speed and bitrates."""
+    config = _config(tmp_path)
+    plan = plan_run(config, [120.0, 60.0, None], workers=2, state_manager=FakeStateManager())
+
+    assert plan.jobs == 3
+    assert plan.media_seconds == 180.0
+    assert plan.unknown_durations == 1
+    assert not plan.calibrated
+    assert plan.output_bytes == pytest.approx(180.0 * nominal_bytes_per_second(config))
+    assert plan.upload_seconds == pytest.approx(plan.output_bytes / DEFAULT_UPLOAD_RATE)
+
+
+def test_measurements_override_the_defaults(tmp_path):
+    """Test measured speed, output rate and upload rate drive the prediction."""
+    config = _config(tmp_path)
+    sm = FakeStateManager()
+    sm.speeds[speed_key(config, 2)] = 10.0
+    sm.output_rates[size_key(config)] = 100_000.0
+    sm.upload = 50_000.0
+
+    plan = plan_run(config, [100.0, 100.0, 100.0], workers=2, state_manager=sm)
+
+    job = JOB_OVERHEAD_SECONDS + 10.0
+    assert plan.calibrated
+    # Three equal jobs on two workers: one worker runs two of them
+    assert plan.wall_seconds == pytest.approx(2 * job)
+    assert plan.output_bytes == pytest.approx(30_000_000.0)
+    assert plan.upload_seconds == pytest.approx(600.0)
+
+
+def test_finished_jobs_and_uploads_calibrate(tmp_path):
+    """Test measurements are stored, then smoothed rather than replaced."""
+    config = _config(tmp_path)
+    sm = FakeStateManager()
+
+    record_output(sm, config, 100.0, 10_000_000)
+    assert sm.get_output_rate(size_key(config)) == 100_000.0
+    record_output(sm, config, 100.0, 20_000_000)
+    assert 100_000.0 < sm.get_output_rate(size_key(config)) < 200_000.0
+    record_output(sm, config, None, 5_000_000)  # Unknown length: ignored
+
+    record_upload(sm, 1_000_000, 2.0)
+    assert sm.get_upload_rate() == 500_000.0
+    record_upload(sm, 1_000_000, 0.0)
+    assert sm.get_upload_rate() == 500_000.0
+
+
+def test_upload_plan_sums_the_queue(tmp_path):
+    """Test the upload estimate covers every readable video."""
+    sm = FakeStateManager()
+    sm.upload = 1000.0
+    first = tmp_path / "a.mp4"
+    first.write_bytes(b"x" * 3000)
+    second = tmp_path / "b.mp4"
+    second.write_bytes(b"x" * 2000)
+
+    plan = plan_upload([first, second, tmp_path / "missing.mp4"], sm)
+
+    assert plan.videos == 2
+    assert plan.total_bytes == 5000
+    assert plan.seconds == 5.0
+    assert plan.calibrated
+
+
+def test_format_duration():
+    """Test durations render as H:MM:SS."""
+    assert format_duration(3725.4) == "1:02:05"
+    assert format_duration(0) == "0:00:00"
+
+
+def test_run_plan_probes_only_the_beats_it_uses(temp_project_dir, monkeypatch):
+    """Test forecasting 2 videos does not probe the whole beat library."""
+    from ecb_tool.core import media_index as media_index_module
+    from ecb_tool.core import paths as paths_module
+    from ecb_tool.core import state_manager as state_manager_module
+    from ecb_tool.core.paths import ROOT_ENV_VAR
+    from ecb_tool.features.conversion.runner import ConversionRunner
+
+    monkeypatch.setenv(ROOT_ENV_VAR, str(temp_project_dir))
+    monkeypatch.setattr(paths_module, "_paths_instance", None)
+    monkeypatch.setattr(state_manager_module, "_state_manager", None)
+    index = media_index_module.MediaIndex(temp_project_dir / "data" / "media_index.sqlite")
+    monkeypatch.setattr(media_index_module, "_media_index", index)
+    probed = []
+
+    def fake_probe(key, size, mtime_ns):
+        probed.append(key)
+        return media_index_module.parse_probe(key, size, mtime_ns, {"format": {"duration": "60"}})
+
+    monkeypatch.setattr(index, "_probe", fake_probe)
+    for i in range(20):
+        (temp_project_dir / "workspace" / "beats" / f"beat{i:02d}.mp3").write_bytes(b"beat")
+
+    plan = ConversionRunner().plan(num_orders=2, beats_per_video=3)
+
+    assert plan.jobs == 2
+    assert len(probed) == 6
@@ -0,0 +1,89 @@
+"""Unit tests for the conversion worker pool."""
+
+import threading
+import time
+
+from ecb_tool.features.conversion.models import ConversionJob
+from ecb_tool.features.conversion.pool import (
+    ConversionPool,
+    default_pool_size,
+    resolve_pool_size,
+    threads_per_job,
+)
+
+
+class FakeConverter:
+    """Converter stand-in that records how many jobs overlap."""
+
+    def __init__(self, duration=0.05, fail_ids=()):
+        self.duration = duration
+        self.fail_ids = set(fail_ids)
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def convert(self, job):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.duration)
+        with self.lock:
+            self.active -= 1
+        job.status = "failed" if job.id in self.fail_ids else "completed"
+        return job.id not in self.fail_ids
+
+
+def make_jobs(project_paths, count):
+    return [
+        ConversionJob(
+            id=f"job-{i}",
+            beat_files=[project_paths.beats / f"beat_{i}.mp3"],
+            cover_file=project_paths.covers / "cover.jpg",
+            output_file=project_paths.videos / f"video_{i}.mp4",
+        )
+        for i in range(count)
+    ]
+
+
+def test_pool_size_honors_lotes():
+    """Test configured lotes wins, 0 falls back to a CPU-aware default."""
+    assert resolve_pool_size(3, cpus=16) == 3
+    assert resolve_pool_size(0, cpus=16) == default_pool_size(16) == 4
+    assert resolve_pool_size(0, cpus=2) == 1
+
+
+def test_threads_are_split_between_jobs():
+    """Test each ffmpeg child gets its own share of the cores."""
+    assert threads_per_job(4, cpus=16) == 4
+    assert threads_per_job(3, cpus=16) == 5
+    assert threads_per_job(32, cpus=16) == 1
+
+
+def test_pool_runs_jobs_concurrently(project_paths):
+    """Test the pool keeps N jobs in flight and reports every result."""
+    converter = FakeConverter(fail_ids={"job-2"})
+    jobs = make_jobs(project_paths, 6)
+    results = {}
+
+    pool = ConversionPool(converter, workers=3)
+    finished = pool.run(jobs, on_done=lambda job, ok: results.update({job.id: ok}))
+
+    assert finished is True
+    assert converter.max_active == 3
+    assert len(results) == 6
+    assert results["job-2"] is False
+    assert sum(results.values()) == 5
+
+
+def test_pool_stops_handing_out_jobs(project_paths):
+    """Test a stop request lets in-flight jobs finish but starts no new ones."""
+    converter = FakeConverter()
+    jobs = make_jobs(project_paths, 10)
+    started = []
+
+    pool = ConversionPool(converter, workers=2, should_stop=lambda: len(started) >= 2)
+    finished = pool.run(jobs, on_start=started.append)
+
+    assert finished is False
+    assert len(started) == 2
+    assert all(job.status == "pending" for job in jobs[2:])
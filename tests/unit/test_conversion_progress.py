@@ -0,0 +1,35 @@
+"""Unit tests for FFmpeg progress parsing."""
+
+from ecb_tool.features.conversion.progress import ProgressTracker, parse_out_time
+
+
+def test_parse_out_time():
+    """Test out_time_ms/out_time_us are read as microseconds."""
+    assert parse_out_time("out_time_ms=1500000") == 1.5
+    assert parse_out_time("out_time_us=30000000") == 30.0
+    assert parse_out_time("out_time_ms=N/A") is None
+    assert parse_out_time("frame=120") is None
+
+
+def test_tracker_reports_percentage_of_duration():
+    """Test progress lines become a percentage capped below 100."""
+    reported = []
+    tracker = ProgressTracker(duration=60.0, on_progress=reported.append)
+
+    for line in ["frame=10", "out_time_ms=15000000", "progress=continue",
+                 "out_time_ms=30000000", "out_time_ms=61000000", "progress=end"]:
+        tracker.feed(line)
+
+    assert reported == [25.0, 50.0, 99.9]
+    assert tracker.finished is True
+
+
+def test_tracker_without_duration_only_tracks_time():
+    """Test unknown durations never report a fake percentage."""
+    reported = []
+    tracker = ProgressTracker(duration=None, on_progress=reported.append)
+
+    tracker.feed("out_time_us=5000000")
+
+    assert reported == []
+    assert tracker.out_time == 5.0
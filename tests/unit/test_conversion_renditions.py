@@ -0,0 +1,59 @@
+"""Unit tests for single-pass multi-rendition output."""
+
+from pathlib import Path
+
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.journal import ConversionJournal
+from ecb_tool.features.conversion.models import RENDITIONS, ConversionConfig, ConversionJob
+
+
+def _job(tmp_path):
+    return ConversionJob(
+        id="job-001",
+        beat_files=[tmp_path / "beat.mp3"],
+        cover_file=tmp_path / "cover.jpg",
+        output_file=tmp_path / "beat_video.mp4",
+        renditions=[RENDITIONS["16:9"], RENDITIONS["shorts"], RENDITIONS["720p"]],
+    )
+
+
+def test_rendition_output_names(tmp_path):
+    """Test the main rendition keeps the job's name and the others get a suffix."""
+    job = _job(tmp_path)
+
+    assert [path.name for path in job.output_files] == [
+        "beat_video.mp4", "beat_video_short.mp4", "beat_video_720p.mp4",
+    ]
+
+
+def test_renditions_share_one_decode_and_one_audio_encode(tmp_path):
+    """Test every rendition comes from one ffmpeg run with a single audio encoder."""
+    config = ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path)
+    job = _job(tmp_path)
+    converter = VideoConverter(config)
+
+    args = converter._build_renditions_output(job, job.output_files, limit_seconds=60).compile()
+    graph = args[args.index('-filter_complex') + 1]
+    tee = next(arg for arg in args if 'select=' in arg)
+
+    assert args.count('-i') == 2  # Cover and beat, each opened once
+    assert 'split=3' in graph
+    assert 'crop=1080:1920' in graph
+    assert args[args.index('-f') + 1] == 'tee'
+    assert args.count('-acodec') == 1
+    assert args[args.index('-b:v:1') + 1] == "1500k"
+    assert args[args.index('-b:v:0') + 1] == config.video_bitrate
+    assert tee.count('|') == 2
+    assert "select=\\'v:1,a\\'" in tee
+    assert (tmp_path / "beat_video_short.mp4").as_posix() in tee
+
+
+def test_journal_keeps_renditions(tmp_path):
+    """Test a resumed job still writes every rendition."""
+    journal = ConversionJournal(tmp_path / "journal.json")
+    journal.start([_job(tmp_path)], {})
+
+    resumed = journal.unfinished_jobs()[0]
+
+    assert resumed.renditions == _job(tmp_path).renditions
+    assert resumed.output_files == _job(tmp_path).output_files
@@ -0,0 +1,47 @@
+"""Unit tests for longest-job-first scheduling."""
+
+from pathlib import Path
+
+from ecb_tool.features.conversion.models import ConversionJob
+from ecb_tool.features.conversion.scheduling import (
+    estimate_seconds,
+    order_longest_first,
+    planned_makespan,
+    smooth_speed,
+)
+
+
+def _job(job_id):
+    return ConversionJob(
+        id=job_id,
+        beat_files=[Path(f"{job_id}.mp3")],
+        cover_file=Path("cover.jpg"),
+        output_file=Path(f"{job_id}.mp4"),
+    )
+
+
+def test_longest_jobs_start_first():
+    """Test jobs are sorted by cost, ties keeping their order."""
+    jobs = [_job("a"), _job("b"), _job("c"), _job("d")]
+    costs = {"a": 10.0, "b": 45.0, "c": 10.0, "d": 30.0}
+
+    ordered = order_longest_first(jobs, costs)
+
+    assert [job.id for job in ordered] == ["b", "d", "a", "c"]
+
+
+def test_lpt_order_shortens_makespan():
+    """Test a long job submitted last would leave workers idle."""
+    costs = [10, 10, 10, 10, 40]
+
+    assert planned_makespan(costs, workers=2) == 60
+    assert planned_makespan(sorted(costs, reverse=True), workers=2) == 40
+
+
+def test_estimate_and_calibration():
+    """Test cost scales with duration and speed is smoothed, not replaced."""
+    assert estimate_seconds(600, speed=10) > estimate_seconds(300, speed=10)
+    assert estimate_seconds(None, speed=10) < estimate_seconds(1, speed=10)
+
+    assert smooth_speed(None, 12.0) == 12.0
+    assert 8.0 < smooth_speed(8.0, 12.0) < 12.0
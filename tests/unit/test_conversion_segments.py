@@ -0,0 +1,45 @@
+"""Unit tests for the cover loop segment cache."""
+
+from ecb_tool.features.conversion.models import ConversionConfig
+from ecb_tool.features.conversion.segments import (
+    SEGMENT_SECONDS,
+    segment_key,
+    write_concat_list,
+)
+
+
+def make_config(project_paths, **kwargs):
+    return ConversionConfig(
+        beats_dir=project_paths.beats,
+        covers_dir=project_paths.covers,
+        videos_dir=project_paths.videos,
+        **kwargs
+    )
+
+
+def test_segment_key_follows_content_and_settings(project_paths, sample_cover):
+    """Test the key changes with cover content and encoder settings only."""
+    config = make_config(project_paths)
+    key = segment_key(sample_cover, config)
+    
+    copy = sample_cover.with_name("renamed.jpg")
+    copy.write_bytes(sample_cover.read_bytes())
+    assert segment_key(copy, config) == key
+    
+    assert segment_key(sample_cover, make_config(project_paths, resolution="1280x720")) != key
+    assert segment_key(sample_cover, make_config(project_paths, encode_profile="static_cover")) != key
+    
+    sample_cover.write_text("edited image")
+    assert segment_key(sample_cover, config) != key
+
+
+def test_concat_list_covers_duration(project_paths):
+    """Test the segment is repeated enough times to cover the audio."""
+    segment = project_paths.temp / "seg.mp4"
+    list_file = project_paths.temp / "list.txt"
+    
+    repeats = write_concat_list(segment, SEGMENT_SECONDS * 2.5, list_file)
+    
+    assert repeats == 3
+    assert list_file.read_text(encoding='utf-8').count("file '") == 3
+
@@ -0,0 +1,199 @@
+"""Unit tests for the ffmpeg process supervisor."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ecb_tool.features.conversion import converter as converter_module
+from ecb_tool.features.conversion.converter import VideoConverter, partial_path
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+from ecb_tool.features.conversion.progress import run_with_progress
+from ecb_tool.features.conversion.supervisor import (
+    ProcessHung,
+    SupervisorPolicy,
+    Watchdog,
+    apply_priority,
+    ionice_args,
+    sample_process,
+)
+
+HAS_PROC = Path("/proc/self/stat").exists()
+
+# Child that reports some progress like ffmpeg, then stops advancing
+STUCK_CHILD = "import time\nprint('out_time_us=1000000', flush=True)\ntime.sleep(30)\n"
+
+# Same, but it keeps a core busy while its output is frozen
+SPINNING_CHILD = "import time\nend = time.time() + 30\nwhile time.time() < end:\n    pass\n"
+
+
+class FakeStream:
+    """ffmpeg-python output node stand-in that runs a Python child."""
+
+    def __init__(self, child=STUCK_CHILD):
+        self.child = child
+
+    def global_args(self, *args):
+        return self
+
+    def run_async(self, pipe_stdin=False, pipe_stdout=False, pipe_stderr=False):
+        return subprocess.Popen([sys.executable, "-c", self.child],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def fast_policy(**kwargs):
+    kwargs.setdefault("sample_interval", 0.02)
+    kwargs.setdefault("io_class", 0)
+    return SupervisorPolicy(**kwargs)
+
+
+def test_time_limit_follows_the_expected_duration():
+    """Test the wall-clock limit allows min_speed plus the margin."""
+    policy = SupervisorPolicy(min_speed=0.5, timeout_margin=60.0)
+
+    assert policy.time_limit(600.0) == 1260.0
+    assert policy.time_limit(None) is None
+    assert SupervisorPolicy(min_speed=0).time_limit(600.0) is None
+
+
+@pytest.mark.skipif(not HAS_PROC, reason="needs /proc")
+def test_sample_reads_cpu_and_memory():
+    """Test /proc sampling of a live process, and None once it is gone."""
+    sample = sample_process(os.getpid())
+
+    assert sample.rss_bytes > 0
+    assert sample.cpu_seconds >= 0
+    assert sample_process(2 ** 22 + 1) is None
+
+
+def test_stalled_child_is_killed():
+    """Test a child whose progress stops is treated as hung."""
+    start = time.monotonic()
+    with pytest.raises(ProcessHung, match="sin progreso"):
+        run_with_progress(FakeStream(), 60.0, policy=fast_policy(stall_seconds=0.3))
+
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.skipif(not HAS_PROC, reason="needs /proc")
+def test_busy_child_gets_longer_than_a_blocked_one():
+    """Test a stalled child still using CPU is given the longer busy grace."""
+    process = FakeStream(SPINNING_CHILD).run_async()
+    try:
+        watchdog = Watchdog(process, fast_policy(stall_seconds=0.3, busy_stall_factor=5.0),
+                            None, progress=lambda: 0.0).start()
+        time.sleep(0.8)
+        assert watchdog.reason is None  # Past stall_seconds, but busy
+
+        process.wait(timeout=10)
+        watchdog.stop()
+        assert "CPU ocupada" in watchdog.reason
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_stalled_idle_child_is_reported_blocked():
+    """Test a stalled child that uses no CPU is killed after stall_seconds."""
+    with pytest.raises(ProcessHung, match="bloqueado" if HAS_PROC else "sin progreso"):
+        run_with_progress(FakeStream(), 60.0, policy=fast_policy(stall_seconds=0.3))
+
+
+def test_overrunning_child_is_killed():
+    """Test a child far slower than min_speed hits the wall-clock limit."""
+    policy = fast_policy(stall_seconds=0, min_speed=100.0, timeout_margin=0.2)
+
+    with pytest.raises(ProcessHung, match="límite"):
+        run_with_progress(FakeStream(), 10.0, policy=policy)
+
+
+def test_failing_progress_callback_stops_child_and_watchdog():
+    """Test an exception from on_progress leaves no child or watchdog behind."""
+    processes = []
+
+    class TrackedStream(FakeStream):
+        def run_async(self, **kwargs):
+            processes.append(super().run_async(**kwargs))
+            return processes[-1]
+
+    def on_progress(percent):
+        raise RuntimeError("UI gone")
+
+    with pytest.raises(RuntimeError, match="UI gone"):
+        run_with_progress(TrackedStream(), 60.0, on_progress, policy=fast_policy())
+
+    assert processes[0].poll() is not None
+    assert not any(thread.name == "ffmpeg-watchdog" for thread in threading.enumerate())
+
+
+def test_paused_time_is_not_a_stall():
+    """Test the stall clock stops while the user has the run paused."""
+    process = FakeStream().run_async()
+    start = time.monotonic()
+    try:
+        # Paused the whole time: no active time passes
+        watchdog = Watchdog(process, fast_policy(stall_seconds=0.1), None,
+                            progress=lambda: 0.0,
+                            paused_seconds=lambda: time.monotonic() - start).start()
+        time.sleep(0.4)
+        watchdog.stop()
+        assert watchdog.reason is None
+    finally:
+        process.kill()
+        process.wait()
+
+
+@pytest.mark.skipif(not hasattr(os, "getpriority"), reason="needs POSIX priorities")
+def test_children_run_niced():
+    """Test the child's CPU priority is lowered."""
+    process = FakeStream().run_async()
+    try:
+        apply_priority(process, fast_policy(nice=os.getpriority(os.PRIO_PROCESS, 0) + 3))
+        assert os.getpriority(os.PRIO_PROCESS, process.pid) == os.getpriority(os.PRIO_PROCESS, 0) + 3
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_io_priority_follows_the_policy():
+    """Test the ionice class and level, with the idle class taking no level."""
+    assert ionice_args(SupervisorPolicy()) == ['-c', '2', '-n', '7']
+    assert ionice_args(SupervisorPolicy(io_class=2, io_level=3)) == ['-c', '2', '-n', '3']
+    assert ionice_args(SupervisorPolicy(io_class=3, io_level=3)) == ['-c', '3']
+    assert ionice_args(SupervisorPolicy(io_class=0)) == []
+
+
+def test_hung_job_is_restarted_then_fails(tmp_path, monkeypatch):
+    """Test the converter retries a hung encode hang_retries times."""
+    config = ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path,
+                              hang_retries=1)
+    converter = VideoConverter(config)
+    monkeypatch.setattr(converter, "probe_durations", lambda files: None)
+    attempts = []
+
+    def hangs_once(out, duration=None, on_progress=None, **kwargs):
+        attempts.append(kwargs["policy"])
+        if len(attempts) == 1:
+            raise ProcessHung("sin progreso durante 120 s")
+        partial_path(job.output_file).write_bytes(b"video")
+
+    monkeypatch.setattr(converter_module, "run_with_progress", hangs_once)
+    job = ConversionJob(id="job-001", beat_files=[tmp_path / "a.mp3"],
+                        cover_file=tmp_path / "cover.jpg", output_file=tmp_path / "a_video.mp4")
+
+    assert converter.convert(job) is True
+    assert len(attempts) == 2
+    assert job.output_file.exists()
+
+    def always_hangs(out, duration=None, on_progress=None, **kwargs):
+        raise ProcessHung("sin progreso durante 120 s")
+
+    monkeypatch.setattr(converter_module, "run_with_progress", always_hangs)
+    job.output_file.unlink()
+
+    assert converter.convert(job) is False
+    assert job.error_message.startswith("FFmpeg bloqueado")
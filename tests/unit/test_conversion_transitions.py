@@ -0,0 +1,141 @@
+"""Unit tests for the fade and crossfade filter-graph compiler."""
+
+import json
+
+import pytest
+
+from ecb_tool.core import paths as paths_module
+from ecb_tool.core import state_manager as state_manager_module
+from ecb_tool.core.paths import ROOT_ENV_VAR
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.models import ConversionConfig, ConversionJob
+from ecb_tool.features.conversion.runner import ConversionRunner, _fade_seconds
+from ecb_tool.features.conversion.segments import SEGMENT_SECONDS, loop_entries
+from ecb_tool.features.conversion.transitions import Fade, plan_transitions, video_timeline
+
+
+def make_config(tmp_path, **kwargs):
+    kwargs.setdefault("fps", 30)
+    return ConversionConfig(beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path, **kwargs)
+
+
+def test_crossfades_shorten_the_output_and_center_the_dips(tmp_path):
+    """Test beats overlap by the crossfade and video dips sit in its middle."""
+    config = make_config(
+        tmp_path,
+        fade_in_duration=2.0, fade_out_duration=3.0, fade_transition_duration=1.0,
+        audio_fade_in_duration=1.0, audio_fade_out_duration=2.0, audio_crossfade_duration=4.0,
+    )
+
+    plan = plan_transitions(config, [60.0, 60.0, 60.0])
+
+    assert plan.duration == 172.0
+    assert plan.crossfade == 4.0
+    assert plan.audio_fades == [Fade('in', 0.0, 1.0), Fade('out', 170.0, 2.0)]
+    assert plan.video_fades == [
+        Fade('in', 0.0, 2.0),
+        Fade('out', 57.5, 0.5), Fade('in', 58.0, 0.5),
+        Fade('out', 113.5, 0.5), Fade('in', 114.0, 0.5),
+        Fade('out', 169.0, 3.0),
+    ]
+
+
+def test_disabled_fades_plan_nothing(tmp_path):
+    """Test enable_fades=False keeps the plain concatenation."""
+    plan = plan_transitions(make_config(tmp_path, enable_fades=False, audio_crossfade_duration=2.0),
+                            [30.0, 30.0])
+
+    assert plan.duration == 60.0
+    assert not plan.filters_audio
+    assert plan.video_fades == []
+
+
+def test_fades_are_clamped_to_short_outputs(tmp_path):
+    """Test crossfades and edge fades never outgrow the beats they join."""
+    config = make_config(tmp_path, fade_in_duration=10.0, fade_out_duration=10.0,
+                         fade_transition_duration=2.0, audio_crossfade_duration=10.0)
+
+    plan = plan_transitions(config, [6.0, 8.0])
+
+    assert plan.crossfade == 3.0
+    assert plan.duration == 11.0
+    # Edge fades take half the video each, leaving no room for the dip
+    assert [fade.duration for fade in plan.video_fades] == [5.5, 5.5]
+
+
+def test_unknown_durations_only_plan_untimed_fades(tmp_path):
+    """Test fade outs and dips need probed durations; fade ins do not."""
+    config = make_config(tmp_path, fade_transition_duration=1.0, audio_fade_in_duration=1.0,
+                         audio_fade_out_duration=1.0, audio_crossfade_duration=2.0)
+
+    plan = plan_transitions(config, None, beats=2)
+
+    assert plan.duration is None
+    assert plan.crossfade == 2.0
+    assert [fade.kind for fade in plan.audio_fades] == ['in']
+    assert [fade.kind for fade in plan.video_fades] == ['in']
+
+
+def test_video_timeline_fills_between_fades(tmp_path):
+    """Test stream-copied stretches fill every gap between fade clips."""
+    config = make_config(tmp_path, fade_transition_duration=1.0)
+    plan = plan_transitions(config, [50.0, 50.0])
+
+    pieces = video_timeline(plan)
+
+    assert pieces == [('in', 2.0), ('loop', 47.5), ('out', 0.5), ('in', 0.5),
+                      ('loop', 47.5), ('out', 2.0)]
+    assert sum(seconds for _, seconds in pieces) == pytest.approx(plan.duration)
+
+
+def test_loop_entries_cut_the_last_copy(tmp_path):
+    """Test loop stretches repeat whole segments and cut the last one on a frame."""
+    segment = tmp_path / "seg.mp4"
+
+    entries = loop_entries(segment, SEGMENT_SECONDS * 2 + 1.5, fps=30)
+
+    assert entries == [(segment, None), (segment, None), (segment, 1.5)]
+
+
+def test_output_graph_applies_the_plan(tmp_path):
+    """Test one encode gets the crossfade chain and windowed fade filters."""
+    config = make_config(tmp_path, fade_transition_duration=1.0, audio_fade_out_duration=2.0,
+                         audio_crossfade_duration=2.0)
+    job = ConversionJob(
+        id="job-001",
+        beat_files=[tmp_path / "a.mp3", tmp_path / "b.mp3", tmp_path / "c.mp3"],
+        cover_file=tmp_path / "cover.jpg",
+        output_file=tmp_path / "a_video.mp4",
+    )
+    plan = plan_transitions(config, [30.0, 30.0, 30.0])
+
+    args = VideoConverter(config)._build_output(job, job.output_file, plan=plan).compile()
+    graph = args[args.index('-filter_complex') + 1]
+
+    assert graph.count('acrossfade=d=2.0') == 2
+    assert 'concat' not in graph
+    assert 'afade=d=2.0:st=84.0:t=out' in graph
+    assert graph.count('fade=d=0.5') == 4
+    assert 'fade=d=2.0:st=0.0:t=in' in graph
+
+
+def test_fade_settings_from_config_file():
+    """Test the dialog's {"activo", "duracion"} entries become seconds."""
+    assert _fade_seconds({"activo": True, "duracion": 2}) == 2.0
+    assert _fade_seconds({"activo": False, "duracion": 2}) == 0.0
+    assert _fade_seconds(None) == 0.0
+
+
+def test_enable_fades_setting_turns_every_fade_off(temp_project_dir, monkeypatch):
+    """Test the settings' master switch reaches the config, over the per-fade flags."""
+    monkeypatch.setenv(ROOT_ENV_VAR, str(temp_project_dir))
+    monkeypatch.setattr(paths_module, "_paths_instance", None)
+    monkeypatch.setattr(state_manager_module, "_state_manager", None)
+    settings = temp_project_dir / "config" / "ajustes_conversion.json"
+    settings.write_text(json.dumps({"conversion": {"enable_fades": False}}), encoding="utf-8")
+
+    config = ConversionRunner().converter_config
+
+    assert config.fade_in_duration > 0  # "activo" by default
+    assert not config.enable_fades
+    assert plan_transitions(config, [30.0, 30.0]).video_fades == []
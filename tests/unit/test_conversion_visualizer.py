@@ -0,0 +1,96 @@
+"""Unit tests for the NumPy spectrum visualizer."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ecb_tool.features.conversion import visualizer
+from ecb_tool.features.conversion.converter import VideoConverter
+from ecb_tool.features.conversion.models import ENCODE_PROFILES, ConversionConfig, ConversionJob
+
+
+def _sine(frequency: float, seconds: float) -> "np.ndarray":
+    t = np.arange(int(visualizer.SAMPLE_RATE * seconds)) / visualizer.SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def test_sine_peaks_in_its_band():
+    """Test a pure tone lights the band that contains its frequency."""
+    analyzer = visualizer.SpectrumAnalyzer(fps=30)
+    levels = analyzer.analyze(_sine(1000.0, 1.0))
+
+    edges = np.geomspace(visualizer.MIN_FREQUENCY, visualizer.MAX_FREQUENCY, visualizer.BAR_COUNT + 1)
+    expected = int(np.searchsorted(edges, 1000.0)) - 1
+
+    assert levels.shape == (30, visualizer.BAR_COUNT)
+    assert int(levels[-1].argmax()) == expected
+    assert levels[-1, expected] > 0.5
+    assert levels[-1, 0] < 0.2
+
+
+def test_levels_decay_after_silence():
+    """Test bars fall back gradually instead of dropping to zero."""
+    analyzer = visualizer.SpectrumAnalyzer(fps=30)
+    loud = analyzer.analyze(_sine(1000.0, 0.5))
+    quiet = analyzer.analyze(np.zeros(visualizer.SAMPLE_RATE // 2, dtype=np.float32))
+
+    # The first windows still overlap the tone
+    peak = int(loud[-1].argmax())
+    assert 0.0 < quiet[5, peak] < loud[-1, peak]
+    assert quiet[-1, peak] < quiet[5, peak]
+    assert quiet[-1, peak] == pytest.approx(quiet[5, peak] * visualizer.DECAY ** 9, rel=1e-3)
+
+
+def test_renderer_reuses_its_frame_buffer():
+    """Test frames are drawn into one buffer over an untouched background."""
+    background = np.zeros((72, 128, 3), dtype=np.uint8)
+    renderer = visualizer.BarRenderer(background)
+
+    full = renderer.render(np.ones(visualizer.BAR_COUNT, dtype=np.float32))
+    frame = full.copy()
+    empty = renderer.render(np.zeros(visualizer.BAR_COUNT, dtype=np.float32))
+
+    assert empty is full
+    assert frame.shape == (72, 128, 3)
+    assert (frame == visualizer.BAR_COLOR).all(axis=2).any()
+    assert not empty.any()
+    assert not background.any()
+
+
+def test_render_stream_writes_one_frame_per_hop():
+    """Test the stream gets whole raw frames, the last one padded."""
+    fps = 25
+    seconds = 2.5
+    pcm = io.BytesIO(_sine(440.0, seconds).tobytes() + b"\0" * 4 * 10)
+    sink = io.BytesIO()
+    background = np.zeros((36, 64, 3), dtype=np.uint8)
+
+    frames = visualizer.render_stream(pcm, background, fps, sink)
+
+    assert frames == int(fps * seconds) + 1
+    assert len(sink.getvalue()) == frames * 36 * 64 * 3
+
+
+def test_visualizer_uses_raw_video_input(tmp_path):
+    """Test the encoder reads piped frames and encodes with the standard profile."""
+    config = ConversionConfig(
+        beats_dir=tmp_path, covers_dir=tmp_path, videos_dir=tmp_path,
+        resolution="1280x720", encode_profile="static_cover", video_source="visualizer",
+    )
+    job = ConversionJob(
+        id="job-001",
+        beat_files=[tmp_path / "beat.mp3"],
+        cover_file=tmp_path / "cover.jpg",
+        output_file=tmp_path / "beat_video.mp4",
+    )
+
+    args = VideoConverter(config)._build_output(job, job.output_file, raw_video=True).compile()
+
+    assert config.profile == ENCODE_PROFILES["standard"]
+    assert args[args.index('-f') + 1] == 'rawvideo'
+    assert args[args.index('-s') + 1] == '1280x720'
+    assert 'pipe:' in args
+    assert 'stillimage' not in args
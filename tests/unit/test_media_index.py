@@ -0,0 +1,79 @@
+"""Unit tests for the SQLite media index."""
+
+import os
+import sys
+
+from ecb_tool.core import media_index
+from ecb_tool.core.media_index import MediaIndex
+
+
+def _fake_probe(calls):
+    def probe(filename, cmd='ffprobe', **kwargs):
+        calls.append(filename)
+        return {
+            'format': {'duration': '12.5'},
+            'streams': [{
+                'codec_type': 'audio',
+                'codec_name': 'mp3',
+                'sample_rate': '44100',
+                'channels': 2,
+                'channel_layout': 'stereo',
+            }],
+        }
+    return probe
+
+
+def test_probe_results_are_cached_until_file_changes(tmp_path, monkeypatch):
+    """Test files are only probed again when size or mtime change."""
+    calls = []
+    monkeypatch.setattr(media_index, 'run_ffprobe', _fake_probe(calls))
+    beat = tmp_path / "beat.mp3"
+    beat.write_bytes(b"audio")
+
+    index = MediaIndex(tmp_path / "index.sqlite")
+    info = index.get(beat)
+    assert info.duration == 12.5
+    assert info.codec == 'mp3'
+    assert info.sample_rate == 44100
+    assert info.channel_layout == 'stereo'
+
+    # Survives reopening the database
+    index.close()
+    index = MediaIndex(tmp_path / "index.sqlite")
+    assert index.duration(beat) == 12.5
+    assert len(calls) == 1
+
+    beat.write_bytes(b"new audio")
+    os.utime(beat, ns=(0, 1))
+    index.get(beat)
+    assert len(calls) == 2
+
+
+def test_total_duration_probes_in_parallel(tmp_path, monkeypatch):
+    """Test durations are summed and missing files make the total unknown."""
+    calls = []
+    monkeypatch.setattr(media_index, 'run_ffprobe', _fake_probe(calls))
+    beats = []
+    for i in range(4):
+        beat = tmp_path / f"beat{i}.mp3"
+        beat.write_bytes(b"audio")
+        beats.append(beat)
+
+    index = MediaIndex(tmp_path / "index.sqlite")
+    assert index.total_duration(beats) == 50.0
+    assert sorted(calls) == sorted(str(b.resolve()) for b in beats)
+    assert index.total_duration(beats + [tmp_path / "missing.mp3"]) is None
+
+
+def test_hung_ffprobe_is_killed_and_not_cached(tmp_path, monkeypatch):
+    """Test a probe that outlives the timeout is given up on and retried later."""
+    ffprobe = tmp_path / "ffprobe"
+    ffprobe.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(30)\n")
+    ffprobe.chmod(0o755)
+    monkeypatch.setenv('FFPROBE_BINARY', str(ffprobe))
+    beat = tmp_path / "beat.mp3"
+    beat.write_bytes(b"audio")
+
+    index = MediaIndex(tmp_path / "index.sqlite", timeout=0.5)
+    assert index.get(beat) is None
+    assert index._lookup(str(beat.resolve())) is None
@@ -53,3 +53,9 @@ def test_path_properties(project_paths):
             attr = getattr(project_paths, attr_name)
             if not callable(attr):
                 assert isinstance(attr, Path), f"{attr_name} should be Path"
+
+
+def test_root_env_override(temp_project_dir, monkeypatch):
+    """Test ECB_TOOL_ROOT points the default root at another workspace."""
+    monkeypatch.setenv('ECB_TOOL_ROOT', str(temp_project_dir))
+    assert find_project_root() == temp_project_dir.resolve()